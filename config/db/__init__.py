@@ -0,0 +1,4 @@
+"""
+Database plumbing for the project: connection pools, pooled backends and
+prepared statements. See `config/settings/base.py` for the switches.
+"""
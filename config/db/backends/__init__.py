@@ -0,0 +1,16 @@
+"""
+Database backends that add connection pooling (and, on PostgreSQL,
+prepared statements) to the Django backends of the same name.
+"""
+
+# Django backends and their counterparts in this package
+ENGINES: dict[str, str] = {
+    "django.db.backends.postgresql": "config.db.backends.postgresql",
+    "django.db.backends.sqlite3": "config.db.backends.sqlite3",
+}
+
+
+def get_engine(engine: str) -> str:
+    """Return the backend of this package for `engine`, if there is one."""
+
+    return ENGINES.get(engine, engine)
@@ -0,0 +1,59 @@
+"""
+Module for the mixins shared by the backends in `config.db.backends`.
+"""
+
+from typing import Any
+
+from config.db.pool import ConnectionPool, get_pool
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    Database wrapper mixin that borrows connections from a `ConnectionPool`.
+
+    Behavior::
+      Pools when the `POOL` dict of the database settings is set
+      (`MAX_SIZE`, `TIMEOUT`, `CHECK_IDLE`, `MAX_LIFETIME`), else
+      connects like the parent backend.
+      `connect` borrows a connection and `close` hands it back. A
+      connection that errored, or was closed inside an atomic block,
+      is closed for good instead.
+      Run with `CONN_MAX_AGE = 0`, so each request hands its connection
+      back to the pool instead of keeping it for its thread.
+    """
+
+    pool: ConnectionPool = None
+
+    def get_new_connection(self, conn_params: dict) -> Any:
+        options = self.settings_dict.get("POOL")
+        if not options:
+            return super().get_new_connection(conn_params)
+
+        connect = super().get_new_connection
+        self.pool = get_pool(
+            self.alias,
+            str(self.settings_dict["NAME"]),
+            lambda: connect(conn_params),
+            check=self.is_connection_usable,
+            **{name.lower(): value for name, value in options.items()},
+        )
+        return self.pool.acquire()
+
+    def _close(self) -> None:
+        if self.pool is None or self.connection is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            discard = self.errors_occurred or self.in_atomic_block
+            self.pool.release(self.connection, discard=discard)
+
+    @staticmethod
+    def is_connection_usable(connection: Any) -> bool:
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+            finally:
+                cursor.close()
+        except Exception:
+            return False
+        return True
@@ -0,0 +1,104 @@
+"""
+PostgreSQL backend with optional connection pooling and server-side
+prepared statements for hot queries.
+
+Prepared statements are configured with the `PREPARED_STATEMENTS` dict
+of the database settings (`THRESHOLD`, `MAX_SIZE`, `TABLES`). With
+psycopg 3 they map to its native `prepare_threshold` instead.
+"""
+
+import psycopg2
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import is_psycopg3
+from psycopg2 import extensions
+
+from config.db.backends.mixins import PooledDatabaseWrapperMixin
+from config.db.prepared import PreparedStatement, PreparedStatements
+
+# Wraps a PREPARE inside a transaction, so a failure does not abort it
+PREPARE_SAVEPOINT: str = "django_prepare"
+
+
+class PreparingConnection(extensions.connection):
+    """
+    psycopg2 connection that keeps the prepared statements of its session.
+    """
+
+    prepared_statements: PreparedStatements = None
+
+
+class PreparingCursor(extensions.cursor):
+    """
+    psycopg2 cursor that runs hot queries as prepared statements.
+
+    Behavior::
+      Asks the `PreparedStatements` of its connection whether a query
+      is hot, prepares it once for the session and then runs `EXECUTE`
+      with the same parameters.
+      Falls back to the plain query, for good, when the server cannot
+      prepare it (e.g. untyped parameters).
+      Leaves named (server-side) cursors alone.
+    """
+
+    def execute(self, query, vars=None):
+        statements = getattr(self.connection, "prepared_statements", None)
+        if statements is None or self.name or not isinstance(vars, (list, tuple)):
+            return super().execute(query, vars)
+
+        statement, is_prepared = statements.get(query, len(vars))
+        if statement is None:
+            return super().execute(query, vars)
+        if not is_prepared and not self._prepare(statements, query, statement):
+            return super().execute(query, vars)
+        return super().execute(statement.execute_sql, vars)
+
+    def _prepare(
+        self, statements: PreparedStatements, query: str, statement: PreparedStatement
+    ) -> bool:
+        in_transaction = (
+            self.connection.info.transaction_status
+            != extensions.TRANSACTION_STATUS_IDLE
+        )
+        if in_transaction:
+            super().execute(f"SAVEPOINT {PREPARE_SAVEPOINT}")
+        try:
+            super().execute(statement.prepare_sql)
+        except psycopg2.Error:
+            if in_transaction:
+                super().execute(f"ROLLBACK TO SAVEPOINT {PREPARE_SAVEPOINT}")
+            statements.reject(query)
+            return False
+        if in_transaction:
+            super().execute(f"RELEASE SAVEPOINT {PREPARE_SAVEPOINT}")
+
+        if deallocate_sql := statements.add(query, statement):
+            super().execute(deallocate_sql)
+        return True
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    def get_connection_params(self) -> dict:
+        conn_params = super().get_connection_params()
+        options = self.settings_dict.get("PREPARED_STATEMENTS") or {}
+        if not options.get("THRESHOLD"):
+            return conn_params
+        if is_psycopg3:
+            conn_params["prepare_threshold"] = options["THRESHOLD"]
+        else:
+            conn_params["connection_factory"] = PreparingConnection
+            conn_params["cursor_factory"] = PreparingCursor
+        return conn_params
+
+    def get_new_connection(self, conn_params: dict):
+        connection = super().get_new_connection(conn_params)
+        if (
+            isinstance(connection, PreparingConnection)
+            and connection.prepared_statements is None
+        ):
+            options = self.settings_dict["PREPARED_STATEMENTS"]
+            connection.prepared_statements = PreparedStatements(
+                threshold=options["THRESHOLD"],
+                max_size=options.get("MAX_SIZE", 100),
+                tables=options.get("TABLES"),
+            )
+        return connection
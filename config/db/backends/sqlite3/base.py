@@ -0,0 +1,14 @@
+"""
+SQLite backend with optional connection pooling, mostly to exercise the
+pool in tests and local runs. `sqlite3` already caches prepared
+statements per connection (`cached_statements`), which pooled
+connections keep warm.
+"""
+
+from django.db.backends.sqlite3 import base
+
+from config.db.backends.mixins import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    pass
@@ -0,0 +1,117 @@
+"""
+Module for per-database query counters.
+
+`install_query_counters` hooks a `QueryCounter` into every database
+connection of the process, and `get_query_stats` reports its counters
+by database alias, e.g. to check how reads spread over the replicas.
+"""
+
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+# Statements counted as reads, anything else counts as a write
+READ_PREFIXES: tuple[str, ...] = ("SELECT", "EXPLAIN")
+
+
+@dataclass
+class QueryStats:
+    """
+    Counters to report the queries sent to a database.
+    """
+
+    queries: int = 0
+    reads: int = 0
+    writes: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+
+    @property
+    def average_ms(self) -> float:
+        return self.total_ms / self.queries if self.queries else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        data = {**asdict(self), "average_ms": self.average_ms}
+        return {
+            name: round(value, 3) if isinstance(value, float) else value
+            for name, value in data.items()
+        }
+
+
+class QueryCounter:
+    """
+    Database execute wrapper that counts queries by database alias.
+
+    Behavior::
+      Counts every query, once per `executemany`, as a read when it is
+      a SELECT and as a write otherwise.
+      Counts failed queries, and the time spent waiting for the database.
+      Shares its counters between the threads of a process.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stats: dict[str, QueryStats] = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = self._clock()
+        failed = False
+        try:
+            return execute(sql, params, many, context)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed_ms = (self._clock() - started) * 1000
+            is_read = sql.lstrip()[:7].upper().startswith(READ_PREFIXES)
+            with self._lock:
+                stats = self._stats.setdefault(
+                    context["connection"].alias, QueryStats()
+                )
+                stats.queries += 1
+                stats.reads += is_read
+                stats.writes += not is_read
+                stats.errors += failed
+                stats.total_ms += elapsed_ms
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {alias: stats.as_dict() for alias, stats in self._stats.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+query_counter = QueryCounter()
+
+
+def install_query_counters() -> None:
+    """
+    Count the queries of every connection opened from now on, and of the
+    connections the current thread already opened.
+    """
+
+    connection_created.connect(_install, dispatch_uid="config.db.counters")
+    for connection in connections.all(initialized_only=True):
+        _install(type(connection), connection)
+
+
+def get_query_stats() -> dict[str, dict[str, Any]]:
+    """Return the query counters of this process, by database alias."""
+
+    return query_counter.get_stats()
+
+
+def reset_query_stats() -> None:
+    query_counter.reset()
+
+
+def _install(sender, connection, **kwargs) -> None:
+    if query_counter not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_counter)
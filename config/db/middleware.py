@@ -0,0 +1,69 @@
+"""
+Module for the middleware of the read replica router.
+"""
+
+import hashlib
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest
+from django.utils.decorators import sync_and_async_middleware
+
+from config.db.routers import track_writes
+
+# Cache key prefix of the clients whose reads stick to the primary
+PIN_KEY_PREFIX: str = "db:pinned"
+
+
+@sync_and_async_middleware
+def replica_pinning_middleware(get_response):
+    """
+    Middleware that lets clients read their own writes.
+
+    Behavior::
+      Tracks the writes of every request with `track_writes`. Once a
+      request wrote, pins the reads of its client to the primary
+      database for `STICKY_SECONDS`, in the `CACHE_ALIAS` cache.
+      Identifies clients by their `Authorization` header, else by their
+      remote address.
+      Removes itself when the `REPLICA_ROUTER` setting lists no replicas.
+
+    `CACHE_ALIAS` must name a shared cache, see `greetings.checks`.
+    """
+
+    options = getattr(settings, "REPLICA_ROUTER", {})
+    if not options.get("REPLICAS"):
+        raise MiddlewareNotUsed("No read replicas configured.")
+    cache = caches[options.get("CACHE_ALIAS", "default")]
+    sticky_seconds = options.get("STICKY_SECONDS", 5)
+
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request: HttpRequest):
+            key = get_pin_key(request)
+            with track_writes(pinned=await cache.aget(key, False)) as state:
+                response = await get_response(request)
+            if state.written:
+                await cache.aset(key, True, sticky_seconds)
+            return response
+
+    else:
+
+        def middleware(request: HttpRequest):
+            key = get_pin_key(request)
+            with track_writes(pinned=cache.get(key, False)) as state:
+                response = get_response(request)
+            if state.written:
+                cache.set(key, True, sticky_seconds)
+            return response
+
+    return middleware
+
+
+def get_pin_key(request: HttpRequest) -> str:
+    client = request.META.get("HTTP_AUTHORIZATION") or request.META.get(
+        "REMOTE_ADDR", ""
+    )
+    return f"{PIN_KEY_PREFIX}:{hashlib.sha256(client.encode()).hexdigest()}"
@@ -0,0 +1,238 @@
+"""
+Module for the process-wide pools of database connections.
+
+Pools are keyed by database alias and name and shared by the threads of
+a process. Backends in `config.db.backends` borrow connections from
+them, see `PooledDatabaseWrapperMixin`.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+from django.db.utils import OperationalError
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(OperationalError):
+    """Raised when no pooled connection frees up within the pool timeout."""
+
+
+@dataclass
+class PoolStats:
+    """
+    Counters to report the utilisation, wait time and reconnects of a pool.
+    """
+
+    max_size: int = 0
+    size: int = 0
+    in_use: int = 0
+    acquired: int = 0
+    created: int = 0
+    reused: int = 0
+    reconnects: int = 0
+    waits: int = 0
+    timeouts: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+
+    @property
+    def utilisation(self) -> float:
+        return self.in_use / self.max_size if self.max_size else 0.0
+
+    @property
+    def average_wait_ms(self) -> float:
+        return self.total_wait_ms / self.waits if self.waits else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        data = {
+            **asdict(self),
+            "idle": self.size - self.in_use,
+            "utilisation": self.utilisation,
+            "average_wait_ms": self.average_wait_ms,
+        }
+        return {
+            name: round(value, 3) if isinstance(value, float) else value
+            for name, value in data.items()
+        }
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of DB-API connections.
+
+    Behavior::
+      Hands out idle connections last-in first-out, so a few connections
+      stay warm, and opens new ones up to `max_size`.
+      Blocks callers once `max_size` connections are in use, and raises
+      `PoolTimeout` after `timeout` seconds.
+      Pings connections that were idle for `check_idle` seconds or more
+      with `check` before handing them out, and replaces the ones that
+      fail (counted as reconnects). Replaces connections older than
+      `max_lifetime` seconds, when set.
+      Rolls back any open transaction of a returned connection, and
+      closes it instead when asked to or when the rollback fails.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        max_size: int = 10,
+        timeout: float = 10,
+        check: Callable[[Any], bool] = None,
+        check_idle: float = 30,
+        max_lifetime: float = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_idle = check_idle
+        self.max_lifetime = max_lifetime
+        self._factory = factory
+        self._check = check
+        self._clock = clock
+        self._cond = threading.Condition()
+        # Idle connections as (connection, returned at), most recent last
+        self._idle: list[tuple[Any, float]] = []
+        # Open time of every connection of the pool, by id
+        self._opened_at: dict[int, float] = {}
+        self.stats = PoolStats(max_size=max_size)
+
+    def acquire(self) -> Any:
+        started = self._clock()
+        with self._cond:
+            waited = False
+            while not self._idle and self.stats.size >= self.max_size:
+                remaining = self.timeout - (self._clock() - started)
+                if remaining <= 0:
+                    self.stats.timeouts += 1
+                    raise PoolTimeout(
+                        f"No database connection freed up in {self.timeout}s "
+                        f"(pool size {self.max_size})."
+                    )
+                waited = True
+                self._cond.wait(remaining)
+
+            idle = self._idle.pop() if self._idle else None
+            if idle is None:
+                self.stats.size += 1
+            self.stats.in_use += 1
+            self.stats.acquired += 1
+            if waited:
+                wait_ms = (self._clock() - started) * 1000
+                self.stats.waits += 1
+                self.stats.total_wait_ms += wait_ms
+                self.stats.max_wait_ms = max(self.stats.max_wait_ms, wait_ms)
+
+        try:
+            if idle is None:
+                return self._open()
+            return self._reuse(*idle)
+        except BaseException:
+            with self._cond:
+                self.stats.size -= 1
+                self.stats.in_use -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, connection: Any, discard: bool = False) -> None:
+        if not discard:
+            try:
+                connection.rollback()
+            except Exception:
+                discard = True
+        if not discard and self.max_lifetime is not None:
+            discard = self._get_age(connection) >= self.max_lifetime
+
+        with self._cond:
+            self.stats.in_use -= 1
+            if discard:
+                self.stats.size -= 1
+            else:
+                self._idle.append((connection, self._clock()))
+            self._cond.notify()
+        if discard:
+            self._close(connection)
+
+    def close(self) -> None:
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self.stats.size -= len(idle)
+        for connection, _ in idle:
+            self._close(connection)
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._cond:
+            return self.stats.as_dict()
+
+    def _open(self) -> Any:
+        connection = self._factory()
+        with self._cond:
+            self._opened_at[id(connection)] = self._clock()
+            self.stats.created += 1
+        return connection
+
+    def _reuse(self, connection: Any, returned_at: float) -> Any:
+        is_stale = self.check_idle is not None and (
+            self._clock() - returned_at >= self.check_idle
+        )
+        if is_stale and self._check is not None and not self._check(connection):
+            logger.warning("Replacing a pooled database connection that failed.")
+            self._close(connection)
+            with self._cond:
+                self.stats.reconnects += 1
+            return self._open()
+        with self._cond:
+            self.stats.reused += 1
+        return connection
+
+    def _get_age(self, connection: Any) -> float:
+        return self._clock() - self._opened_at.get(id(connection), self._clock())
+
+    def _close(self, connection: Any) -> None:
+        with self._cond:
+            self._opened_at.pop(id(connection), None)
+        try:
+            connection.close()
+        except Exception:
+            logger.debug("Failed to close a pooled database connection.")
+
+
+_pools: dict[tuple[str, str], ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(
+    alias: str, name: str, factory: Callable[[], Any], **options
+) -> ConnectionPool:
+    """
+    Return the pool for database `alias` and `name`, created with
+    `factory` and `options` on first use. The name is part of the key,
+    so the test database gets its own pool.
+    """
+
+    with _pools_lock:
+        if (alias, name) not in _pools:
+            logger.debug(f"Creating connection pool for database {alias!r}.")
+            _pools[alias, name] = ConnectionPool(factory, **options)
+        return _pools[alias, name]
+
+
+def get_pool_stats() -> dict[str, dict[str, Any]]:
+    """Return the counters of every pool of this process, by database alias."""
+
+    with _pools_lock:
+        pools = dict(_pools)
+    return {alias: pool.get_stats() for (alias, _), pool in pools.items()}
+
+
+def close_pools() -> None:
+    """Close the idle connections of every pool of this process."""
+
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,123 @@
+"""
+Module for server-side prepared statements on PostgreSQL.
+
+psycopg2 sends every query as text, so the server parses and plans it
+on every execution. `PreparedStatements` tracks how often each query
+runs on a connection and, past a threshold, turns it into a named
+statement: `PREPARE` once per connection, then `EXECUTE` with the same
+parameters. Persistent or pooled connections keep the statements warm.
+"""
+
+import itertools
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+
+# Django placeholders: `%s` for a parameter, `%%` for a literal percent
+PLACEHOLDER_PATTERN: re.Pattern = re.compile(r"%(s|%)")
+
+# Queries worth preparing: single reads and writes
+PREPARABLE_PREFIXES: tuple[str, ...] = ("SELECT", "INSERT", "UPDATE", "DELETE")
+
+
+@dataclass(frozen=True)
+class PreparedStatement:
+    """
+    Named statement for a query, and the SQL to create and run it.
+    """
+
+    name: str
+    prepare_sql: str
+    execute_sql: str
+
+
+class PreparedStatements:
+    """
+    Per-connection registry of prepared statements.
+
+    Behavior::
+      Counts executions of queries that touch one of `tables`, and
+      hands out a new `PreparedStatement` once a query ran `threshold`
+      times. The caller runs its `PREPARE` and reports the outcome with
+      `add` or `reject`; rejected queries are never prepared again.
+      Keeps at most `max_size` statements: `add` returns the
+      `DEALLOCATE` SQL of the least recently used one to make room.
+      Ignores queries without parameters, with several statements, or
+      that are not a SELECT, INSERT, UPDATE or DELETE.
+    """
+
+    def __init__(
+        self, threshold: int = 5, max_size: int = 100, tables: list[str] = None
+    ) -> None:
+        self.threshold = threshold
+        self.max_size = max_size
+        self.tables = tuple(f'"{table}"' for table in tables or [])
+        self._counts: dict[str, int] = {}
+        self._statements: OrderedDict[str, PreparedStatement] = OrderedDict()
+        self._rejected: set[str] = set()
+        self._ids = itertools.count(1)
+
+    def get(self, sql: str, param_count: int) -> tuple[PreparedStatement, bool]:
+        """
+        Return `(statement, is_prepared)` for `sql`, or `(None, False)`
+        while it should still run as plain text.
+        """
+
+        if statement := self._statements.get(sql):
+            self._statements.move_to_end(sql)
+            return statement, True
+        if not self._is_preparable(sql, param_count):
+            return None, False
+
+        count = self._counts.get(sql, 0) + 1
+        if count < self.threshold:
+            # Forget one-off queries, e.g. `IN` lists of varying length
+            if len(self._counts) >= self.max_size * 10:
+                self._counts.clear()
+            self._counts[sql] = count
+            return None, False
+
+        self._counts.pop(sql, None)
+        name = f"django_stmt_{next(self._ids)}"
+        statement = PreparedStatement(
+            name=name,
+            prepare_sql=f"PREPARE {name} AS {to_numbered_placeholders(sql)}",
+            execute_sql=f"EXECUTE {name} ({', '.join(['%s'] * param_count)})",
+        )
+        return statement, False
+
+    def add(self, sql: str, statement: PreparedStatement) -> str | None:
+        self._statements[sql] = statement
+        if len(self._statements) <= self.max_size:
+            return None
+        _, evicted = self._statements.popitem(last=False)
+        return f"DEALLOCATE {evicted.name}"
+
+    def reject(self, sql: str) -> None:
+        self._rejected.add(sql)
+
+    def clear(self) -> None:
+        self._counts.clear()
+        self._statements.clear()
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+    def _is_preparable(self, sql: str, param_count: int) -> bool:
+        return (
+            param_count > 0
+            and self.threshold > 0
+            and sql not in self._rejected
+            and sql.lstrip().upper().startswith(PREPARABLE_PREFIXES)
+            and ";" not in sql
+            and any(table in sql for table in self.tables)
+        )
+
+
+def to_numbered_placeholders(sql: str) -> str:
+    """Turn Django's `%s` placeholders into PostgreSQL's `$1, $2, ...`."""
+
+    numbers = itertools.count(1)
+    return PLACEHOLDER_PATTERN.sub(
+        lambda match: "%" if match.group(1) == "%" else f"${next(numbers)}", sql
+    )
@@ -0,0 +1,126 @@
+"""
+Module for routing ORM queries between the primary database and its
+read replicas.
+
+Reads go to a random replica and writes to the primary. Reads stick to
+the primary for the rest of a request that wrote, and, with
+`replica_pinning_middleware`, for the next requests of the same client
+within a short window, so clients read their own writes despite
+replication lag. Configure with the `REPLICA_ROUTER` setting.
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from config.db.counters import install_query_counters
+
+
+@dataclass
+class RoutingState:
+    """
+    Routing state of a request, or of a `pin_to_primary` block.
+    """
+
+    pinned: bool = False
+    written: bool = False
+
+
+_state: ContextVar[RoutingState | None] = ContextVar("db_routing", default=None)
+
+
+class ReplicaRouter:
+    """
+    Database router that spreads reads over read replicas.
+
+    Behavior::
+      Sends writes to `primary`, and reads to a random one of `replicas`,
+      or to `primary` when there are none.
+      Reads from `primary` as well for models of `primary_apps` (e.g.
+      the OAuth tokens a client has just been issued), inside
+      `track_writes(pinned=True)` or `pin_to_primary`, and once the
+      current request or block wrote.
+      Reads a replica that is a test mirror through the primary.
+      Allows relations between objects of any of these databases, which
+      hold the same data, and never migrates a replica.
+      Counts the queries of every database, see `get_query_stats`.
+    """
+
+    def __init__(
+        self,
+        primary: str = None,
+        replicas: list[str] = None,
+        primary_apps: list[str] = None,
+    ) -> None:
+        options = getattr(settings, "REPLICA_ROUTER", {})
+        self.primary = primary or options.get("PRIMARY", DEFAULT_DB_ALIAS)
+        self.replicas = list(
+            options.get("REPLICAS", []) if replicas is None else replicas
+        )
+        self.primary_apps = set(
+            options.get("PRIMARY_APPS", []) if primary_apps is None else primary_apps
+        )
+        install_query_counters()
+
+    def db_for_read(self, model, **hints) -> str:
+        if not self.replicas or model._meta.app_label in self.primary_apps:
+            return self.primary
+        state = _state.get()
+        if state is not None and (state.pinned or state.written):
+            return self.primary
+        replica = random.choice(self.replicas)
+        # Test mirrors share the database, and transaction, of the primary
+        if self._is_mirror(replica):
+            return self.primary
+        return replica
+
+    def db_for_write(self, model, **hints) -> str:
+        if (state := _state.get()) is not None:
+            state.written = True
+        return self.primary
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool | None:
+        databases = {self.primary, *self.replicas}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, **hints) -> bool | None:
+        if db in self.replicas:
+            return False
+        return None
+
+    def _is_mirror(self, alias: str) -> bool:
+        name = connections[alias].settings_dict["NAME"]
+        return name == connections[self.primary].settings_dict["NAME"]
+
+
+@contextmanager
+def track_writes(pinned: bool = False) -> Iterator[RoutingState]:
+    """
+    Track the writes of a request, and pin its reads to the primary once
+    it wrote, or from the start when `pinned`.
+
+    Nested blocks report their writes to the enclosing one.
+    """
+
+    outer = _state.get()
+    state = RoutingState(pinned=pinned or bool(outer and outer.pinned))
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+        if outer is not None and state.written:
+            outer.written = True
+
+
+def pin_to_primary():
+    """Send the reads of a block to the primary database."""
+
+    return track_writes(pinned=True)
@@ -0,0 +1,160 @@
+"""
+Gunicorn configuration to serve the project in production.
+
+Serves `config.wsgi` with threaded workers, or `config.asgi` with
+uvicorn workers when `SERVER_INTERFACE=asgi`. Worker and thread counts
+default to values derived from the CPUs available to the container;
+every option can be overridden with the `GUNICORN_*` variables below.
+
+[Example]
+
+  gunicorn --config config/gunicorn.conf.py
+
+[Signals]
+  - HUP: graceful reload. Re-reads this file and replaces the workers
+    once they finished their requests. With `GUNICORN_PRELOAD` on, new
+    workers fork from the code the master loaded, so deploy new code by
+    restarting (or replacing) the container instead.
+  - TERM: graceful shutdown, within `GUNICORN_GRACEFUL_TIMEOUT` seconds.
+  - TTIN / TTOU: add or remove one worker.
+
+[Process-local state]
+  Every worker is a separate process, so anything kept in memory is per
+  worker and multiplied by `workers`:
+  - Local memory caches. With more than one worker, startup fails while
+    a cache that must be shared is process-local, see `greetings.checks`.
+  - Database pools (`DB_POOL_MAX_SIZE` connections each) and the HTTP
+    transport pool of recursive calls.
+  - The write-behind queue (`WRITE_BEHIND`) and its flusher thread. Each
+    worker starts its own on its first queued greeting, and writes what
+    is left when it exits (e.g. recycled after `GUNICORN_MAX_REQUESTS`).
+    Greetings queued in a worker that is killed are lost.
+  With `GUNICORN_PRELOAD`, the app is imported in the master: threads
+  started at import time do not exist in the forked workers. Start them
+  lazily, and reset inherited state in `post_fork`.
+
+@see  https://docs.gunicorn.org/en/stable/settings.html
+"""
+
+import math
+import os
+import sys
+from pathlib import Path
+
+# Gunicorn's rule of thumb for workers per CPU, and threads per worker:
+# requests mostly wait on the database and the OAuth token endpoint
+WORKERS_PER_CPU: int = 2
+THREADS_PER_WORKER: int = 4
+
+
+def get_env_bool(name: str, default: bool) -> bool:
+    return os.environ.get(name, str(default)).lower() in ("1", "true", "yes", "on")
+
+
+def get_env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name) or default)
+
+
+def get_cpu_count() -> int:
+    """
+    Return the CPUs this process may use, honouring its CPU affinity and
+    a cgroup v2 CPU quota (e.g. `docker run --cpus`), at least 1.
+    """
+
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:
+        count = os.cpu_count() or 1
+
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            count = min(count, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(count, 1)
+
+
+cpu_count = get_cpu_count()
+interface = os.environ.get("SERVER_INTERFACE", "wsgi").lower()
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+
+if interface == "asgi":
+    # One event loop per CPU, each serving many connections
+    wsgi_app = "config.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+    workers = get_env_int("GUNICORN_WORKERS", cpu_count)
+    threads = 1
+else:
+    wsgi_app = "config.wsgi:application"
+    worker_class = "gthread"
+    workers = get_env_int("GUNICORN_WORKERS", WORKERS_PER_CPU * cpu_count + 1)
+    threads = get_env_int("GUNICORN_THREADS", THREADS_PER_WORKER)
+
+# Import the app once in the master, so workers share its memory pages
+# copy-on-write and start faster. Code reloading needs it off.
+reload = get_env_bool("GUNICORN_RELOAD", False)
+preload_app = get_env_bool("GUNICORN_PRELOAD", True) and not reload
+
+# Recycle workers after that many requests, to bound slow memory growth.
+# The jitter keeps workers from restarting all at once.
+max_requests = get_env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = get_env_int("GUNICORN_MAX_REQUESTS_JITTER", max_requests // 10)
+
+timeout = get_env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = get_env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+keepalive = get_env_int("GUNICORN_KEEPALIVE", 5)
+
+# Worker heartbeats on tmpfs, a disk-backed /tmp can stall them in Docker
+if Path("/dev/shm").is_dir():
+    worker_tmp_dir = "/dev/shm"
+
+# Access logs cost a write per request, so they are opt-in
+accesslog = "-" if get_env_bool("GUNICORN_ACCESS_LOG", False) else None
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+
+
+def on_starting(server) -> None:
+    # Each worker would keep its own copy of the state workers must share,
+    # e.g. the collection version in a local memory cache
+    if workers > 1:
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.prod")
+        from greetings.checks import check_shared_caches
+
+        if warnings := check_shared_caches():
+            raise RuntimeError(
+                f"{warnings[0].msg} Use a shared cache, or GUNICORN_WORKERS=1."
+            )
+
+
+def when_ready(server) -> None:
+    server.log.info(
+        f"Serving {wsgi_app} with {workers} {worker_class} workers x {threads} "
+        f"threads ({cpu_count} CPUs), preload={preload_app}."
+    )
+
+
+def pre_fork(server, worker) -> None:
+    # Workers must not share database connections opened by the master
+    if preload_app:
+        from django.db import connections
+
+        connections.close_all()
+
+
+def post_fork(server, worker) -> None:
+    # The flusher thread of a write-behind queue copied from the master did
+    # not survive the fork: the worker starts a queue of its own instead
+    if writebehind := sys.modules.get("greetings.utils.writebehind"):
+        writebehind.reset_write_behind_queue()
+
+
+def worker_exit(server, worker) -> None:
+    # Write queued greetings while the database connections are still open
+    if writebehind := sys.modules.get("greetings.utils.writebehind"):
+        writebehind.close_write_behind_queue()
+    # Close pooled database connections, if the worker used a pool
+    if pool := sys.modules.get("config.db.pool"):
+        pool.close_pools()
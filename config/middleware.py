@@ -0,0 +1,81 @@
+"""
+Module for project-wide middleware.
+"""
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest
+from django.utils.module_loading import import_string
+
+
+class ScopedMiddleware:
+    """
+    Middleware that runs a nested middleware stack for some paths only.
+
+    Behavior::
+      Builds the stack listed in `SCOPED_MIDDLEWARE["MIDDLEWARE"]`, in
+      `MIDDLEWARE` order, and runs it for requests whose path starts
+      with one of `SCOPED_MIDDLEWARE["PREFIXES"]`, e.g. the session,
+      CSRF and messages middleware for `/admin/`. Other requests skip
+      the stack entirely.
+      Forwards `process_view` and `process_exception` to the middleware
+      of the stack, for scoped requests.
+      Runs sync or async, like the middleware it wraps.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        options = getattr(settings, "SCOPED_MIDDLEWARE", {})
+        self.prefixes = tuple(options.get("PREFIXES", []))
+        self.get_response = get_response
+        self.middleware = []
+        self.stack = get_response
+        for path in reversed(options.get("MIDDLEWARE", [])):
+            try:
+                instance = import_string(path)(self.stack)
+            except MiddlewareNotUsed:
+                continue
+            self.middleware.insert(0, instance)
+            self.stack = instance
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if self.is_scoped(request):
+            return self.stack(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request: HttpRequest):
+        if self.is_scoped(request):
+            return await self.stack(request)
+        return await self.get_response(request)
+
+    def process_view(self, request: HttpRequest, view_func, view_args, view_kwargs):
+        if not self.is_scoped(request):
+            return None
+        for instance in self.middleware:
+            if hasattr(instance, "process_view"):
+                response = instance.process_view(
+                    request, view_func, view_args, view_kwargs
+                )
+                if response is not None:
+                    return response
+        return None
+
+    def process_exception(self, request: HttpRequest, exception: Exception):
+        if not self.is_scoped(request):
+            return None
+        for instance in reversed(self.middleware):
+            if hasattr(instance, "process_exception"):
+                response = instance.process_exception(request, exception)
+                if response is not None:
+                    return response
+        return None
+
+    def is_scoped(self, request: HttpRequest) -> bool:
+        return request.path_info.startswith(self.prefixes)
@@ -16,6 +16,8 @@ from pathlib import Path
 
 import environ
 
+from config.db.backends import get_engine
+
 env = environ.Env(DEBUG=(bool, False))
 
 # Set the project base directory
@@ -53,6 +55,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "config.db.middleware.replica_pinning_middleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -87,6 +90,68 @@ WSGI_APPLICATION = "config.wsgi.application"
 
 DATABASES = {"default": env.db()}
 
+# Keep connections open across requests (seconds, 0 closes them after each
+# request) and ping a reused connection before its first query.
+DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = env.bool(
+    "CONN_HEALTH_CHECKS", default=True
+)
+
+# Backends in config/db/backends add an optional connection pool, shared
+# by the threads of a process, and prepared statements on PostgreSQL.
+DATABASES["default"]["ENGINE"] = get_engine(DATABASES["default"]["ENGINE"])
+DATABASES["default"]["PREPARED_STATEMENTS"] = {
+    # Executions of a query before it is prepared, 0 disables
+    "THRESHOLD": env.int("DB_PREPARE_THRESHOLD", default=5),
+    "MAX_SIZE": 100,
+    # Hot queries: greetings, and the access token lookup of every request
+    "TABLES": ["greetings_greeting", "oauth2_provider_accesstoken"],
+}
+if env.bool("DB_POOL", default=False):
+    DATABASES["default"]["POOL"] = {
+        "MAX_SIZE": env.int("DB_POOL_MAX_SIZE", default=10),
+        "TIMEOUT": env.float("DB_POOL_TIMEOUT", default=10),
+        "CHECK_IDLE": env.float("DB_POOL_CHECK_IDLE", default=30),
+        "MAX_LIFETIME": env.float("DB_POOL_MAX_LIFETIME", default=3600),
+    }
+    # Hand connections back to the pool at the end of each request
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+
+# Read replicas, as a comma-separated list of database URLs. They share the
+# options of `default`, and tests use the test database of `default`.
+for index, url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[]), start=1):
+    replica = {**DATABASES["default"], **env.db_url_config(url)}
+    replica["ENGINE"] = get_engine(replica["ENGINE"])
+    replica["TEST"] = {"MIRROR": "default"}
+    DATABASES[f"replica_{index}"] = replica
+
+# Reads go to the replicas and writes to `default`, see config/db/routers.py
+DATABASE_ROUTERS = ["config.db.routers.ReplicaRouter"]
+
+REPLICA_ROUTER = {
+    "REPLICAS": [alias for alias in DATABASES if alias != "default"],
+    # Seconds a client keeps reading from `default` after a write
+    "STICKY_SECONDS": env.float("DB_REPLICA_STICKY_SECONDS", default=5),
+    # Apps read from `default` only, e.g. tokens a client was just issued
+    "PRIMARY_APPS": ["oauth2_provider"],
+    # Cache of the pins, must be shared (see CACHE_URL)
+    "CACHE_ALIAS": "default",
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# The `greetings` alias holds the collection version (ETag) and the rendered
+# list payloads keyed by it. The `default` alias holds the Idempotency-Key
+# responses and locks, and the read replica pins. With more than one process,
+# point both GREETINGS_CACHE_URL and CACHE_URL at a shared backend (e.g.
+# redis://), see `greetings.checks`. `check --deploy` warns about local ones.
+
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
+    "greetings": env.cache("GREETINGS_CACHE_URL", default="locmemcache://greetings"),
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -172,9 +237,27 @@ REST_FRAMEWORK = {
   ),
   'DEFAULT_PERMISSION_CLASSES': (
     # 'rest_framework.permissions.IsAuthenticated',
-  )
+  ),
+  # orjson-backed JSON, falls back to the stdlib when orjson is missing
+  'DEFAULT_RENDERER_CLASSES': (
+    'greetings.renderers.FastJSONRenderer',
+    'rest_framework.renderers.BrowsableAPIRenderer',
+  ),
+  'DEFAULT_PARSER_CLASSES': (
+    'greetings.parsers.FastJSONParser',
+    'rest_framework.parsers.FormParser',
+    'rest_framework.parsers.MultiPartParser',
+  ),
 }
 
 OAUTH2_PROVIDER = {
   'SCOPES': {'read': 'Read scope', 'write': 'Write scope'}
 }
+
+# Configuration for the greetings app
+# See greetings/utils/settings.py for all available options and defaults.
+
+GREETINGS = {
+  'TOKEN_CLIENT_MODE': env.str('TOKEN_CLIENT_MODE', default='http'),
+  'WRITE_BEHIND': env.bool('WRITE_BEHIND', default=False),
+}
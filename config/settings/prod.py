@@ -1 +1,126 @@
-from .base import *
\ No newline at end of file
+"""
+Production settings, tuned for the token-authenticated JSON API.
+
+Differences with `base.py`:
+  - `DEBUG` is always off.
+  - Session, CSRF, auth, messages and clickjacking middleware only run
+    for the HTML routes that use them (`/admin/`, `/api-auth/`, `/o/`),
+    see `config.middleware.ScopedMiddleware`. API routes authenticate
+    with OAuth2 bearer tokens and never read a session or a CSRF token.
+  - Only JSON is rendered, without the browsable API.
+  - Templates (admin, OAuth pages) are cached once loaded.
+  - Database connections persist for `CONN_MAX_AGE` seconds (600 by
+    default), unless a connection pool (`DB_POOL`) is used.
+  - `CACHE_URL` and `GREETINGS_CACHE_URL` are required, with no local
+    memory default: they must be shared, see `greetings.checks`.
+  - Logs at WARNING (root) and INFO (`greetings`), instead of DEBUG for
+    everything, which also logged every OAuth token check.
+
+Per-request overhead, measured with
+`utility/scripts/benchmarks/settings_overhead.py` (both profiles with
+`DEBUG=False`, in-process test client, SQLite, one CPU):
+
+  list greetings (cached page)   base  5611 us | prod  4805 us
+  404 under /greetings/          base   683 us | prod   492 us
+
+Most of the remaining cost of the list is its two OAuth token lookups.
+"""
+
+from copy import deepcopy
+
+from .base import *  # noqa: F401,F403
+from .base import (
+    DATABASES,
+    LOGGING,
+    MIDDLEWARE,
+    REST_FRAMEWORK,
+    TEMPLATES,
+    env,
+)
+
+DEBUG = False
+
+
+# Middleware
+# Browser-only middleware runs for the HTML routes only.
+
+SCOPED_MIDDLEWARE = {
+    "PREFIXES": ["/admin/", "/api-auth/", "/o/"],
+    "MIDDLEWARE": [
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        "django.middleware.csrf.CsrfViewMiddleware",
+        "django.contrib.auth.middleware.AuthenticationMiddleware",
+        "django.contrib.messages.middleware.MessageMiddleware",
+        "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    ],
+}
+
+MIDDLEWARE = [
+    middleware
+    for middleware in MIDDLEWARE
+    if middleware not in SCOPED_MIDDLEWARE["MIDDLEWARE"]
+]
+MIDDLEWARE.insert(
+    MIDDLEWARE.index("django.middleware.common.CommonMiddleware") + 1,
+    "config.middleware.ScopedMiddleware",
+)
+
+# The admin checks look for its middleware in `MIDDLEWARE`, not in the
+# scoped stack that runs it for `/admin/`
+SILENCED_SYSTEM_CHECKS = ["admin.E408", "admin.E409", "admin.E410"]
+
+
+# Templates
+# Cache compiled templates, the loaders of `APP_DIRS` behind a cached loader.
+
+TEMPLATES = deepcopy(TEMPLATES)
+TEMPLATES[0]["APP_DIRS"] = False
+TEMPLATES[0]["OPTIONS"]["loaders"] = [
+    (
+        "django.template.loaders.cached.Loader",
+        [
+            "django.template.loaders.filesystem.Loader",
+            "django.template.loaders.app_directories.Loader",
+        ],
+    ),
+]
+
+
+# Database
+# Persistent connections, unless a pool hands them back after each request.
+
+DATABASES = deepcopy(DATABASES)
+for database in DATABASES.values():
+    if not database.get("POOL"):
+        database["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=600)
+    database["CONN_HEALTH_CHECKS"] = True
+
+
+# Cache
+# Shared by the workers (see `greetings.checks`), e.g. redis://cache:6379/0.
+# Gunicorn refuses to start more than one worker with locmemcache://, see
+# config/gunicorn.conf.py.
+
+CACHES = {
+    "default": env.cache("CACHE_URL"),
+    "greetings": env.cache("GREETINGS_CACHE_URL"),
+}
+
+
+# Django REST Framework
+# JSON only: no browsable API, and cheaper content negotiation.
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_RENDERER_CLASSES": ("greetings.renderers.FastJSONRenderer",),
+}
+
+
+# Logging
+
+LOGGING = deepcopy(LOGGING)
+LOGGING["root"]["level"] = env.str("LOG_LEVEL", default="WARNING")
+LOGGING["loggers"] = {
+    "greetings": {"level": env.str("GREETINGS_LOG_LEVEL", default="INFO")},
+    "django.request": {"level": "ERROR"},
+}
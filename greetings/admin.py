@@ -1,5 +1,24 @@
 from django.contrib import admin
 
 from greetings.models import Greeting
+from greetings.utils.services import CollectionVersionService
 
-admin.site.register(Greeting)
+
+@admin.register(Greeting)
+class GreetingAdmin(admin.ModelAdmin):
+    """
+    Admin for the Greeting model that bumps the collection version on
+    every change, which invalidates cached list responses and ETags.
+    """
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        CollectionVersionService.bump()
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        CollectionVersionService.bump()
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        CollectionVersionService.bump()
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class GreetingsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "greetings"
+
+    def ready(self) -> None:
+        from greetings import checks  # noqa: F401
@@ -0,0 +1,256 @@
+"""
+Module for the access token cache used by the OAuth2 services.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, Hashable
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Callable that requests a new token and returns `(access_token, expires_in)`
+TokenFetcher = Callable[[], tuple[str, int]]
+AsyncTokenFetcher = Callable[[], Awaitable[tuple[str, int]]]
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    """
+    Access token together with its absolute (monotonic) refresh and expiry times.
+    """
+
+    access_token: str
+    refresh_at: float
+    expires_at: float
+
+
+@dataclass
+class TokenCacheStats:
+    """
+    Counters to monitor how often the token endpoint is reached.
+    `deduplicated` counts callers that reused an in-flight refresh
+    instead of requesting a token themselves.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+    deduplicated: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class _Flight:
+    """
+    A single in-flight token request that concurrent callers can wait on.
+    `owner` is the background thread or task running it, if any.
+    """
+
+    def __init__(self, owner: threading.Thread | asyncio.Task = None) -> None:
+        self.future: Future = Future()
+        self.owner = owner
+
+    def is_active(self) -> bool:
+        if self.future.done():
+            return False
+        if isinstance(self.owner, asyncio.Task):
+            # A task left behind on a closed loop will never finish
+            return not self.owner.get_loop().is_closed()
+        return True
+
+
+class TokenCache:
+    """
+    Thread-safe, expiry-aware cache for OAuth2 access tokens.
+
+    Behavior::
+      - Returns a cached token until its refresh time, which is
+        `refresh_fraction` of its lifetime, or `leeway` seconds before
+        it expires, whichever comes first.
+      - Past the refresh time (and up to `grace` seconds past expiry),
+        returns the cached token and refreshes it in the background.
+      - Closes the database connections of a background refresh thread
+        once it finishes.
+      - Fetches a new token in the caller's thread if none is usable.
+      - Runs at most one refresh per key (single-flight); concurrent
+        callers wait on its result instead of fetching themselves.
+      - `aget_or_fetch` does the same on the event loop, refreshing
+        with an asyncio task instead of a thread.
+    """
+
+    def __init__(
+        self,
+        leeway: float = 30,
+        refresh_fraction: float = 1.0,
+        grace: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.leeway = leeway
+        self.refresh_fraction = refresh_fraction
+        self.grace = grace
+        self.stats = TokenCacheStats()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens: dict[Hashable, CachedToken] = {}
+        self._flights: dict[Hashable, _Flight] = {}
+
+    def get_or_fetch(self, key: Hashable, fetch: TokenFetcher) -> str:
+        with self._lock:
+            token, stale = self._lookup(key)
+            if token is not None:
+                if stale:
+                    self._schedule_refresh(key, fetch)
+                return token.access_token
+            flight, is_leader = self._join_flight(key)
+
+        if is_leader:
+            self._run_flight(key, flight, fetch)
+        return flight.future.result().access_token
+
+    async def aget_or_fetch(self, key: Hashable, fetch: AsyncTokenFetcher) -> str:
+        with self._lock:
+            token, stale = self._lookup(key)
+            if token is not None:
+                if stale:
+                    self._schedule_arefresh(key, fetch)
+                return token.access_token
+            flight, is_leader = self._join_flight(key)
+
+        if is_leader:
+            await self._arun_flight(key, flight, fetch)
+        token = await asyncio.wrap_future(flight.future)
+        return token.access_token
+
+    def invalidate(self, key: Hashable = None) -> None:
+        with self._lock:
+            if key is None:
+                self._tokens.clear()
+            else:
+                self._tokens.pop(key, None)
+
+    def _lookup(self, key: Hashable) -> tuple[CachedToken | None, bool]:
+        # Caller must hold `self._lock`
+        now = self._clock()
+        token = self._tokens.get(key)
+        if token is None or now >= token.expires_at + self.grace:
+            self.stats.misses += 1
+            return None, False
+        self.stats.hits += 1
+        return token, now >= token.refresh_at
+
+    def _active_flight(self, key: Hashable) -> _Flight | None:
+        # Caller must hold `self._lock`
+        flight = self._flights.get(key)
+        if flight is not None and not flight.is_active():
+            self._flights.pop(key, None)
+            return None
+        return flight
+
+    def _join_flight(self, key: Hashable) -> tuple[_Flight, bool]:
+        # Caller must hold `self._lock`
+        flight = self._active_flight(key)
+        if flight is not None:
+            self.stats.deduplicated += 1
+            return flight, False
+        flight = self._flights[key] = _Flight()
+        return flight, True
+
+    def _schedule_refresh(self, key: Hashable, fetch: TokenFetcher) -> None:
+        # Caller must hold `self._lock`
+        if self._active_flight(key) is not None:
+            self.stats.deduplicated += 1
+            return
+        flight = self._flights[key] = _Flight()
+        flight.owner = threading.Thread(
+            target=self._refresh,
+            args=(key, flight, fetch),
+            name="token-refresh",
+            daemon=True,
+        )
+        flight.owner.start()
+
+    def _schedule_arefresh(self, key: Hashable, fetch: AsyncTokenFetcher) -> None:
+        # Caller must hold `self._lock`
+        if self._active_flight(key) is not None:
+            self.stats.deduplicated += 1
+            return
+        flight = self._flights[key] = _Flight()
+        flight.owner = asyncio.get_running_loop().create_task(
+            self._arefresh(key, flight, fetch)
+        )
+
+    def _run_flight(self, key: Hashable, flight: _Flight, fetch: TokenFetcher) -> None:
+        try:
+            self._land(key, flight, *fetch())
+        except BaseException as exc:
+            self._abort(key, flight, exc)
+            raise
+
+    async def _arun_flight(
+        self, key: Hashable, flight: _Flight, fetch: AsyncTokenFetcher
+    ) -> None:
+        try:
+            self._land(key, flight, *await fetch())
+        except BaseException as exc:
+            self._abort(key, flight, exc)
+            raise
+
+    def _refresh(self, key: Hashable, flight: _Flight, fetch: TokenFetcher) -> None:
+        try:
+            self._run_flight(key, flight, fetch)
+            self._on_refreshed()
+        except Exception as exc:
+            self._on_refresh_failed(exc)
+        finally:
+            # Fetching may query the database, e.g. the local token client,
+            # and nothing else closes the connections this thread opened
+            connections.close_all()
+
+    async def _arefresh(
+        self, key: Hashable, flight: _Flight, fetch: AsyncTokenFetcher
+    ) -> None:
+        try:
+            await self._arun_flight(key, flight, fetch)
+            self._on_refreshed()
+        except Exception as exc:
+            self._on_refresh_failed(exc)
+
+    def _land(
+        self, key: Hashable, flight: _Flight, access_token: str, expires_in: int
+    ) -> None:
+        now = self._clock()
+        refresh_in = min(expires_in * self.refresh_fraction, expires_in - self.leeway)
+        token = CachedToken(access_token, now + refresh_in, now + expires_in)
+        with self._lock:
+            self._tokens[key] = token
+            self._release(key, flight)
+        flight.future.set_result(token)
+
+    def _abort(self, key: Hashable, flight: _Flight, exc: BaseException) -> None:
+        with self._lock:
+            self._release(key, flight)
+        if not flight.future.done():
+            flight.future.set_exception(exc)
+
+    def _release(self, key: Hashable, flight: _Flight) -> None:
+        # Caller must hold `self._lock`
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def _on_refreshed(self) -> None:
+        with self._lock:
+            self.stats.refreshes += 1
+        logger.debug("Refreshed cached access token in background.")
+
+    def _on_refresh_failed(self, exc: Exception) -> None:
+        with self._lock:
+            self.stats.refresh_errors += 1
+        logger.warning(f"Failed to refresh cached access token: {exc}")
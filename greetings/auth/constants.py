@@ -9,6 +9,12 @@ related constants to be reused in the greetings app.
 # OAuth Endpoints
 TOKEN_ENDPOINT: str = "http://127.0.0.1:8000/o/token/"
 
+# Token client modes
+# - http:  request tokens from TOKEN_ENDPOINT over (loopback) HTTP.
+# - local: mint tokens in-process through the OAuthLib server.
+TOKEN_CLIENT_HTTP: str = "http"
+TOKEN_CLIENT_LOCAL: str = "local"
+
 # Request Header values
 CONTENT_TYPE: str = "application/x-www-form-urlencoded"
 CACHE_CONTROL: str = "no-cache"
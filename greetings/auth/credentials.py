@@ -5,6 +5,7 @@ Module for the Credential Manager service.
 import base64
 import logging
 import os
+import threading
 
 import environ
 from django.core.exceptions import ImproperlyConfigured
@@ -13,6 +14,9 @@ from config.settings.base import BASE_DIR
 
 logger = logging.getLogger(__name__)
 
+CREDENTIALS_ENV_FILE: str = os.path.join(BASE_DIR, ".envs", "credentials.env")
+CREDENTIAL_ENV_VARS: tuple[str] = ("CLIENT_ID", "CLIENT_SECRET")
+
 
 class CredentialManagerService:
     """
@@ -22,6 +26,8 @@ class CredentialManagerService:
       - Loads client credentials from host machine or env file.
       - Raises ImproperlyConfigured exception for credentials not found.
       - Returns a base64 encoded client id and secret credential.
+      - Memoizes the encoded credential until the env file's mtime or
+        the credential env variables change, or `reload()` is called.
     """
 
     _instance = None
@@ -33,20 +39,50 @@ class CredentialManagerService:
         return cls._instance
 
     def _initialize(self):
-        pass
+        self._lock = threading.Lock()
+        self._encoded_credential = None
+        self._fingerprint = None
 
     def get_encoded_credential(self) -> str:
+        fingerprint = self._get_fingerprint()
+        with self._lock:
+            if self._encoded_credential is None or fingerprint != self._fingerprint:
+                self._encoded_credential = self._load_encoded_credential()
+                self._fingerprint = fingerprint
+            return self._encoded_credential
+
+    def reload(self) -> str:
+        """Discard the memoized credential, e.g. after rotating credentials."""
+
+        with self._lock:
+            self._encoded_credential = None
+        return self.get_encoded_credential()
+
+    def _load_encoded_credential(self) -> str:
+        logger.debug("Loading and encoding client credentials.")
         credentials = self._load_env_credentials()
         encoded_credential = self._encode_credentials(
             credentials["CLIENT_ID"], credentials["CLIENT_SECRET"]
         )
         return encoded_credential
 
+    def _get_fingerprint(self) -> tuple:
+        try:
+            mtime = os.stat(CREDENTIALS_ENV_FILE).st_mtime_ns
+        except OSError:
+            mtime = None
+        return (mtime, *(os.environ.get(name) for name in CREDENTIAL_ENV_VARS))
+
     def _load_env_credentials(self) -> tuple[str]:
         client_id, client_secret = self._load_from_host()
 
         if not self._is_credentials_set(client_id, client_secret):
-            client_id, client_secret = self._load_from_env_file()
+            file_client_id, file_client_secret = self._load_from_env_file()
+            # Credentials set on the host machine take precedence
+            client_id = file_client_id if client_id is None else client_id
+            client_secret = (
+                file_client_secret if client_secret is None else client_secret
+            )
         if not self._is_credentials_set(client_id, client_secret):
             raise ImproperlyConfigured(
                 "Client credentials not found on host machine or env file."
@@ -60,8 +96,18 @@ class CredentialManagerService:
 
     def _load_from_env_file(self) -> str:
         logger.debug("Loading client credentials from env file.")
-        environ.Env.read_env(os.path.join(BASE_DIR, ".envs", "credentials.env"))
-        return self._load_envs()
+        file_envs = self._read_env_file()
+        return file_envs.get("CLIENT_ID", None), file_envs.get("CLIENT_SECRET", None)
+
+    def _read_env_file(self) -> dict[str, str]:
+        """
+        Read the env file into its own mapping instead of `os.environ`,
+        so loading credentials on a request never changes the process
+        environment and a changed file is never shadowed by stale values.
+        """
+        env_file = type("EnvFile", (environ.Env,), {"ENVIRON": {}})
+        env_file.read_env(CREDENTIALS_ENV_FILE)
+        return env_file.ENVIRON
 
     def _load_envs(self) -> str:
         client_id = os.environ.get("CLIENT_ID", None)
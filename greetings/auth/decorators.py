@@ -0,0 +1,35 @@
+"""
+Module for OAuth2 decorators to protect async views.
+"""
+
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseForbidden
+from oauth2_provider.oauth2_backends import OAuthLibCore
+from oauth2_provider.oauth2_validators import OAuth2Validator
+from oauthlib.oauth2 import Server
+
+
+def aprotected_resource(scopes=None, validator_cls=OAuth2Validator, server_cls=Server):
+    """
+    Async counterpart of `oauth2_provider.decorators.protected_resource`.
+    The token lookup runs in a worker thread so the event loop stays free.
+    """
+    _scopes = scopes or []
+
+    def decorator(view_func):
+        @wraps(view_func)
+        async def _validate(request, *args, **kwargs):
+            core = OAuthLibCore(server_cls(validator_cls()))
+            valid, oauthlib_req = await sync_to_async(core.verify_request)(
+                request, scopes=_scopes
+            )
+            if valid:
+                request.resource_owner = oauthlib_req.user
+                return await view_func(request, *args, **kwargs)
+            return HttpResponseForbidden()
+
+        return _validate
+
+    return decorator
@@ -2,21 +2,42 @@
 Module for OAuth2 services for the greetings app.
 """
 
-import requests
+import json
+from urllib.parse import urlparse
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import PermissionDenied
 from django.core.handlers.wsgi import WSGIRequest
+from django.http import HttpRequest, QueryDict
+from oauth2_provider.oauth2_backends import get_oauthlib_core
 from rest_framework.response import Response
 
+from greetings.auth.cache import TokenCache
 from greetings.auth.constants import *
 from greetings.auth.credentials import CredentialManagerService
+from greetings.auth.sessions import AsyncPooledHTTPSession, PooledHTTPSession
+from greetings.utils.settings import get_setting
 
 
 class OAuth2CredentialsService:
     """
     Singleton service to encapsulate logic to get an access token.
+
+    Behavior::
+      - Reuses cached access tokens keyed by client credential and scope.
+      - Requests a new access token only on a cache miss or refresh,
+        with a single refresh in flight per credential and scope.
+      - Requests tokens over HTTP or mints them in-process, depending
+        on the `TOKEN_CLIENT_MODE` setting.
+      - Provides `a`-prefixed async counterparts for ASGI views.
     """
 
     _instance = None
     _credential_service = None
+    _token_cache = None
+    _oauthlib_core = None
+    _http_session = None
+    _async_http_session = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -26,6 +47,11 @@ class OAuth2CredentialsService:
 
     def _initialize(self):
         self._credential_service = CredentialManagerService()
+        self._token_cache = TokenCache(
+            leeway=get_setting("TOKEN_CACHE_LEEWAY"),
+            refresh_fraction=get_setting("TOKEN_REFRESH_FRACTION"),
+            grace=get_setting("TOKEN_CACHE_GRACE"),
+        )
 
     def authorize_request(self, request: WSGIRequest) -> WSGIRequest:
         token = self.get_access_token()
@@ -33,20 +59,112 @@ class OAuth2CredentialsService:
         request.environ.setdefault("HTTP_AUTHORIZATION", auth)
         return request
 
-    def get_access_token(self) -> dict:
+    async def aauthorize_request(self, request: HttpRequest) -> HttpRequest:
+        token = await self.aget_access_token()
+        auth = "Bearer {0}".format(token)
+        request.META.setdefault("HTTP_AUTHORIZATION", auth)
+        return request
+
+    def get_access_token(self) -> str:
         encoded_credential = self._credential_service.get_encoded_credential()
-        response = self._request_access_token(encoded_credential)
-        return response.json()["access_token"]
+        key = (encoded_credential, get_setting("TOKEN_SCOPE"))
+        return self._token_cache.get_or_fetch(
+            key, lambda: self._fetch_access_token(encoded_credential)
+        )
+
+    async def aget_access_token(self) -> str:
+        encoded_credential = self._credential_service.get_encoded_credential()
+        key = (encoded_credential, get_setting("TOKEN_SCOPE"))
+        return await self._token_cache.aget_or_fetch(
+            key, lambda: self._afetch_access_token(encoded_credential)
+        )
+
+    def get_cache_stats(self) -> dict[str, int]:
+        return self._token_cache.stats.as_dict()
+
+    def get_pool_stats(self) -> dict[str, int]:
+        return self._get_http_session().get_pool_stats()
+
+    def _fetch_access_token(self, encoded_credential: str) -> tuple[str, int]:
+        if get_setting("TOKEN_CLIENT_MODE") == TOKEN_CLIENT_LOCAL:
+            payload = self._mint_access_token(encoded_credential)
+        else:
+            response = self._request_access_token(encoded_credential)
+            response.raise_for_status()
+            payload = response.json()
+        return payload["access_token"], int(payload.get("expires_in", 0))
+
+    async def _afetch_access_token(self, encoded_credential: str) -> tuple[str, int]:
+        if get_setting("TOKEN_CLIENT_MODE") == TOKEN_CLIENT_LOCAL:
+            payload = await sync_to_async(self._mint_access_token)(encoded_credential)
+        else:
+            response = await self._get_async_http_session().post(
+                url=TOKEN_ENDPOINT,
+                headers=self._get_headers(encoded_credential),
+                data=self._get_data(),
+            )
+            response.raise_for_status()
+            payload = response.json()
+        return payload["access_token"], int(payload.get("expires_in", 0))
+
+    def _mint_access_token(self, encoded_credential: str) -> dict:
+        """
+        Issue an access token through the OAuthLib server in-process,
+        with the same validation as the `/o/token/` endpoint.
+        """
+        if self._oauthlib_core is None:
+            self._oauthlib_core = get_oauthlib_core()
+
+        request = self._build_token_request(encoded_credential)
+        _, _, body, status = self._oauthlib_core.create_token_response(request)
+        if status != 200:
+            raise PermissionDenied(f"Failed to mint access token: {body}")
+        return json.loads(body)
+
+    def _build_token_request(self, encoded_credential: str) -> HttpRequest:
+        request = HttpRequest()
+        request.method = "POST"
+        request.path = request.path_info = urlparse(TOKEN_ENDPOINT).path
+        request.META.update(
+            {
+                "HTTP_AUTHORIZATION": AUTHORIZATION.format(encoded_credential),
+                "CONTENT_TYPE": CONTENT_TYPE,
+            }
+        )
+        request.POST = QueryDict(mutable=True)
+        request.POST.update(self._get_data())
+        return request
 
     def _request_access_token(self, encoded_credential: str) -> Response:
-        response = requests.post(
+        response = self._get_http_session().post(
             url=TOKEN_ENDPOINT,
             headers=self._get_headers(encoded_credential),
             data=self._get_data(),
-            timeout=10,
         )
         return response
 
+    def _get_http_session(self) -> PooledHTTPSession:
+        if self._http_session is None:
+            self._http_session = PooledHTTPSession(
+                pool_maxsize=get_setting("TOKEN_HTTP_POOL_MAXSIZE"),
+                connect_timeout=get_setting("TOKEN_HTTP_CONNECT_TIMEOUT"),
+                read_timeout=get_setting("TOKEN_HTTP_READ_TIMEOUT"),
+                max_retries=get_setting("TOKEN_HTTP_MAX_RETRIES"),
+                backoff_factor=get_setting("TOKEN_HTTP_BACKOFF_FACTOR"),
+            )
+        return self._http_session
+
+    def _get_async_http_session(self) -> AsyncPooledHTTPSession:
+        if self._async_http_session is None:
+            self._async_http_session = AsyncPooledHTTPSession(
+                pool_maxsize=get_setting("TOKEN_HTTP_POOL_MAXSIZE"),
+                connect_timeout=get_setting("TOKEN_HTTP_CONNECT_TIMEOUT"),
+                read_timeout=get_setting("TOKEN_HTTP_READ_TIMEOUT"),
+                max_retries=get_setting("TOKEN_HTTP_MAX_RETRIES"),
+                backoff_factor=get_setting("TOKEN_HTTP_BACKOFF_FACTOR"),
+            )
+        return self._async_http_session
+
     def _get_headers(self, credential: str) -> dict[str, str]:
         return {
             # Add request headers here
@@ -56,4 +174,8 @@ class OAuth2CredentialsService:
         }
 
     def _get_data(self) -> dict[str, str]:
-        return {"grant_type": GRANT_TYPE}
+        data = {"grant_type": GRANT_TYPE}
+        scope = get_setting("TOKEN_SCOPE")
+        if scope:
+            data["scope"] = scope
+        return data
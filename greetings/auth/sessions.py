@@ -0,0 +1,133 @@
+"""
+Module for the pooled HTTP sessions used to reach the Auth server.
+"""
+
+import asyncio
+import logging
+import weakref
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Transient upstream errors that are safe to retry
+RETRY_STATUS_CODES: tuple[int] = (502, 503, 504)
+
+
+class PooledHTTPSession:
+    """
+    Long-lived, thread-safe HTTP session with a bounded keep-alive pool.
+
+    Behavior::
+      - Reuses TCP connections across requests (HTTP keep-alive).
+      - Blocks callers once `pool_maxsize` connections are in use.
+      - Applies default connect/read timeouts to every request.
+      - Retries connection errors and 502/503/504 with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = 10,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.2,
+    ) -> None:
+        self.timeout = (connect_timeout, read_timeout)
+        self._adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=pool_maxsize,
+            pool_block=True,
+            max_retries=Retry(
+                total=max_retries,
+                backoff_factor=backoff_factor,
+                status_forcelist=RETRY_STATUS_CODES,
+                allowed_methods=None,
+                raise_on_status=False,
+            ),
+        )
+        self._session = requests.Session()
+        self._session.mount("http://", self._adapter)
+        self._session.mount("https://", self._adapter)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self._session.post(url, **kwargs)
+
+    def get_pool_stats(self) -> dict[str, int]:
+        """
+        Return connection counters aggregated over all host pools.
+        `reused` counts requests served on an already open connection.
+        """
+        stats = {"pools": 0, "requests": 0, "opened": 0, "reused": 0}
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats["pools"] += 1
+            stats["requests"] += pool.num_requests
+            stats["opened"] += pool.num_connections
+        stats["reused"] = max(stats["requests"] - stats["opened"], 0)
+        return stats
+
+    def close(self) -> None:
+        logger.debug("Closing pooled HTTP session.")
+        self._session.close()
+
+
+class AsyncPooledHTTPSession:
+    """
+    Async counterpart of `PooledHTTPSession` backed by `httpx.AsyncClient`.
+
+    Behavior::
+      - Keeps one keep-alive client per event loop, since httpx clients
+        cannot be shared across loops.
+      - Bounds open connections to `pool_maxsize` per client.
+      - Retries connection errors and 502/503/504 with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = 10,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.2,
+    ) -> None:
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self._limits = httpx.Limits(
+            max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize
+        )
+        self._timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self._clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        client = self._get_client()
+        for attempt in range(self.max_retries + 1):
+            retry = attempt < self.max_retries
+            try:
+                response = await client.post(url, **kwargs)
+                if not retry or response.status_code not in RETRY_STATUS_CODES:
+                    return response
+            except httpx.TransportError:
+                if not retry:
+                    raise
+            await asyncio.sleep(self.backoff_factor * (2**attempt))
+
+    async def aclose(self) -> None:
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(limits=self._limits, timeout=self._timeout)
+            self._clients[loop] = client
+        return client
@@ -0,0 +1,56 @@
+"""
+System checks for settings the greetings app relies on in production.
+
+Shared caches: the collection version (ETag), the rendered list payloads,
+the Idempotency-Key responses and locks, and the read replica pins are
+state every worker process must agree on. A local memory cache is private
+to its process, so with more than one worker they must live in a shared
+backend (e.g. redis://). Otherwise a worker keeps answering with a version
+another one already bumped, runs the view again for a retried
+Idempotency-Key, or reads from a replica that misses the client's write.
+"""
+
+from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Tags, Warning, register
+
+from greetings.utils.settings import get_setting
+
+# Settings naming a cache that must be shared, see above
+SHARED_CACHE_SETTINGS: tuple[str, ...] = (
+    "COLLECTION_VERSION_CACHE_ALIAS",
+    "RESPONSE_CACHE_ALIAS",
+    "IDEMPOTENCY_CACHE_ALIAS",
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_caches(app_configs=None, **kwargs) -> list[Warning]:
+    """
+    Warn when state meant to be shared across worker processes lives in a
+    process-local cache, where each worker only sees its own entries.
+    """
+
+    warnings = []
+    for setting_name, alias in get_shared_cache_aliases():
+        backend = settings.CACHES.get(alias, {}).get("BACKEND", "")
+        if backend.endswith(LocMemCache.__name__):
+            warnings.append(
+                Warning(
+                    f"{setting_name} uses the process-local cache {alias!r}.",
+                    hint="Point it at a shared backend (e.g. redis://) when "
+                    "running more than one worker process.",
+                    id="greetings.W001",
+                )
+            )
+    return warnings
+
+
+def get_shared_cache_aliases() -> list[tuple[str, str]]:
+    aliases = [(name, get_setting(name)) for name in SHARED_CACHE_SETTINGS]
+    # Read-your-writes pins, see `config.db.middleware`
+    options = getattr(settings, "REPLICA_ROUTER", {})
+    if options.get("REPLICAS"):
+        alias = options.get("CACHE_ALIAS", "default")
+        aliases.append(("REPLICA_ROUTER['CACHE_ALIAS']", alias))
+    return aliases
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.2 on 2026-10-17 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("greetings", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="greeting",
+            index=models.Index(
+                fields=["greeting_created_at", "greeting_id"],
+                name="greeting_created_at_id_idx",
+            ),
+        ),
+    ]
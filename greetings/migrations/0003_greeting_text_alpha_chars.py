@@ -0,0 +1,19 @@
+# Generated by Django 4.2.2 on 2026-10-17 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("greetings", "0002_greeting_created_at_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="greeting",
+            constraint=models.CheckConstraint(
+                check=models.Q(("greeting_text__regex", "^[a-zA-Z]{1,50}$")),
+                name="greeting_text_alpha_chars",
+            ),
+        ),
+    ]
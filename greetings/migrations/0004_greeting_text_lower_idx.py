@@ -0,0 +1,21 @@
+# Generated by Django 4.2.2 on 2026-10-17 14:05
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("greetings", "0003_greeting_text_alpha_chars"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="greeting",
+            index=models.Index(
+                django.db.models.functions.text.Lower("greeting_text"),
+                models.F("greeting_text"),
+                name="greeting_text_lower_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.2 on 2026-10-17 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("greetings", "0004_greeting_text_lower_idx"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="greeting",
+            name="greeting_text_alpha_chars",
+        ),
+        migrations.AddConstraint(
+            model_name="greeting",
+            constraint=models.CheckConstraint(
+                check=models.Q(("greeting_text__regex", "^[a-zA-Z]{1,50}\\Z")),
+                name="greeting_text_alpha_chars",
+            ),
+        ),
+    ]
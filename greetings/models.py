@@ -1,6 +1,7 @@
 import uuid
 
 from django.db import models
+from django.db.models.functions import Lower
 
 from greetings.utils.validators import AlphaCharsValidator
 
@@ -27,7 +28,28 @@ class Greeting(models.Model):
 
     class Meta:
         ordering = ["greeting_created_at"]
+        indexes = [
+            # Keyset pagination on (greeting_created_at, greeting_id)
+            models.Index(
+                fields=["greeting_created_at", "greeting_id"],
+                name="greeting_created_at_id_idx",
+            ),
+            # Case-insensitive prefix search, as a range scan on lower(text)
+            models.Index(
+                Lower("greeting_text"), "greeting_text", name="greeting_text_lower_idx"
+            ),
+        ]
+        constraints = [
+            # `AlphaCharsValidator` and `max_length`, enforced by the database.
+            # `\Z`, unlike `$`, never matches before a trailing newline, in
+            # PostgreSQL and Python (SQLite) regular expressions alike.
+            models.CheckConstraint(
+                check=models.Q(greeting_text__regex=r"^[a-zA-Z]{1,50}\Z"),
+                name="greeting_text_alpha_chars",
+            ),
+        ]
 
     def save(self, *args, **kwargs):
-        self.full_clean()
+        # Skip the query per CHECK constraint, the db enforces them on write
+        self.full_clean(validate_constraints=False)
         super().save(*args, **kwargs)
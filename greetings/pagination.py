@@ -0,0 +1,189 @@
+"""
+Module that defines the keyset (cursor) pagination for greetings, in
+created order and in search (alphabetical) order.
+"""
+
+import uuid
+from base64 import b64decode, b64encode
+from collections import namedtuple
+from urllib import parse
+
+from django.db.models import Q, QuerySet
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from greetings.utils.settings import get_setting
+
+Cursor = namedtuple("Cursor", ["created_at", "greeting_id", "reverse"])
+SearchCursor = namedtuple("SearchCursor", ["greeting_text", "reverse"])
+
+
+class GreetingCursorPagination(BasePagination):
+    """
+    Keyset pagination on `(greeting_created_at, greeting_id)`.
+
+    Behavior::
+      Filters on the last seen key instead of using an OFFSET, so every
+      page costs one indexed range scan regardless of its position.
+      Fetches one extra row to detect a next page, without a COUNT(*).
+      Encodes positions as opaque `cursor` query params (next/previous).
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    ordering = ("greeting_created_at", "greeting_id")
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None) -> list:
+        return self.paginate_rows(list(self.get_page_queryset(queryset, request)))
+
+    def get_page_queryset(self, queryset: QuerySet, request) -> QuerySet:
+        """
+        Return the (lazy) queryset for the requested page, plus one row.
+        Async callers can evaluate it with `async for` and then pass
+        the rows to `paginate_rows`.
+        """
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+
+        if self.cursor is None:
+            return queryset.order_by(*self.ordering)[: self.page_size + 1]
+
+        ordering = self.ordering
+        if self.cursor.reverse:
+            ordering = [f"-{field}" for field in self.ordering]
+        key = self.get_key_filter(
+            self.get_cursor_values(self.cursor), self.cursor.reverse
+        )
+        return queryset.filter(key).order_by(*ordering)[: self.page_size + 1]
+
+    def get_key_filter(self, values: tuple, reverse: bool) -> Q:
+        # Rows after (or before) the cursor in `ordering`, as a keyset filter.
+        # The leading bound on the first column lets the planner seek the
+        # index to the cursor, instead of scanning it from the start.
+        lookup = "lt" if reverse else "gt"
+        (first, second), (first_value, second_value) = self.ordering, values
+        bound = Q(**{f"{first}__{lookup}e": first_value})
+        return bound & (
+            Q(**{f"{first}__{lookup}": first_value})
+            | Q(**{first: first_value, f"{second}__{lookup}": second_value})
+        )
+
+    def get_cursor_values(self, cursor: Cursor) -> tuple:
+        return cursor.created_at, cursor.greeting_id
+
+    def paginate_rows(self, rows: list) -> list:
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if self.cursor is not None and self.cursor.reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+
+        if not rows:
+            self.has_next = self.has_previous = False
+        self.first, self.last = (rows[0], rows[-1]) if rows else (None, None)
+        return rows
+
+    def get_paginated_response(self, data) -> Response:
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.last, reverse=False)
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(self.first, reverse=True)
+
+    def get_page_size(self, request) -> int:
+        page_size = get_setting("LIST_PAGE_SIZE")
+        max_page_size = get_setting("LIST_MAX_PAGE_SIZE")
+        try:
+            requested = int(request.GET[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return page_size
+        return min(requested, max_page_size) if requested > 0 else page_size
+
+    def decode_cursor(self, request) -> Cursor | None:
+        encoded = request.GET.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode("ascii")).decode("ascii")
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            reverse = bool(int(tokens.get("r", ["0"])[0]))
+            return self.parse_cursor_tokens(tokens, reverse)
+        except (KeyError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def parse_cursor_tokens(self, tokens: dict, reverse: bool) -> Cursor:
+        created_at = parse_datetime(tokens["p"][0])
+        greeting_id = uuid.UUID(tokens["i"][0])
+        if created_at is None:
+            raise ValueError(self.invalid_cursor_message)
+        return Cursor(created_at, greeting_id, reverse)
+
+    def encode_cursor(self, greeting, reverse: bool) -> str:
+        tokens = self.get_cursor_tokens(greeting)
+        if reverse:
+            tokens["r"] = "1"
+
+        querystring = parse.urlencode(tokens)
+        encoded = b64encode(querystring.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_cursor_tokens(self, greeting) -> dict[str, str]:
+        return {
+            "p": greeting.greeting_created_at.isoformat(),
+            "i": str(greeting.greeting_id),
+        }
+
+
+class GreetingSearchPagination(GreetingCursorPagination):
+    """
+    Keyset pagination on `(lower(greeting_text), greeting_text)`, for
+    prefix search results in case-insensitive alphabetical order.
+
+    Behavior::
+      Pages like `GreetingCursorPagination`, with the text of the last
+      seen greeting as the cursor, so every page is one range scan of
+      the `greeting_text_lower_idx` index.
+      Expects a queryset annotated with `greeting_text_lower`.
+    """
+
+    ordering = ("greeting_text_lower", "greeting_text")
+
+    def get_cursor_values(self, cursor: SearchCursor) -> tuple:
+        return cursor.greeting_text.lower(), cursor.greeting_text
+
+    def parse_cursor_tokens(self, tokens: dict, reverse: bool) -> SearchCursor:
+        return SearchCursor(tokens["t"][0], reverse)
+
+    def get_cursor_tokens(self, greeting) -> dict[str, str]:
+        return {"t": greeting.greeting_text}
@@ -0,0 +1,51 @@
+"""
+Module that defines the JSON parsers for the greetings API.
+"""
+
+import codecs
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from greetings.renderers import FastJSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONParser(JSONParser):
+    """
+    Drop-in `JSONParser` backed by `orjson`, when it is installed.
+
+    Behavior::
+      Parses UTF-8 request bodies with `orjson`, which rejects NaN and
+      Infinity like a `STRICT_JSON` `JSONParser`.
+      Falls back to `JSONParser` without `orjson`, for other charsets,
+      or when `STRICT_JSON` is disabled.
+
+    Select it globally in `REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"]`,
+    or per view with DRF's `@parser_classes` decorator.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if not self.is_fast_path(encoding):
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except ValueError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
+
+    def is_fast_path(self, encoding: str) -> bool:
+        return (
+            orjson is not None
+            and self.strict
+            and codecs.lookup(encoding).name == "utf-8"
+        )
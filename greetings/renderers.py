@@ -0,0 +1,99 @@
+"""
+Module that defines the JSON renderers for the greetings API.
+"""
+
+import math
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Fallback for types that `orjson` does not encode natively
+_default = encoders.JSONEncoder().default
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Drop-in `JSONRenderer` backed by `orjson`, when it is installed.
+
+    Behavior::
+      Encodes UUIDs and datetimes natively and defers other types
+      (lazy strings, querysets, ...) to DRF's `JSONEncoder`.
+      Renders the same JSON values as `JSONRenderer` for compact, unicode
+      JSON, and the same bytes except for floats in exponent notation:
+      `orjson` writes `1e16` and `1.5e-7` where `JSONRenderer` writes
+      `1e+16` and `1.5e-07`.
+      Falls back to `JSONRenderer` without `orjson`, for indented output,
+      or when `COMPACT_JSON` / `UNICODE_JSON` are disabled.
+      Falls back as well for data `orjson` cannot encode, e.g. integers
+      beyond 64 bits, and for data with NaN or infinite floats, which
+      `orjson` writes as `null`: `JSONRenderer` raises `ValueError` for
+      them (`STRICT_JSON`, the default) or writes `NaN` / `Infinity`.
+
+    Select it globally in `REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"]`,
+    or per view with DRF's `@renderer_classes` decorator.
+    """
+
+    options = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        if data is None:
+            return b""
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if not self.is_fast_path(indent):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Only data with a `null` can hold a NaN or infinite float
+        if b"null" in ret and has_non_finite_float(data):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escape like `JSONRenderer`, so the output stays a javascript subset
+        if b"\xe2\x80" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028")
+            ret = ret.replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+    def is_fast_path(self, indent: int | None) -> bool:
+        return (
+            orjson is not None
+            and indent is None
+            and self.compact
+            and not self.ensure_ascii
+        )
+
+
+def has_non_finite_float(data) -> bool:
+    """Return whether `data` holds a NaN or infinite float, at any depth."""
+
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+def get_json_renderer() -> JSONRenderer:
+    """
+    Return the first JSON renderer in `DEFAULT_RENDERER_CLASSES`,
+    for responses rendered outside of DRF's views (async views, streams).
+    """
+
+    for renderer_class in api_settings.DEFAULT_RENDERER_CLASSES:
+        if issubclass(renderer_class, JSONRenderer):
+            return renderer_class()
+    return JSONRenderer()
@@ -1,4 +1,8 @@
-from rest_framework import serializers
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 
 from greetings.models import Greeting
 
@@ -17,3 +21,50 @@ class GreetingSerializer(serializers.ModelSerializer):
         Create and return Greeting instance, given validated data.
         """
         return Greeting.objects.create(**validated_data)
+
+
+class GreetingRowSerializer:
+    """
+    Read-only fast path for `GreetingSerializer` on list reads.
+
+    Behavior::
+      Fetches `values_list` rows instead of `Greeting` instances.
+      Formats UUIDs and datetimes in one loop, without DRF field machinery.
+      Produces the same representation (and JSON) as `GreetingSerializer`.
+    """
+
+    fields = ("greeting_id", "greeting_text", "greeting_created_at")
+
+    def __init__(self) -> None:
+        self._format_datetime = self._get_datetime_formatter()
+
+    def get_queryset(self, queryset: QuerySet) -> QuerySet:
+        return queryset.values_list(*self.fields, named=True)
+
+    def to_representation(self, row) -> dict:
+        return self.serialize([row])[0]
+
+    def serialize(self, rows) -> list[dict]:
+        format_datetime = self._format_datetime
+        return [
+            {
+                "greeting_id": str(greeting_id),
+                "greeting_text": greeting_text,
+                "greeting_created_at": format_datetime(created_at),
+            }
+            for greeting_id, greeting_text, created_at in rows
+        ]
+
+    def _get_datetime_formatter(self):
+        if api_settings.DATETIME_FORMAT != ISO_8601:
+            return serializers.DateTimeField().to_representation
+
+        tz = timezone.get_current_timezone() if settings.USE_TZ else None
+
+        def format_datetime(value) -> str:
+            if tz is not None and timezone.is_aware(value):
+                value = value.astimezone(tz)
+            value = value.isoformat()
+            return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+        return format_datetime
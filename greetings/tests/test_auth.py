@@ -1,13 +1,25 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest import TestCase
-from unittest.mock import call, patch
+from unittest.mock import MagicMock, call, patch
 
-from django.core.exceptions import ImproperlyConfigured
+from django.core.exceptions import ImproperlyConfigured, PermissionDenied
 from django.http import HttpRequest
+from django.test import TestCase as DjangoTestCase
+from django.test import override_settings
 from django.test.client import RequestFactory
+from oauth2_provider.models import AccessToken, Application
 
+from greetings.auth.cache import TokenCache
 from greetings.auth.constants import *
 from greetings.auth.credentials import CredentialManagerService
 from greetings.auth.services import OAuth2CredentialsService
+from greetings.auth.sessions import PooledHTTPSession
 from greetings.tests.constants import *
 from greetings.utils.constants import GreetingsPathConstants as path
 
@@ -84,34 +96,27 @@ class CredentialsTestCase(TestCase):
         self.assertEqual(actual, expected)
 
     @patch(f"{CREDENTIAL_MODULE}.os.environ")
-    @patch(f"{CREDENTIAL_MODULE}.environ.Env", autospec=True)
     def test_should_fallback_to_load_client_credentials_from_env_file(
-        self, mock_env, mock_environ
+        self, mock_environ
     ) -> None:
         # Given
         expected = {"CLIENT_ID": self.client_id, "CLIENT_SECRET": self.client_secret}
-        mock_environ.get.side_effect = [
-            # Not found on host machine
-            None,
-            None,
-            # Found in env file
-            expected["CLIENT_ID"],
-            expected["CLIENT_SECRET"],
-        ]
+        # Not found on host machine
+        mock_environ.get.return_value = None
 
         # When
-        actual = self.under_test._load_env_credentials()
+        with patch.object(
+            self.under_test, "_read_env_file", return_value=dict(expected)
+        ) as mock_read_env_file:
+            actual = self.under_test._load_env_credentials()
 
         # Then
-        mock_env.read_env.assert_called_once()
+        mock_read_env_file.assert_called_once()
         mock_environ.get.assert_has_calls(
             [
                 # Try load from host
                 call("CLIENT_ID", None),
                 call("CLIENT_SECRET", None),
-                # Try load from env file
-                call("CLIENT_ID", None),
-                call("CLIENT_SECRET", None),
             ]
         )
         self.assertEqual(actual, expected)
@@ -133,6 +138,93 @@ class CredentialsTestCase(TestCase):
         self.assertEqual(actual, expected)
 
 
+class CredentialCacheTestCase(TestCase):
+    """
+    Test case to test the encoded credential is memoized and only
+    reloaded when the env file or credential env variables change.
+    """
+
+    def setUp(self) -> None:
+        self.under_test = CredentialManagerService()
+        self.env_file = tempfile.NamedTemporaryFile("w", suffix=".env", delete=False)
+        self.env_file.close()
+        self.addCleanup(os.remove, self.env_file.name)
+        patcher = patch(f"{CREDENTIAL_MODULE}.CREDENTIALS_ENV_FILE", self.env_file.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        environ_patcher = patch.dict(f"{CREDENTIAL_MODULE}.os.environ")
+        environ_patcher.start()
+        self.addCleanup(environ_patcher.stop)
+
+    def test_should_memoize_encoded_credential_between_calls(self) -> None:
+        # Given
+        set_host_credentials(TEST_CLIENT_ID, TEST_CLIENT_SECRET)
+        self.under_test.reload()
+
+        # When
+        with patch.object(self.under_test, "_load_env_credentials") as mock_load:
+            actual = self.under_test.get_encoded_credential()
+
+        # Then
+        mock_load.assert_not_called()
+        self.assertEqual(actual, TEST_ENCODED_CREDENTIAL)
+
+    def test_should_reload_encoded_credential_when_env_variables_change(self) -> None:
+        # Given
+        set_host_credentials("stale_id", "stale_secret")
+        self.under_test.reload()
+
+        # When
+        set_host_credentials(TEST_CLIENT_ID, TEST_CLIENT_SECRET)
+        actual = self.under_test.get_encoded_credential()
+
+        # Then
+        self.assertEqual(actual, TEST_ENCODED_CREDENTIAL)
+
+    def test_should_reload_encoded_credential_when_env_file_changes(self) -> None:
+        # Given
+        for name in ("CLIENT_ID", "CLIENT_SECRET"):
+            os.environ.pop(name, None)
+        write_env_file(self.env_file.name, "stale_id", "stale_secret", mtime=1)
+        self.under_test.reload()
+
+        # When
+        write_env_file(self.env_file.name, TEST_CLIENT_ID, TEST_CLIENT_SECRET, mtime=2)
+        actual = self.under_test.get_encoded_credential()
+
+        # Then
+        self.assertEqual(actual, TEST_ENCODED_CREDENTIAL)
+
+    def test_should_not_set_env_variables_when_loading_env_file(self) -> None:
+        # Given
+        for name in ("CLIENT_ID", "CLIENT_SECRET"):
+            os.environ.pop(name, None)
+        write_env_file(self.env_file.name, TEST_CLIENT_ID, TEST_CLIENT_SECRET, mtime=1)
+
+        # When
+        actual = self.under_test.reload()
+
+        # Then
+        self.assertEqual(actual, TEST_ENCODED_CREDENTIAL)
+        self.assertNotIn("CLIENT_ID", os.environ)
+        self.assertNotIn("CLIENT_SECRET", os.environ)
+
+    def test_should_keep_host_env_variable_when_env_file_changes(self) -> None:
+        # Given
+        os.environ["CLIENT_ID"] = TEST_CLIENT_ID
+        os.environ.pop("CLIENT_SECRET", None)
+        write_env_file(self.env_file.name, "file_id", "stale_secret", mtime=1)
+        self.under_test.reload()
+
+        # When
+        write_env_file(self.env_file.name, "file_id", TEST_CLIENT_SECRET, mtime=2)
+        actual = self.under_test.get_encoded_credential()
+
+        # Then
+        self.assertEqual(os.environ["CLIENT_ID"], TEST_CLIENT_ID)
+        self.assertEqual(actual, TEST_ENCODED_CREDENTIAL)
+
+
 class AuthenticationTestCase(TestCase):
     """
     Test case to test the auth flow process for a DRF view
@@ -159,9 +251,9 @@ class AuthenticationTestCase(TestCase):
         self.encoded_credential = TEST_ENCODED_CREDENTIAL
         self.under_test = OAuth2CredentialsService()
 
-    @patch(f"{AUTH_MODULE}.requests")
+    @patch(f"{AUTH_MODULE}.OAuth2CredentialsService._get_http_session")
     def test_should_provide_minimum_required_arguments_for_access_token_request(
-        self, mock_requests
+        self, mock_session
     ) -> None:
         # Given
         expected = {
@@ -175,17 +267,17 @@ class AuthenticationTestCase(TestCase):
 
         # When
         self.under_test._request_access_token(self.encoded_credential)
-        actual = mock_requests.post.call_args_list[0][1]
+        actual = mock_session.return_value.post.call_args_list[0][1]
 
         # Then
-        mock_requests.post.assert_called_once()
+        mock_session.return_value.post.assert_called_once()
         self.assertEqual(actual["url"], expected["url"])
         self.assertDictContainsSubset(expected["headers"], actual["headers"])
         self.assertDictEqual(actual["data"], expected["data"])
 
-    @patch(f"{AUTH_MODULE}.requests")
+    @patch(f"{AUTH_MODULE}.OAuth2CredentialsService._get_http_session")
     def test_should_retrieve_access_token_response_from_valid_client_request(
-        self, mock_requests
+        self, mock_session
     ) -> None:
         # Given
         expected = {
@@ -196,12 +288,12 @@ class AuthenticationTestCase(TestCase):
         }
 
         # When
-        mock_requests.post.return_value.json.return_value = expected
+        mock_session.return_value.post.return_value.json.return_value = expected
         response = self.under_test._request_access_token(self.encoded_credential)
         actual = response.json()
 
         # Then
-        mock_requests.post.assert_called_once()
+        mock_session.return_value.post.assert_called_once()
         self.assertIsInstance(actual, dict)
         self.assertIn("access_token", actual)
         self.assertEqual(actual, expected)
@@ -238,3 +330,281 @@ class AuthorizationTestCase(TestCase):
         self.assertIsNotNone(auth)
         self.assertEqual(auth.split(" ")[0], expected["type"])
         self.assertTrue(auth.split(" ")[1])
+
+
+class TokenCacheTestCase(TestCase):
+    """
+    Test case to test access tokens are reused until shortly before
+    expiry, refreshed in the background and fetched again once expired.
+    """
+
+    def setUp(self) -> None:
+        self.now = 0.0
+        self.key = (TEST_ENCODED_CREDENTIAL, None)
+        self.fetch = MagicMock(return_value=(TEST_ACCESS_TOKEN, 100))
+        self.under_test = TokenCache(leeway=10, clock=lambda: self.now)
+
+    def test_should_fetch_access_token_once_and_reuse_it_before_expiry(self) -> None:
+        # When
+        first = self.under_test.get_or_fetch(self.key, self.fetch)
+        self.now = 50
+        second = self.under_test.get_or_fetch(self.key, self.fetch)
+
+        # Then
+        self.fetch.assert_called_once()
+        self.assertEqual(first, second)
+        self.assertEqual(self.under_test.stats.misses, 1)
+        self.assertEqual(self.under_test.stats.hits, 1)
+
+    def test_should_refresh_access_token_in_background_within_leeway(self) -> None:
+        # Given
+        self.under_test.get_or_fetch(self.key, self.fetch)
+        self.fetch.return_value = ("refreshed_access_token", 100)
+        self.now = 95
+
+        # When
+        actual = self.under_test.get_or_fetch(self.key, self.fetch)
+        wait_for_refresh(self.under_test)
+
+        # Then
+        self.assertEqual(actual, TEST_ACCESS_TOKEN)
+        self.assertEqual(self.under_test.stats.refreshes, 1)
+        self.assertEqual(
+            self.under_test.get_or_fetch(self.key, self.fetch),
+            "refreshed_access_token",
+        )
+
+    @patch(f"{BASE_MODULE}.cache.connections")
+    def test_should_close_database_connections_after_background_refresh(
+        self, mock_connections
+    ) -> None:
+        # Given
+        self.under_test.get_or_fetch(self.key, self.fetch)
+        self.now = 95
+
+        # When
+        self.under_test.get_or_fetch(self.key, self.fetch)
+        for thread in threading.enumerate():
+            if thread.name == "token-refresh":
+                thread.join(timeout=5)
+
+        # Then
+        mock_connections.close_all.assert_called_once_with()
+
+    def test_should_fetch_new_access_token_once_cached_token_expired(self) -> None:
+        # Given
+        self.under_test.get_or_fetch(self.key, self.fetch)
+        self.now = 100
+
+        # When
+        self.under_test.get_or_fetch(self.key, self.fetch)
+
+        # Then
+        self.assertEqual(self.fetch.call_count, 2)
+        self.assertEqual(self.under_test.stats.misses, 2)
+
+    def test_should_cache_access_tokens_per_credential_and_scope(self) -> None:
+        # When
+        self.under_test.get_or_fetch(self.key, self.fetch)
+        self.under_test.get_or_fetch((TEST_ENCODED_CREDENTIAL, "read"), self.fetch)
+
+        # Then
+        self.assertEqual(self.fetch.call_count, 2)
+
+    def test_should_refresh_access_token_at_configured_fraction_of_lifetime(
+        self,
+    ) -> None:
+        # Given
+        self.under_test.refresh_fraction = 0.5
+        self.under_test.get_or_fetch(self.key, self.fetch)
+        self.now = 50
+
+        # When
+        self.under_test.get_or_fetch(self.key, self.fetch)
+        wait_for_refresh(self.under_test)
+
+        # Then
+        self.assertEqual(self.fetch.call_count, 2)
+        self.assertEqual(self.under_test.stats.refreshes, 1)
+
+    def test_should_serve_expired_access_token_within_grace_window(self) -> None:
+        # Given
+        self.under_test.grace = 5
+        self.under_test.get_or_fetch(self.key, self.fetch)
+        self.fetch.return_value = ("refreshed_access_token", 100)
+        self.now = 102
+
+        # When
+        actual = self.under_test.get_or_fetch(self.key, self.fetch)
+        wait_for_refresh(self.under_test)
+
+        # Then
+        self.assertEqual(actual, TEST_ACCESS_TOKEN)
+        self.assertEqual(self.under_test.stats.refreshes, 1)
+
+    def test_should_fetch_once_for_concurrent_callers_on_cache_miss(self) -> None:
+        # Given
+        callers = 8
+        release = threading.Event()
+
+        def slow_fetch() -> tuple[str, int]:
+            release.wait(timeout=5)
+            return TEST_ACCESS_TOKEN, 100
+
+        fetch = MagicMock(side_effect=slow_fetch)
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    self.under_test.get_or_fetch(self.key, fetch)
+                )
+            )
+            for _ in range(callers)
+        ]
+
+        # When
+        for thread in threads:
+            thread.start()
+        while self.under_test.stats.misses < callers:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        # Then
+        fetch.assert_called_once()
+        self.assertEqual(results, [TEST_ACCESS_TOKEN] * callers)
+        self.assertEqual(self.under_test.stats.deduplicated, callers - 1)
+
+    def test_should_fetch_once_for_concurrent_async_callers_on_cache_miss(
+        self,
+    ) -> None:
+        # Given
+        callers = 8
+
+        async def slow_fetch() -> tuple[str, int]:
+            await asyncio.sleep(0.05)
+            return TEST_ACCESS_TOKEN, 100
+
+        fetch = MagicMock(side_effect=slow_fetch)
+
+        async def fetch_concurrently() -> list[str]:
+            calls = [
+                self.under_test.aget_or_fetch(self.key, fetch) for _ in range(callers)
+            ]
+            return await asyncio.gather(*calls)
+
+        # When
+        results = asyncio.run(fetch_concurrently())
+
+        # Then
+        fetch.assert_called_once()
+        self.assertEqual(results, [TEST_ACCESS_TOKEN] * callers)
+        self.assertEqual(self.under_test.stats.deduplicated, callers - 1)
+
+
+class LocalTokenClientTestCase(DjangoTestCase):
+    """
+    Test case to test access tokens are minted in-process through
+    the OAuthLib server when the local token client mode is selected.
+    """
+
+    def setUp(self) -> None:
+        Application.objects.create(
+            name="test_application",
+            client_id=TEST_CLIENT_ID,
+            client_secret=TEST_CLIENT_SECRET,
+            client_type=Application.CLIENT_CONFIDENTIAL,
+            authorization_grant_type=Application.GRANT_CLIENT_CREDENTIALS,
+        )
+        self.under_test = OAuth2CredentialsService()
+
+    @override_settings(GREETINGS={"TOKEN_CLIENT_MODE": TOKEN_CLIENT_LOCAL})
+    @patch(f"{AUTH_MODULE}.OAuth2CredentialsService._get_http_session")
+    def test_should_mint_access_token_without_http_request(self, mock_session) -> None:
+        # When
+        access_token, expires_in = self.under_test._fetch_access_token(
+            TEST_ENCODED_CREDENTIAL
+        )
+
+        # Then
+        mock_session.assert_not_called()
+        self.assertGreater(expires_in, 0)
+        self.assertTrue(AccessToken.objects.filter(token=access_token).exists())
+
+    def test_should_raise_exception_for_invalid_client_credential(self) -> None:
+        # Given
+        invalid_credential = "aW52YWxpZDppbnZhbGlk"
+
+        # Then
+        with self.assertRaises(PermissionDenied):
+            self.under_test._mint_access_token(invalid_credential)  # When
+
+
+class PooledHTTPSessionTestCase(TestCase):
+    """
+    Test case to test token endpoint requests reuse pooled
+    keep-alive connections instead of opening one per request.
+    """
+
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveTokenHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = "http://127.0.0.1:{0}/o/token/".format(self.server.server_port)
+        self.under_test = PooledHTTPSession(pool_maxsize=2, max_retries=0)
+
+    def tearDown(self) -> None:
+        self.under_test.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_should_reuse_open_connection_for_subsequent_requests(self) -> None:
+        # When
+        for _ in range(3):
+            response = self.under_test.post(self.url, data={"grant_type": GRANT_TYPE})
+            self.assertEqual(response.json()["access_token"], TEST_ACCESS_TOKEN)
+        actual = self.under_test.get_pool_stats()
+
+        # Then
+        self.assertEqual(actual["requests"], 3)
+        self.assertEqual(actual["opened"], 1)
+        self.assertEqual(actual["reused"], 2)
+
+
+# -------------------------------------------------------------------------------
+# Test utility functions
+# -------------------------------------------------------------------------------
+
+
+class KeepAliveTokenHandler(BaseHTTPRequestHandler):
+    """Minimal HTTP/1.1 token endpoint that keeps connections open."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({"access_token": TEST_ACCESS_TOKEN, "expires_in": 60})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def set_host_credentials(client_id: str, client_secret: str) -> None:
+    os.environ["CLIENT_ID"] = client_id
+    os.environ["CLIENT_SECRET"] = client_secret
+
+
+def write_env_file(path: str, client_id: str, client_secret: str, mtime: int) -> None:
+    with open(path, "w") as env_file:
+        env_file.write(f"CLIENT_ID={client_id}\nCLIENT_SECRET={client_secret}\n")
+    os.utime(path, (mtime, mtime))
+
+
+def wait_for_refresh(cache: TokenCache) -> None:
+    for flight in list(cache._flights.values()):
+        flight.future.result(timeout=5)
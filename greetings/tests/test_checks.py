@@ -0,0 +1,60 @@
+from django.test import SimpleTestCase, override_settings
+
+from greetings.checks import check_shared_caches
+
+LOCMEM = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+REDIS = {
+    "BACKEND": "django.core.cache.backends.redis.RedisCache",
+    "LOCATION": "redis://cache:6379/0",
+}
+
+
+class SharedCachesCheckTestCase(SimpleTestCase):
+    """
+    Test case for the deploy check of caches shared across processes.
+
+    Behavior:
+      GIVEN a setting naming a cache that every worker must share
+      WHEN that cache is process-local
+      THEN warn with `greetings.W001`.
+    """
+
+    @override_settings(CACHES={"default": LOCMEM, "greetings": REDIS})
+    def test_should_warn_for_process_local_cache(self) -> None:
+        # When
+        warnings = check_shared_caches()
+
+        # Then
+        self.assertEqual([warning.id for warning in warnings], ["greetings.W001"])
+        self.assertIn("IDEMPOTENCY_CACHE_ALIAS", warnings[0].msg)
+
+    @override_settings(
+        CACHES={"default": REDIS, "greetings": REDIS, "pins": LOCMEM},
+        REPLICA_ROUTER={"REPLICAS": ["replica_1"], "CACHE_ALIAS": "pins"},
+    )
+    def test_should_warn_for_process_local_replica_pins(self) -> None:
+        # When
+        warnings = check_shared_caches()
+
+        # Then
+        self.assertEqual(len(warnings), 1)
+        self.assertIn("REPLICA_ROUTER", warnings[0].msg)
+
+    @override_settings(
+        CACHES={"default": REDIS, "greetings": REDIS, "pins": LOCMEM},
+        REPLICA_ROUTER={"REPLICAS": [], "CACHE_ALIAS": "pins"},
+    )
+    def test_should_not_warn_for_replica_pins_without_replicas(self) -> None:
+        # When
+        warnings = check_shared_caches()
+
+        # Then
+        self.assertEqual(warnings, [])
+
+    @override_settings(CACHES={"default": REDIS, "greetings": REDIS})
+    def test_should_not_warn_for_shared_caches(self) -> None:
+        # When
+        warnings = check_shared_caches()
+
+        # Then
+        self.assertEqual(warnings, [])
@@ -0,0 +1,71 @@
+from django.test import SimpleTestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from greetings.parsers import FastJSONParser
+from greetings.utils.cloning import RequestCloner
+from greetings.utils.constants import GreetingsPathConstants as path
+
+
+class RequestClonerTestCase(SimpleTestCase):
+    """
+    Test case for requests derived from an initial request.
+
+    Behavior:
+      GIVEN an incoming request
+      WHEN cloning it with new data and a new query string
+      THEN return a request for the same host and path,
+      carrying only the new data, query string and content headers.
+    """
+
+    def setUp(self) -> None:
+        self.initial_request = APIRequestFactory().post(
+            str(path.GREETING_URI) + "hello&depth=2",
+            HTTP_HOST="greetings.example.com:8000",
+            HTTP_AUTHORIZATION="Bearer caller_token",
+            HTTP_COOKIE="sessionid=caller_session",
+        )
+        self.cloner = RequestCloner(
+            self.initial_request,
+            data={"greeting": "hello"},
+            query_string="greeting=goodbye",
+        )
+
+    def test_should_derive_request_for_same_host_and_path(self) -> None:
+        # When
+        request = self.cloner.clone()
+
+        # Then
+        self.assertEqual(request.method, "POST")
+        self.assertEqual(request.path, self.initial_request.path)
+        self.assertEqual(request.get_host(), "greetings.example.com:8000")
+        self.assertEqual(request.get_port(), self.initial_request.get_port())
+        self.assertEqual(request.GET.dict(), {"greeting": "goodbye"})
+
+    def test_should_parse_data_of_derived_request(self) -> None:
+        # When
+        request = Request(self.cloner.clone(), parsers=[FastJSONParser()])
+
+        # Then
+        self.assertEqual(request.content_type, "application/json")
+        self.assertEqual(request.data, {"greeting": "hello"})
+
+    def test_should_not_forward_credentials_of_caller(self) -> None:
+        # When
+        request = self.cloner.clone()
+
+        # Then
+        self.assertNotIn("HTTP_AUTHORIZATION", request.META)
+        self.assertEqual(request.COOKIES, {})
+
+    def test_should_not_share_state_between_clones(self) -> None:
+        # Given
+        first = self.cloner.clone()
+        first.META["HTTP_AUTHORIZATION"] = "Bearer hop_token"
+
+        # When
+        second = self.cloner.clone()
+
+        # Then
+        self.assertEqual(first.body, second.body)
+        self.assertNotIn("HTTP_AUTHORIZATION", second.META)
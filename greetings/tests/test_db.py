@@ -0,0 +1,444 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection, connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from oauth2_provider.models import AccessToken
+
+from config.db.backends.sqlite3.base import DatabaseWrapper
+from config.db.counters import QueryCounter, get_query_stats, reset_query_stats
+from config.db.middleware import replica_pinning_middleware
+from config.db.pool import ConnectionPool, PoolTimeout
+from config.db.prepared import PreparedStatements, to_numbered_placeholders
+from config.db.routers import ReplicaRouter, pin_to_primary, track_writes
+from greetings.models import Greeting
+from greetings.tests.utils import FakeClock
+from greetings.utils.services import GreetingService
+
+
+class ConnectionPoolTestCase(unittest.TestCase):
+    """
+    Test case for the pool of database connections.
+
+    Behavior:
+      GIVEN a pool of at most `max_size` connections
+      WHEN connections are acquired and released
+      THEN reuse healthy idle connections, replace broken or old ones,
+      and block callers once all connections are in use.
+    """
+
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.opened = []
+
+    def test_should_reuse_released_connection(self) -> None:
+        # Given
+        pool = self.create_pool()
+        first = pool.acquire()
+        pool.release(first)
+
+        # When
+        second = pool.acquire()
+
+        # Then
+        self.assertIs(second, first)
+        self.assertTrue(first.rolled_back)
+        stats = pool.get_stats()
+        self.assertEqual((stats["created"], stats["reused"]), (1, 1))
+        self.assertEqual(stats["utilisation"], 0.5)
+
+    def test_should_raise_exception_when_pool_is_exhausted(self) -> None:
+        # Given
+        pool = self.create_pool(max_size=1, timeout=0)
+        pool.acquire()
+
+        # Then
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()  # When
+        self.assertEqual(pool.get_stats()["timeouts"], 1)
+
+    def test_should_wait_for_released_connection(self) -> None:
+        # Given
+        pool = self.create_pool(max_size=1, timeout=5, real_clock=True)
+        first = pool.acquire()
+        threading.Timer(0.05, pool.release, args=[first]).start()
+
+        # When
+        second = pool.acquire()
+
+        # Then
+        self.assertIs(second, first)
+        stats = pool.get_stats()
+        self.assertEqual(stats["waits"], 1)
+        self.assertGreater(stats["max_wait_ms"], 0)
+
+    def test_should_replace_idle_connection_that_fails_health_check(self) -> None:
+        # Given
+        pool = self.create_pool(check_idle=30)
+        first = pool.acquire()
+        pool.release(first)
+        first.usable = False
+        self.clock.now += 31
+
+        # When
+        second = pool.acquire()
+
+        # Then
+        self.assertIsNot(second, first)
+        self.assertTrue(first.closed)
+        self.assertEqual(pool.get_stats()["reconnects"], 1)
+
+    def test_should_close_connection_past_max_lifetime(self) -> None:
+        # Given
+        pool = self.create_pool(max_lifetime=60)
+        first = pool.acquire()
+        self.clock.now += 61
+
+        # When
+        pool.release(first)
+
+        # Then
+        self.assertTrue(first.closed)
+        self.assertEqual(pool.get_stats()["size"], 0)
+
+    def test_should_close_discarded_connection(self) -> None:
+        # Given
+        pool = self.create_pool()
+        first = pool.acquire()
+
+        # When
+        pool.release(first, discard=True)
+
+        # Then
+        self.assertTrue(first.closed)
+        self.assertIsNot(pool.acquire(), first)
+
+    def create_pool(self, real_clock: bool = False, **options) -> ConnectionPool:
+        def factory() -> FakeConnection:
+            self.opened.append(FakeConnection())
+            return self.opened[-1]
+
+        if not real_clock:
+            options["clock"] = self.clock
+        options.setdefault("max_size", 2)
+        return ConnectionPool(factory, check=lambda conn: conn.usable, **options)
+
+
+class PreparedStatementsTestCase(unittest.TestCase):
+    """
+    Test case for the registry of prepared statements.
+
+    Behavior:
+      GIVEN a query on a hot table
+      WHEN it ran `threshold` times
+      THEN return a statement to PREPARE once, and EXECUTE after that.
+    """
+
+    sql = 'SELECT "id" FROM "greetings_greeting" WHERE "text" = %s LIMIT %s'
+
+    def test_should_prepare_query_past_threshold(self) -> None:
+        # Given
+        statements = PreparedStatements(threshold=2, tables=["greetings_greeting"])
+
+        # When
+        first = statements.get(self.sql, 2)
+        second, is_prepared = statements.get(self.sql, 2)
+
+        # Then
+        self.assertEqual(first, (None, False))
+        self.assertFalse(is_prepared)
+        self.assertEqual(
+            second.prepare_sql,
+            "PREPARE django_stmt_1 AS "
+            'SELECT "id" FROM "greetings_greeting" WHERE "text" = $1 LIMIT $2',
+        )
+        self.assertEqual(second.execute_sql, "EXECUTE django_stmt_1 (%s, %s)")
+
+        statements.add(self.sql, second)
+        self.assertEqual(statements.get(self.sql, 2), (second, True))
+
+    def test_should_not_prepare_other_or_rejected_queries(self) -> None:
+        # Given
+        statements = PreparedStatements(threshold=1, tables=["greetings_greeting"])
+        statements.reject(self.sql)
+
+        # Then
+        for sql, param_count in [
+            (self.sql, 2),
+            ('SELECT 1 FROM "django_session" WHERE "key" = %s', 1),
+            ('SELECT "id" FROM "greetings_greeting"', 0),
+        ]:
+            self.assertEqual(statements.get(sql, param_count), (None, False))
+
+    def test_should_deallocate_least_recently_used_statement(self) -> None:
+        # Given
+        statements = PreparedStatements(
+            threshold=1, max_size=1, tables=["greetings_greeting"]
+        )
+        first, _ = statements.get(self.sql, 2)
+        statements.add(self.sql, first)
+        other_sql = self.sql.replace("LIMIT", "OFFSET")
+
+        # When
+        second, _ = statements.get(other_sql, 2)
+        deallocate_sql = statements.add(other_sql, second)
+
+        # Then
+        self.assertEqual(deallocate_sql, f"DEALLOCATE {first.name}")
+        self.assertEqual(len(statements), 1)
+
+    def test_should_keep_literal_percent_signs(self) -> None:
+        # When
+        actual = to_numbered_placeholders("SELECT '100%%' WHERE a = %s AND b = %s")
+
+        # Then
+        self.assertEqual(actual, "SELECT '100%' WHERE a = $1 AND b = $2")
+
+
+class PooledSQLiteBackendTestCase(SimpleTestCase):
+    """
+    Test case for the SQLite backend with a connection pool.
+
+    Behavior:
+      GIVEN a database alias with a `POOL` setting
+      WHEN its connection is closed, e.g. at the end of a request
+      THEN hand the connection back to the pool and reuse it on connect.
+    """
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.wrapper = DatabaseWrapper(
+            {
+                **connection.settings_dict,
+                "NAME": str(Path(directory.name) / "pooled.sqlite3"),
+                "CONN_MAX_AGE": 0,
+                "POOL": {"MAX_SIZE": 2, "TIMEOUT": 1},
+            },
+            alias="pooled",
+        )
+        self.addCleanup(lambda: self.wrapper.pool and self.wrapper.pool.close())
+
+    def test_should_reuse_pooled_connection_after_close(self) -> None:
+        # Given
+        self.wrapper.ensure_connection()
+        first = self.wrapper.connection
+        self.wrapper.close()
+
+        # When
+        with self.wrapper.cursor() as cursor:
+            cursor.execute("SELECT 1")
+
+        # Then
+        self.assertIs(self.wrapper.connection, first)
+        stats = self.wrapper.pool.get_stats()
+        self.assertEqual((stats["created"], stats["reused"]), (1, 1))
+        self.wrapper.close()
+        self.assertEqual(self.wrapper.pool.get_stats()["in_use"], 0)
+
+    def test_should_not_reuse_connection_that_errored(self) -> None:
+        # Given
+        self.wrapper.ensure_connection()
+        first = self.wrapper.connection
+        self.wrapper.errors_occurred = True
+
+        # When
+        self.wrapper.close()
+        self.wrapper.ensure_connection()
+
+        # Then
+        self.assertIsNot(self.wrapper.connection, first)
+        self.assertEqual(self.wrapper.pool.get_stats()["created"], 2)
+        self.wrapper.close()
+
+
+class ReplicaRouterTestCase(TestCase):
+    """
+    Test case for the router between the primary database and a replica.
+
+    Behavior:
+      GIVEN a primary and a replica SQLite database
+      WHEN greetings are read and written
+      THEN read from the replica, write to the primary, and read from
+      the primary once the request wrote or was pinned.
+    """
+
+    def setUp(self) -> None:
+        self.replica = add_sqlite_database(self, "replica")
+        with self.replica.schema_editor() as editor:
+            editor.create_model(Greeting)
+        Greeting.objects.using("replica").create(greeting_text="jambo")
+
+        self.router = ReplicaRouter(
+            replicas=["replica"], primary_apps=["oauth2_provider"]
+        )
+        routers = override_settings(DATABASE_ROUTERS=[self.router])
+        routers.enable()
+        self.addCleanup(routers.disable)
+        reset_query_stats()
+
+    def test_should_read_from_replica(self) -> None:
+        # When
+        texts = get_texts()
+
+        # Then
+        self.assertEqual(texts, ["jambo"])
+        self.assertEqual(get_query_stats()["replica"]["reads"], 1)
+
+    def test_should_write_to_primary(self) -> None:
+        # When
+        GreetingService.create_and_save("hello")
+
+        # Then
+        self.assertNotIn("replica", get_query_stats())
+        self.assertEqual(get_texts("default"), ["hello"])
+        self.assertEqual(get_texts(), ["jambo"])
+
+    def test_should_read_from_primary_after_write(self) -> None:
+        # When
+        with track_writes() as state:
+            GreetingService.create_and_save("hello")
+            texts = get_texts()
+
+        # Then
+        self.assertTrue(state.written)
+        self.assertEqual(texts, ["hello"])
+
+    def test_should_read_from_primary_when_pinned(self) -> None:
+        # When
+        with pin_to_primary():
+            texts = get_texts()
+
+        # Then
+        self.assertEqual(texts, [])
+        self.assertNotIn("replica", get_query_stats())
+
+    def test_should_read_primary_apps_from_primary(self) -> None:
+        # Then
+        self.assertEqual(self.router.db_for_read(AccessToken), "default")
+        self.assertEqual(self.router.db_for_read(Greeting), "replica")
+        self.assertIs(self.router.allow_migrate("replica", "greetings"), False)
+
+
+class ReplicaPinningMiddlewareTestCase(SimpleTestCase):
+    """
+    Test case for the middleware that lets clients read their own writes.
+
+    Behavior:
+      GIVEN a request of a client that wrote
+      WHEN the same client sends another request within the sticky window
+      THEN pin the reads of that request to the primary database.
+    """
+
+    def setUp(self) -> None:
+        self.factory = RequestFactory()
+        add_sqlite_database(self, "replica")
+        self.router = ReplicaRouter(replicas=["replica"])
+        self.options = {"REPLICAS": ["replica"], "STICKY_SECONDS": 5}
+        cache.clear()
+
+    def test_should_pin_reads_of_client_after_write(self) -> None:
+        # Given
+        middleware = self.create_middleware()
+        middleware(self.create_request(write=True))
+
+        # When
+        response = middleware(self.create_request())
+        other = middleware(self.create_request(token="other"))
+
+        # Then
+        self.assertEqual(response.content, b"default")
+        self.assertEqual(other.content, b"replica")
+
+    def test_should_not_use_middleware_without_replicas(self) -> None:
+        # Then
+        with self.assertRaises(MiddlewareNotUsed):
+            self.create_middleware(REPLICAS=[])  # When
+
+    def create_middleware(self, **options):
+        def view(request) -> HttpResponse:
+            if request.GET.get("write"):
+                self.router.db_for_write(Greeting)
+            return HttpResponse(self.router.db_for_read(Greeting))
+
+        with override_settings(REPLICA_ROUTER={**self.options, **options}):
+            return replica_pinning_middleware(view)
+
+    def create_request(self, write: bool = False, token: str = "token"):
+        return self.factory.get(
+            "/", {"write": "1"} if write else {}, HTTP_AUTHORIZATION=f"Bearer {token}"
+        )
+
+
+class QueryCounterTestCase(TestCase):
+    """
+    Test case for the per-database query counters.
+
+    Behavior:
+      GIVEN a query counter wrapping a database connection
+      WHEN queries run
+      THEN count them as reads or writes of that database.
+    """
+
+    def test_should_count_reads_and_writes(self) -> None:
+        # Given
+        counter = QueryCounter()
+
+        # When
+        with connection.execute_wrapper(counter), connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM greetings_greeting")
+            cursor.execute("DELETE FROM greetings_greeting")
+
+        # Then
+        stats = counter.get_stats()["default"]
+        self.assertEqual((stats["queries"], stats["reads"], stats["writes"]), (2, 1, 1))
+        self.assertGreaterEqual(stats["average_ms"], 0)
+
+
+# -------------------------------------------------------------------------------
+# Test utility functions
+# -------------------------------------------------------------------------------
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.usable = True
+        self.closed = False
+        self.rolled_back = False
+
+    def rollback(self) -> None:
+        self.rolled_back = True
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def add_sqlite_database(test_case, alias: str):
+    """Add a database `alias` on a new SQLite file for the test."""
+
+    directory = tempfile.TemporaryDirectory()
+    connections.settings[alias] = {
+        **connection.settings_dict,
+        "NAME": str(Path(directory.name) / f"{alias}.sqlite3"),
+        "CONN_MAX_AGE": 0,
+        "POOL": None,
+    }
+
+    def remove() -> None:
+        connections[alias].close()
+        del connections[alias]
+        del connections.settings[alias]
+        directory.cleanup()
+
+    test_case.addCleanup(remove)
+    return connections[alias]
+
+
+def get_texts(using: str = None) -> list[str]:
+    queryset = Greeting.objects.using(using) if using else Greeting.objects
+    return list(queryset.values_list("greeting_text", flat=True))
@@ -0,0 +1,222 @@
+import threading
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory
+
+from greetings.models import Greeting
+from greetings.tests.utils import create_access_token, create_application, wait_until
+from greetings.utils.constants import GreetingsPathConstants as path
+from greetings.utils.idempotency import IdempotencyRecord, IdempotencyService
+
+AUTH_SERVICE = "greetings.auth.services.OAuth2CredentialsService"
+
+
+class IdempotentSaveGreetingTestCase(TestCase):
+    """
+    Test case for retries of `save_custom_greeting` with an `Idempotency-Key`.
+
+    Behavior:
+      GIVEN a saved greeting request with an `Idempotency-Key` header
+      WHEN the client repeats it with the same key
+      THEN replay the stored response without saving or recursing again.
+    """
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.test_token = create_access_token()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.test_token.token}")
+
+    @patch(f"{AUTH_SERVICE}.get_access_token")
+    def test_should_replay_response_for_repeated_key(self, mock_get_token) -> None:
+        # Given
+        mock_get_token.return_value = self.test_token.token
+        url = str(path.GREETING_URI) + "hello"
+        first = self.client.post(url, HTTP_IDEMPOTENCY_KEY="retry-1")
+
+        # When
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, HTTP_IDEMPOTENCY_KEY="retry-1")
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json(), first.json())
+        self.assertEqual(response.headers["Idempotent-Replayed"], "true")
+        self.assertEqual(mock_get_token.call_count, 1)
+        self.assertFalse(
+            any(Greeting._meta.db_table in query["sql"] for query in queries)
+        )
+        self.assertEqual(Greeting.objects.filter(greeting_text="hello").count(), 1)
+
+    @patch(f"{AUTH_SERVICE}.get_access_token")
+    def test_should_reject_key_reused_for_different_request(
+        self, mock_get_token
+    ) -> None:
+        # Given
+        mock_get_token.return_value = self.test_token.token
+        self.client.post(str(path.GREETING_URI) + "hello", HTTP_IDEMPOTENCY_KEY="k")
+
+        # When
+        response = self.client.post(
+            str(path.GREETING_URI) + "jambo", HTTP_IDEMPOTENCY_KEY="k"
+        )
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertFalse(Greeting.objects.filter(greeting_text="jambo").exists())
+
+    @patch(f"{AUTH_SERVICE}.get_access_token")
+    def test_should_run_view_again_without_key(self, mock_get_token) -> None:
+        # Given
+        mock_get_token.return_value = self.test_token.token
+        url = str(path.GREETING_URI) + "hello"
+        self.client.post(url)
+
+        # When
+        response = self.client.post(url)
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @patch(f"{AUTH_SERVICE}.get_access_token")
+    def test_should_replay_response_for_same_client_with_refreshed_token(
+        self, mock_get_token
+    ) -> None:
+        # Given
+        application = create_application()
+        old_token = create_access_token(token="old_token", application=application)
+        new_token = create_access_token(token="new_token", application=application)
+        mock_get_token.return_value = self.test_token.token
+        url = str(path.GREETING_URI) + "hello"
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {old_token.token}")
+        first = self.client.post(url, HTTP_IDEMPOTENCY_KEY="retry-1")
+
+        # When
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {new_token.token}")
+        response = self.client.post(url, HTTP_IDEMPOTENCY_KEY="retry-1")
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json(), first.json())
+        self.assertEqual(response.headers["Idempotent-Replayed"], "true")
+
+    @patch(f"{AUTH_SERVICE}.get_access_token")
+    def test_should_not_replay_response_for_another_client(
+        self, mock_get_token
+    ) -> None:
+        # Given
+        other_token = create_access_token(
+            token="other_token", application=create_application("other")
+        )
+        mock_get_token.return_value = self.test_token.token
+        url = str(path.GREETING_URI) + "hello"
+        self.client.post(url, HTTP_IDEMPOTENCY_KEY="retry-1")
+
+        # When
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {other_token.token}")
+        response = self.client.post(url, HTTP_IDEMPOTENCY_KEY="retry-1")
+
+        # Then
+        self.assertNotIn("Idempotent-Replayed", response.headers)
+
+    def test_should_reject_too_long_key(self) -> None:
+        # When
+        response = self.client.post(
+            str(path.GREETING_URI) + "hello", HTTP_IDEMPOTENCY_KEY="k" * 256
+        )
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Greeting.objects.exists())
+
+
+class IdempotencyServiceTestCase(SimpleTestCase):
+    """
+    Test case for the idempotency service running concurrent duplicates.
+
+    Behavior:
+      GIVEN requests with the same idempotency key
+      WHEN they arrive while the first one is still in flight
+      THEN run the view once and replay its response for the others.
+    """
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.service = IdempotencyService()
+        self.request = APIRequestFactory().post("/greetings/", HTTP_AUTHORIZATION="t")
+
+    def test_should_coalesce_duplicates_in_flight(self) -> None:
+        # Given
+        calls = []
+        release = threading.Event()
+
+        def view() -> Response:
+            calls.append(1)
+            release.wait(5)
+            return Response(data={"greeting": "hello"}, status=201)
+
+        responses = []
+        threads = [
+            threading.Thread(
+                target=lambda: responses.append(
+                    self.service.run(self.request, "key", view)
+                )
+            )
+            for _ in range(3)
+        ]
+
+        # When
+        for thread in threads:
+            thread.start()
+        wait_until(lambda: calls)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        # Then
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([response.status_code for response in responses], [201] * 3)
+        self.assertEqual(
+            [response.data for response in responses], [{"greeting": "hello"}] * 3
+        )
+
+    def test_should_wait_for_response_of_another_process(self) -> None:
+        # Given
+        cache_key = self.service._get_cache_key(self.request, "key")
+        cache.add(f"{cache_key}:lock", "other process")
+        record = IdempotencyRecord(
+            self.service._get_fingerprint(self.request), 201, {"greeting": "hello"}
+        )
+
+        def finish_other_process() -> None:
+            cache.set(cache_key, record)
+            cache.delete(f"{cache_key}:lock")
+
+        threading.Timer(0.1, finish_other_process).start()
+
+        # When
+        response = self.service.run(self.request, "key", lambda: self.fail("ran"))
+
+        # Then
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data, {"greeting": "hello"})
+
+    def test_should_not_store_failed_response(self) -> None:
+        # Given
+        failed = Response(data={"detail": "token endpoint down"}, status=400)
+        self.service.run(self.request, "key", lambda: failed)
+
+        # When
+        response = self.service.run(
+            self.request, "key", lambda: Response(data={}, status=201)
+        )
+
+        # Then
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn("Idempotent-Replayed", response.headers)
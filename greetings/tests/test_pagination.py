@@ -0,0 +1,120 @@
+from unittest import skipUnless
+
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from greetings.models import Greeting
+from greetings.tests.utils import create_access_token, follow_links
+from greetings.utils.constants import GreetingsPathConstants as path
+
+LIST_ENDPOINT: str = str(path.GREETINGS_ENDPOINT)
+
+
+@override_settings(GREETINGS={"LIST_PAGE_SIZE": 2})
+class CursorPaginationTestCase(TestCase):
+    """
+    Test case to test keyset pagination for the list greetings view.
+
+    Behavior:
+      GIVEN more greetings than fit on a page
+      WHEN following the next (or previous) cursor links
+      THEN return every greeting exactly once, in created order.
+    """
+
+    def setUp(self) -> None:
+        cache.clear()
+        caches["greetings"].clear()
+        test_token = create_access_token()
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer {0}".format(test_token.token)
+        )
+        self.expected = create_greetings(["alpha", "bravo", "charlie", "delta", "echo"])
+
+    def test_should_return_every_greeting_once_when_following_next_links(
+        self,
+    ) -> None:
+        # When
+        pages = follow_links(self.client, LIST_ENDPOINT, "next")
+        actual = [greeting["greeting_text"] for page in pages for greeting in page]
+
+        # Then
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual(actual, self.expected)
+
+    def test_should_return_previous_pages_when_following_previous_links(
+        self,
+    ) -> None:
+        # Given
+        last_page_url = self.client.get(LIST_ENDPOINT, {"page_size": 4}).data["next"]
+
+        # When
+        pages = follow_links(self.client, last_page_url, "previous")
+        actual = [
+            greeting["greeting_text"] for page in reversed(pages) for greeting in page
+        ]
+
+        # Then
+        self.assertEqual(actual, self.expected)
+
+    def test_should_not_count_rows_or_use_offset_when_paginating(self) -> None:
+        # Given
+        next_url = self.client.get(LIST_ENDPOINT).data["next"]
+
+        # When
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(next_url)
+        sql = " ".join(query["sql"] for query in queries.captured_queries).upper()
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("COUNT(", sql)
+        self.assertNotIn("OFFSET", sql)
+
+    @skipUnless(connection.vendor == "sqlite", "Reads the SQLite query plan")
+    def test_should_seek_index_to_cursor_position(self) -> None:
+        # Given
+        next_url = self.client.get(LIST_ENDPOINT).data["next"]
+
+        # When
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(next_url)
+        sql = queries.captured_queries[-1]["sql"]
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+
+        # Then
+        self.assertIn('"greeting_created_at" >=', sql)
+        self.assertIn("greeting_created_at_id_idx (greeting_created_at>?)", plan)
+
+    def test_should_return_404_NOT_FOUND_for_invalid_cursor(self) -> None:
+        # When
+        response = self.client.get(LIST_ENDPOINT, {"cursor": "invalid"})
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+# -------------------------------------------------------------------------------
+# Test utility functions
+# -------------------------------------------------------------------------------
+
+
+def create_greetings(texts: list[str]) -> list[str]:
+    """Create greetings where the first two share the same timestamp."""
+
+    created_at = timezone.now()
+    for index, text in enumerate(texts):
+        greeting = Greeting.objects.create(greeting_text=text)
+        offset = timezone.timedelta(seconds=max(index, 1))
+        Greeting.objects.filter(pk=greeting.pk).update(
+            greeting_created_at=created_at + offset
+        )
+    ordered = Greeting.objects.order_by("greeting_created_at", "greeting_id")
+    return list(ordered.values_list("greeting_text", flat=True))
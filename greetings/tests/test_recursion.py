@@ -0,0 +1,95 @@
+import asyncio
+from itertools import count
+from unittest import TestCase
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from greetings.utils.recursion import Hop, RecursionEngine
+
+
+class RecursionEngineTestCase(TestCase):
+    """
+    Test case for the iterative recursion engine.
+
+    Behavior:
+      GIVEN a depth, fan-out and budget
+      WHEN running hops from the work queue
+      THEN call each hop once, breadth-first, within the budget.
+    """
+
+    def test_should_call_fanout_hops_per_level_breadth_first(self) -> None:
+        # Given
+        calls = []
+        engine = RecursionEngine(depth=3, fanout=2)
+
+        # When
+        result = engine.run(lambda hop: calls.append(hop) or success())
+
+        # Then
+        self.assertEqual([hop.level for hop in calls], [1] * 2 + [2] * 4 + [3] * 8)
+        self.assertEqual([hop.index for hop in calls], list(range(14)))
+        self.assertEqual(calls[2], Hop(2, level=2, parent=0))
+        self.assertEqual(calls[13], Hop(13, level=3, parent=5))
+        self.assertEqual(len(result.hops), 14)
+        self.assertFalse(result.truncated)
+
+    def test_should_not_expand_failed_hop(self) -> None:
+        # Given
+        engine = RecursionEngine(depth=2, fanout=2)
+        failure = Response(status=status.HTTP_400_BAD_REQUEST)
+
+        # When
+        result = engine.run(lambda hop: failure if hop.index == 0 else success())
+
+        # Then
+        self.assertEqual([hop.parent for hop in result.hops], [None, None, 1, 1])
+        self.assertIs(result.response, failure)
+
+    def test_should_stop_when_hop_budget_is_spent(self) -> None:
+        # Given
+        engine = RecursionEngine(depth=5, fanout=5, max_hops=7)
+
+        # When
+        result = engine.run(lambda hop: success())
+
+        # Then
+        self.assertEqual(len(result.hops), 7)
+        self.assertTrue(result.truncated)
+
+    def test_should_stop_when_time_budget_is_spent(self) -> None:
+        # Given
+        clock = count()
+        engine = RecursionEngine(
+            depth=3, fanout=3, timeout=6, clock=lambda: next(clock)
+        )
+
+        # When
+        result = engine.run(lambda hop: success())
+
+        # Then
+        self.assertLess(len(result.hops), 3)
+        self.assertTrue(result.truncated)
+
+    def test_should_run_async_hops_from_work_queue(self) -> None:
+        # Given
+        engine = RecursionEngine(depth=2, fanout=3)
+
+        async def call(hop: Hop) -> Response:
+            return success()
+
+        # When
+        result = asyncio.run(engine.arun(call))
+
+        # Then
+        self.assertEqual(len(result.hops), 3 + 9)
+        self.assertTrue(all(hop.status_code == 201 for hop in result.hops))
+
+
+# -------------------------------------------------------------------------------
+# Test utility functions
+# -------------------------------------------------------------------------------
+
+
+def success() -> Response:
+    return Response(status=status.HTTP_201_CREATED)
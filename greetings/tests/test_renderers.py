@@ -0,0 +1,190 @@
+import io
+import json
+import uuid
+from unittest.mock import patch
+
+from django.core.cache import cache, caches
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from greetings.models import Greeting
+from greetings.parsers import FastJSONParser
+from greetings.renderers import FastJSONRenderer
+from greetings.serializers import GreetingSerializer
+from greetings.tests.utils import create_access_token
+from greetings.utils.constants import GreetingsPathConstants as path
+from greetings.utils.responses import GreetingSuccessResponse
+
+
+class FastJSONRendererTestCase(SimpleTestCase):
+    """
+    Test case for the orjson-backed JSON renderer.
+
+    Behavior:
+      GIVEN data accepted by DRF's `JSONRenderer`
+      WHEN rendering it with `FastJSONRenderer`
+      THEN return the same bytes, with or without orjson, except for
+      floats in exponent notation, which keep the same values.
+    """
+
+    def setUp(self) -> None:
+        self.data = {
+            "greeting_id": uuid.uuid4(),
+            "greeting_text": "jambo \u2028\u2029 ñ",
+            "greeting_created_at": timezone.now(),
+            "local_created_at": timezone.localtime(),
+            "description": gettext_lazy("Saved custom greeting submitted by user."),
+            "ids": (1, 2.5, None, True),
+            1: "non-str key",
+        }
+
+    def test_should_render_same_bytes_as_json_renderer(self) -> None:
+        # When
+        actual = FastJSONRenderer().render(self.data)
+
+        # Then
+        self.assertEqual(actual, JSONRenderer().render(self.data))
+
+    def test_should_render_same_bytes_as_json_renderer_for_response_body(
+        self,
+    ) -> None:
+        # Given
+        data = GreetingSuccessResponse(data={"greeting": "hello"}).data
+
+        # When
+        actual = FastJSONRenderer().render(data)
+
+        # Then
+        self.assertEqual(actual, JSONRenderer().render(data))
+
+    def test_should_raise_exception_for_non_finite_floats_like_json_renderer(
+        self,
+    ) -> None:
+        for value in (float("nan"), float("inf"), float("-inf")):
+            with self.subTest(value=value):
+                # Given
+                data = {"results": [{"score": value}], "previous": None}
+
+                # Then
+                with self.assertRaises(ValueError):
+                    JSONRenderer().render(data)
+                with self.assertRaises(ValueError):
+                    FastJSONRenderer().render(data)  # When
+
+    def test_should_fall_back_to_json_renderer_for_integers_beyond_64_bits(
+        self,
+    ) -> None:
+        # Given
+        data = {"count": 2**64, "total": -(2**63) - 1}
+
+        # When
+        actual = FastJSONRenderer().render(data)
+
+        # Then
+        self.assertEqual(actual, JSONRenderer().render(data))
+
+    def test_should_render_same_values_for_floats_in_exponent_notation(
+        self,
+    ) -> None:
+        # Given
+        data = {"scores": [1e16, 1.5e-7, 2.5]}
+
+        # When
+        actual = FastJSONRenderer().render(data)
+
+        # Then
+        self.assertEqual(json.loads(actual), json.loads(JSONRenderer().render(data)))
+        self.assertEqual(actual, b'{"scores":[1e16,1.5e-7,2.5]}')
+
+    def test_should_fall_back_to_json_renderer_without_orjson(self) -> None:
+        # When
+        with patch("greetings.renderers.orjson", None):
+            actual = FastJSONRenderer().render(self.data)
+
+        # Then
+        self.assertEqual(actual, JSONRenderer().render(self.data))
+
+    def test_should_fall_back_to_json_renderer_for_indented_output(self) -> None:
+        # Given
+        media_type = "application/json; indent=4"
+
+        # When
+        actual = FastJSONRenderer().render(self.data, media_type)
+
+        # Then
+        self.assertEqual(actual, JSONRenderer().render(self.data, media_type))
+
+
+class FastJSONParserTestCase(SimpleTestCase):
+    """
+    Test case for the orjson-backed JSON parser.
+    """
+
+    def test_should_parse_json_request_body(self) -> None:
+        # When
+        data = FastJSONParser().parse(io.BytesIO(b'{"greeting": "jambo \xc3\xb1"}'))
+
+        # Then
+        self.assertEqual(data, {"greeting": "jambo ñ"})
+
+    def test_should_raise_parse_error_for_invalid_json(self) -> None:
+        # Then
+        for body in [b"{invalid", b'{"greeting": NaN}']:
+            with self.assertRaises(ParseError):
+                FastJSONParser().parse(io.BytesIO(body))  # When
+
+    def test_should_fall_back_to_json_parser_for_other_charsets(self) -> None:
+        # Given
+        stream = io.BytesIO('{"greeting": "jambo ñ"}'.encode("latin-1"))
+
+        # When
+        data = FastJSONParser().parse(stream, parser_context={"encoding": "latin-1"})
+
+        # Then
+        self.assertEqual(data, {"greeting": "jambo ñ"})
+
+
+class ListRenderingTestCase(TestCase):
+    """
+    Test case for rendering the greetings list with the default renderer.
+    """
+
+    def setUp(self) -> None:
+        cache.clear()
+        caches["greetings"].clear()
+        test_token = create_access_token()
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer {0}".format(test_token.token)
+        )
+        for text in ["hello", "jambo", "hola"]:
+            Greeting.objects.create(greeting_text=text)
+
+    def test_should_render_list_greetings_with_fast_json_renderer(self) -> None:
+        # When
+        response = self.client.get(str(path.GREETINGS_ENDPOINT))
+
+        # Then
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+        self.assertEqual(len(response.json()["results"]), 3)
+
+    def test_should_stream_list_greetings_with_fast_json_renderer(self) -> None:
+        # When
+        response = self.client.get(str(path.GREETINGS_ENDPOINT), {"stream": "true"})
+
+        # Then
+        self.assertEqual(b"".join(response.streaming_content), render_greetings())
+
+
+# -------------------------------------------------------------------------------
+# Test utility functions
+# -------------------------------------------------------------------------------
+
+
+def render_greetings() -> bytes:
+    greetings = Greeting.objects.order_by("greeting_created_at", "greeting_id")
+    return JSONRenderer().render(GreetingSerializer(greetings, many=True).data)
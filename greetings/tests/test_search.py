@@ -0,0 +1,105 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from greetings.models import Greeting
+from greetings.tests.utils import create_access_token, follow_links
+from greetings.utils.constants import GreetingsPathConstants as path
+from greetings.utils.services import GreetingService
+
+SEARCH_ENDPOINT: str = str(path.SEARCH_GREETINGS_ENDPOINT)
+
+
+@override_settings(GREETINGS={"LIST_PAGE_SIZE": 2})
+class SearchGreetingsTestCase(TestCase):
+    """
+    Test case to test the prefix search greetings view.
+
+    Behavior:
+      GIVEN greetings with and without a given prefix, in any case
+      WHEN searching with `?prefix=`
+      THEN return every matching greeting exactly once, in alphabetical
+      order, one cursor page at a time.
+    """
+
+    def setUp(self) -> None:
+        cache.clear()
+        test_token = create_access_token()
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer {0}".format(test_token.token)
+        )
+        for text in ["hola", "Hello", "hi", "hey", "jambo", "HELLOS", "ahoy"]:
+            Greeting.objects.create(greeting_text=text)
+
+    def test_should_return_greetings_with_prefix_ignoring_case(self) -> None:
+        # When
+        pages = follow_links(self.client, f"{SEARCH_ENDPOINT}?prefix=HE", "next")
+        actual = [greeting["greeting_text"] for page in pages for greeting in page]
+
+        # Then
+        self.assertEqual([len(page) for page in pages], [2, 1])
+        self.assertEqual(actual, ["Hello", "HELLOS", "hey"])
+
+    def test_should_return_previous_pages_when_following_previous_links(
+        self,
+    ) -> None:
+        # Given
+        response = self.client.get(SEARCH_ENDPOINT, {"prefix": "h", "page_size": 3})
+
+        # When
+        pages = follow_links(self.client, response.data["next"], "previous")
+        actual = [
+            greeting["greeting_text"] for page in reversed(pages) for greeting in page
+        ]
+
+        # Then
+        self.assertEqual(actual, ["Hello", "HELLOS", "hey", "hi", "hola"])
+
+    def test_should_search_with_one_range_query(self) -> None:
+        # When
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(SEARCH_ENDPOINT, {"prefix": "hel"})
+        sql = queries.captured_queries[-1]["sql"].upper()
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('LOWER("GREETINGS_GREETING"."GREETING_TEXT") >=', sql)
+        self.assertNotIn("LIKE", sql)
+        self.assertNotIn("OFFSET", sql)
+
+    def test_should_return_400_BAD_REQUEST_for_invalid_prefix(self) -> None:
+        for prefix in [None, "", "he1", "hel\n", "h" * 51]:
+            # When
+            params = {} if prefix is None else {"prefix": prefix}
+            response = self.client.get(SEARCH_ENDPOINT, params)
+
+            # Then
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_should_search_prefixes_ending_with_last_letter(self) -> None:
+        # Given
+        for text in ["zz", "zzz", "Zzzb", "zy"]:
+            Greeting.objects.create(greeting_text=text)
+
+        # When
+        actual = search_texts("zz")
+
+        # Then
+        self.assertEqual(actual, ["zz", "zzz", "Zzzb"])
+        self.assertEqual(search_texts("hez"), [])
+
+
+# -------------------------------------------------------------------------------
+# Test utility functions
+# -------------------------------------------------------------------------------
+
+
+def search_texts(prefix: str) -> list[str]:
+    queryset = GreetingService.search(prefix).order_by(
+        "greeting_text_lower", "greeting_text"
+    )
+    return list(queryset.values_list("greeting_text", flat=True))
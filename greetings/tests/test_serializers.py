@@ -0,0 +1,78 @@
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from greetings.models import Greeting
+from greetings.serializers import GreetingRowSerializer, GreetingSerializer
+
+
+class GreetingRowSerializerTestCase(TestCase):
+    """
+    Test case for the lean read path of the greeting serializer.
+
+    Behavior:
+      GIVEN greetings in the db
+      WHEN serializing them from `values_list` rows
+      THEN render the same JSON bytes as `GreetingSerializer`.
+    """
+
+    def setUp(self) -> None:
+        for text in ["hello", "jambo", "hola"]:
+            Greeting.objects.create(greeting_text=text)
+        # Cover a timestamp without microseconds, which `isoformat` drops
+        Greeting.objects.filter(greeting_text="hola").update(
+            greeting_created_at=timezone.now().replace(microsecond=0)
+        )
+        self.queryset = Greeting.objects.order_by("greeting_created_at", "greeting_id")
+
+    def test_should_render_same_json_as_model_serializer(self) -> None:
+        # When
+        actual = render_rows(self.queryset)
+
+        # Then
+        self.assertEqual(actual, render_instances(self.queryset))
+
+    @override_settings(TIME_ZONE="UTC")
+    def test_should_render_same_json_as_model_serializer_in_utc(self) -> None:
+        # When
+        actual = render_rows(self.queryset)
+
+        # Then
+        self.assertIn(b'Z"', actual)
+        self.assertEqual(actual, render_instances(self.queryset))
+
+    @override_settings(REST_FRAMEWORK={"DATETIME_FORMAT": "%Y-%m-%d %H:%M"})
+    def test_should_render_same_json_as_model_serializer_for_custom_format(
+        self,
+    ) -> None:
+        # When
+        actual = render_rows(self.queryset)
+
+        # Then
+        self.assertEqual(actual, render_instances(self.queryset))
+
+    def test_should_not_build_model_instances(self) -> None:
+        # When
+        rows = list(GreetingRowSerializer().get_queryset(self.queryset))
+
+        # Then
+        self.assertFalse(any(isinstance(row, Greeting) for row in rows))
+        self.assertEqual(
+            {row.greeting_text for row in rows}, {"hello", "jambo", "hola"}
+        )
+
+
+# -------------------------------------------------------------------------------
+# Test utility functions
+# -------------------------------------------------------------------------------
+
+
+def render_rows(queryset) -> bytes:
+    serializer = GreetingRowSerializer()
+    return JSONRenderer().render(
+        serializer.serialize(serializer.get_queryset(queryset))
+    )
+
+
+def render_instances(queryset) -> bytes:
+    return JSONRenderer().render(GreetingSerializer(queryset, many=True).data)
@@ -1,13 +1,19 @@
 import unittest
 from unittest.mock import patch
 
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
 from django.http import HttpRequest
+from django.test import TransactionTestCase
 from django.urls import reverse
+from rest_framework.exceptions import ValidationError
 from rest_framework.request import Request
 from rest_framework.test import APIRequestFactory
 
-from greetings.utils.constants import CUSTOM_GOODBYE
-from greetings.utils.services import RecursiveViewService
+from greetings.models import Greeting
+from greetings.utils.constants import BULK_CREATED, BULK_INVALID, CUSTOM_GOODBYE
+from greetings.utils.services import GreetingService, RecursiveViewService
+from greetings.utils.validators import ALPHA_CHARS_MESSAGE, GreetingBatchValidator
 
 BASE_MODULE = "greetings.views"
 DRF_VIEW = "save_custom_greeting"
@@ -122,6 +128,96 @@ class RecursiveTestCase(unittest.TestCase):
         self.assertEqual(actual.POST["greeting"], expected["value"])
 
 
+class GreetingInsertTestCase(TransactionTestCase):
+    """
+    Test case for the constraint-driven insert path of the greeting service.
+
+    Behavior:
+      GIVEN a custom greeting
+      WHEN saving it with `insert`
+      THEN run exactly one statement and raise `save()`'s validation errors.
+    """
+
+    def test_should_insert_greeting_with_one_statement(self) -> None:
+        # When
+        with self.assertNumQueries(1):
+            greeting = GreetingService.insert("hello")
+
+        # Then
+        self.assertTrue(Greeting.objects.filter(pk=greeting.pk).exists())
+
+    def test_should_raise_save_validation_error_for_duplicate_greeting(self) -> None:
+        # Given
+        GreetingService.insert("hello")
+        with self.assertRaises(DjangoValidationError) as expected:
+            Greeting(greeting_text="hello").save()
+
+        # Then
+        with self.assertRaises(DjangoValidationError) as actual:
+            GreetingService.insert("hello")  # When
+        self.assertEqual(actual.exception.message_dict, expected.exception.message_dict)
+
+    def test_should_raise_save_validation_error_for_invalid_greeting(self) -> None:
+        # Then
+        for invalid in ["$_greeting37", "", "a" * 51]:
+            with self.assertRaises((DjangoValidationError, ValidationError)):
+                GreetingService.insert(invalid)  # When
+        self.assertFalse(Greeting.objects.exists())
+
+    def test_should_enforce_alpha_chars_in_database(self) -> None:
+        # Then
+        with self.assertRaises(IntegrityError):
+            Greeting.objects.bulk_create([Greeting(greeting_text="greeting37")])
+
+    def test_should_reject_trailing_newline_in_database(self) -> None:
+        # Then
+        with self.assertRaises(IntegrityError):
+            Greeting.objects.bulk_create([Greeting(greeting_text="hello\n")])
+
+    def test_should_raise_invalid_text_error_for_check_violation(self) -> None:
+        # Given
+        with self.assertRaises(IntegrityError) as check_violation:
+            Greeting.objects.bulk_create([Greeting(greeting_text="greeting37")])
+
+        # When
+        actual = GreetingService._get_validation_error(
+            Greeting(greeting_text="hello"), check_violation.exception
+        )
+
+        # Then
+        self.assertEqual(actual.message_dict, {"greeting_text": [ALPHA_CHARS_MESSAGE]})
+
+    def test_should_report_greetings_rejected_by_check_constraint_in_bulk(
+        self,
+    ) -> None:
+        # Given: a greeting that only the database rejects
+        data = ["hello", "greeting37", "jambo", "hola"]
+
+        # When
+        with patch.object(GreetingBatchValidator, "_check_value", return_value=None):
+            results = GreetingService.bulk_create_and_save(data, batch_size=2)
+
+        # Then
+        self.assertEqual(
+            [result.status for result in results],
+            [BULK_CREATED, BULK_INVALID, BULK_CREATED, BULK_CREATED],
+        )
+        self.assertEqual(Greeting.objects.count(), 3)
+
+    def test_should_keep_outer_transaction_usable_after_failed_insert(self) -> None:
+        # Given
+        GreetingService.insert("hello")
+
+        # When
+        with transaction.atomic():
+            with self.assertRaises(DjangoValidationError):
+                GreetingService.insert("hello")
+            GreetingService.insert("jambo")
+
+        # Then
+        self.assertEqual(Greeting.objects.count(), 2)
+
+
 # -------------------------------------------------------------------------------
 # Test utility functions
 # -------------------------------------------------------------------------------
@@ -0,0 +1,261 @@
+import importlib
+import os
+import runpy
+import sys
+from pathlib import Path
+from types import ModuleType
+from unittest import TestCase
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from rest_framework import status
+
+from config.middleware import ScopedMiddleware
+from config.settings import base
+
+LOCMEM: dict = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+WRITE_BEHIND: str = "greetings.utils.writebehind"
+GUNICORN_CONFIG: Path = Path(settings.BASE_DIR) / "config" / "gunicorn.conf.py"
+
+
+class GunicornConfigTestCase(TestCase):
+    """
+    Test case for the Gunicorn configuration of the production server.
+
+    Behavior:
+      GIVEN the CPUs available to the container and `GUNICORN_*` variables
+      WHEN Gunicorn loads its configuration
+      THEN size workers and threads from the CPUs, unless overridden.
+    """
+
+    def test_should_size_threaded_wsgi_workers_from_cpus(self) -> None:
+        # When
+        config = load_config(cpus=2)
+
+        # Then
+        self.assertEqual(config["wsgi_app"], "config.wsgi:application")
+        self.assertEqual(config["worker_class"], "gthread")
+        self.assertEqual((config["workers"], config["threads"]), (5, 4))
+        self.assertTrue(config["preload_app"])
+        self.assertEqual(
+            (config["max_requests"], config["max_requests_jitter"]), (1000, 100)
+        )
+
+    def test_should_run_one_asgi_worker_per_cpu(self) -> None:
+        # When
+        config = load_config(cpus=2, SERVER_INTERFACE="asgi")
+
+        # Then
+        self.assertEqual(config["wsgi_app"], "config.asgi:application")
+        self.assertEqual(config["worker_class"], "uvicorn_worker.UvicornWorker")
+        self.assertEqual((config["workers"], config["threads"]), (2, 1))
+
+    def test_should_honour_cgroup_cpu_quota(self) -> None:
+        # When
+        config = load_config(cpus=8, cpu_max="150000 100000")
+
+        # Then
+        self.assertEqual(config["cpu_count"], 2)
+        self.assertEqual(config["workers"], 5)
+
+    def test_should_prefer_environment_over_derived_values(self) -> None:
+        # When
+        config = load_config(
+            cpus=8,
+            GUNICORN_WORKERS="3",
+            GUNICORN_THREADS="8",
+            GUNICORN_MAX_REQUESTS="500",
+            GUNICORN_RELOAD="true",
+        )
+
+        # Then
+        self.assertEqual((config["workers"], config["threads"]), (3, 8))
+        self.assertEqual(config["max_requests_jitter"], 50)
+        self.assertFalse(config["preload_app"])
+
+    def test_should_reset_and_close_write_behind_queue_per_worker(self) -> None:
+        # Given
+        config = load_config(cpus=2)
+
+        # When
+        with (
+            patch(f"{WRITE_BEHIND}.reset_write_behind_queue") as mock_reset,
+            patch(f"{WRITE_BEHIND}.close_write_behind_queue") as mock_close,
+        ):
+            config["post_fork"](server=None, worker=None)
+            config["worker_exit"](server=None, worker=None)
+
+        # Then
+        mock_reset.assert_called_once_with()
+        mock_close.assert_called_once_with()
+
+    @override_settings(CACHES={"default": LOCMEM, "greetings": LOCMEM})
+    def test_should_refuse_workers_with_process_local_caches(self) -> None:
+        # Given
+        config = load_config(cpus=2)
+
+        # Then
+        with self.assertRaisesRegex(RuntimeError, "GUNICORN_WORKERS=1"):
+            config["on_starting"](server=None)  # When
+
+    @override_settings(CACHES={"default": LOCMEM, "greetings": LOCMEM})
+    def test_should_allow_one_worker_with_process_local_caches(self) -> None:
+        # Given
+        config = load_config(cpus=2, GUNICORN_WORKERS="1")
+
+        # When
+        config["on_starting"](server=None)
+
+
+@override_settings(
+    SCOPED_MIDDLEWARE={
+        "PREFIXES": ["/admin/"],
+        "MIDDLEWARE": [
+            "django.contrib.sessions.middleware.SessionMiddleware",
+            "django.middleware.csrf.CsrfViewMiddleware",
+        ],
+    }
+)
+class ScopedMiddlewareTestCase(SimpleTestCase):
+    """
+    Test case for the middleware that runs a middleware stack for some
+    paths only.
+
+    Behavior:
+      GIVEN a session and CSRF middleware stack scoped to `/admin/`
+      WHEN requests for admin and API paths go through the middleware
+      THEN run the stack, and its view hooks, for admin paths only.
+    """
+
+    def setUp(self) -> None:
+        self.factory = RequestFactory()
+
+    def test_should_run_stack_for_scoped_paths_only(self) -> None:
+        # Given
+        middleware = ScopedMiddleware(view)
+
+        # When
+        admin = middleware(self.factory.get("/admin/"))
+        api = middleware(self.factory.get("/greetings/api/v1/greetings/"))
+
+        # Then
+        self.assertEqual(admin.content, b"session")
+        self.assertEqual(api.content, b"no session")
+
+    def test_should_forward_view_hooks_for_scoped_paths_only(self) -> None:
+        # Given
+        middleware = ScopedMiddleware(view)
+
+        # When
+        admin = middleware.process_view(self.factory.post("/admin/"), view, (), {})
+        api = middleware.process_view(self.factory.post("/greetings/"), view, (), {})
+
+        # Then
+        self.assertEqual(admin.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertIsNone(api)
+
+    def test_should_run_async_stack_for_async_handler(self) -> None:
+        # Given
+        async def aview(request) -> HttpResponse:
+            return view(request)
+
+        middleware = ScopedMiddleware(aview)
+
+        # When
+        response = async_to_sync(middleware)(self.factory.get("/admin/"))
+
+        # Then
+        self.assertTrue(iscoroutinefunction(middleware))
+        self.assertEqual(response.content, b"session")
+
+
+class ProdSettingsTestCase(SimpleTestCase):
+    """
+    Test case for the production settings profile.
+
+    Behavior:
+      GIVEN the base settings
+      WHEN the production profile is loaded
+      THEN scope browser-only middleware, cache templates and keep
+      connections, without changing the base settings.
+    """
+
+    def test_should_scope_browser_middleware(self) -> None:
+        # When
+        prod = load_prod_settings()
+
+        # Then
+        session = "django.contrib.sessions.middleware.SessionMiddleware"
+        self.assertNotIn(session, prod.MIDDLEWARE)
+        self.assertIn(session, prod.SCOPED_MIDDLEWARE["MIDDLEWARE"])
+        self.assertIn("config.middleware.ScopedMiddleware", prod.MIDDLEWARE)
+        self.assertIn(session, base.MIDDLEWARE)
+        self.assertFalse(prod.DEBUG)
+
+    def test_should_cache_templates_and_keep_connections(self) -> None:
+        # When
+        prod = load_prod_settings()
+
+        # Then
+        loader, _ = prod.TEMPLATES[0]["OPTIONS"]["loaders"][0]
+        self.assertEqual(loader, "django.template.loaders.cached.Loader")
+        self.assertNotIn("loaders", base.TEMPLATES[0]["OPTIONS"])
+        if not prod.DATABASES["default"].get("POOL"):
+            self.assertGreater(prod.DATABASES["default"]["CONN_MAX_AGE"], 0)
+
+    def test_should_require_cache_urls(self) -> None:
+        # Then
+        with self.assertRaisesRegex(ImproperlyConfigured, "CACHE_URL"):
+            load_prod_settings(CACHE_URL=None)  # When
+
+        prod = load_prod_settings(CACHE_URL="redis://cache:6379/0")
+        self.assertEqual(
+            prod.CACHES["default"]["BACKEND"],
+            "django.core.cache.backends.redis.RedisCache",
+        )
+
+
+# -------------------------------------------------------------------------------
+# Test utility functions
+# -------------------------------------------------------------------------------
+
+
+def load_config(cpus: int, cpu_max: str = "max 100000", **environ) -> dict:
+    # Ignore the serving variables of the environment running the tests
+    environ = {
+        **{
+            name: value
+            for name, value in os.environ.items()
+            if not name.startswith(("GUNICORN_", "SERVER_INTERFACE"))
+        },
+        **environ,
+    }
+    with (
+        patch.dict("os.environ", environ, clear=True),
+        patch("os.sched_getaffinity", return_value=set(range(cpus))),
+        patch.object(Path, "read_text", return_value=cpu_max),
+    ):
+        return runpy.run_path(str(GUNICORN_CONFIG))
+
+
+def load_prod_settings(**environ) -> ModuleType:
+    # Import the profile afresh, with cache URLs; pass None to unset one
+    environ = {
+        "CACHE_URL": "locmemcache://",
+        "GREETINGS_CACHE_URL": "locmemcache://greetings",
+        **environ,
+    }
+    with patch.dict("os.environ", {k: v for k, v in environ.items() if v}):
+        for name, value in environ.items():
+            if value is None:
+                os.environ.pop(name, None)
+        sys.modules.pop("config.settings.prod", None)
+        return importlib.import_module("config.settings.prod")
+
+
+def view(request) -> HttpResponse:
+    return HttpResponse("session" if hasattr(request, "session") else "no session")
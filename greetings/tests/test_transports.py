@@ -0,0 +1,169 @@
+from unittest.mock import AsyncMock, patch
+
+from django.core import signals
+from django.core.exceptions import ImproperlyConfigured
+from django.db import close_old_connections
+from django.test import (
+    LiveServerTestCase,
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from greetings.models import Greeting
+from greetings.tests.utils import create_access_token
+from greetings.utils.constants import TRANSPORT_ASGI, TRANSPORT_HTTP
+from greetings.utils.constants import GreetingsPathConstants as path
+from greetings.utils.transports import (
+    ASGITransport,
+    DirectTransport,
+    HTTPTransport,
+    get_transport,
+)
+
+AUTH_SERVICE = "greetings.auth.services.OAuth2CredentialsService"
+
+
+class TransportSelectionTestCase(TestCase):
+    """
+    Test case to test the transport is selected by the settings.
+    """
+
+    def test_should_use_direct_transport_by_default(self) -> None:
+        # Then
+        self.assertIsInstance(get_transport(), DirectTransport)
+
+    @override_settings(GREETINGS={"RECURSION_TRANSPORT": TRANSPORT_ASGI})
+    def test_should_reuse_transport_selected_in_settings(self) -> None:
+        # When
+        transport = get_transport()
+
+        # Then
+        self.assertIsInstance(transport, ASGITransport)
+        self.assertIs(get_transport(), transport)
+
+    @override_settings(GREETINGS={"RECURSION_TRANSPORT": "pigeon"})
+    def test_should_raise_exception_for_unknown_transport(self) -> None:
+        # Then
+        with self.assertRaises(Exception):
+            get_transport()  # When
+
+
+@override_settings(GREETINGS={"RECURSION_TRANSPORT": TRANSPORT_ASGI})
+class ASGITransportTestCase(TestCase):
+    """
+    Test case to test recursive calls through the in-process ASGI application.
+    """
+
+    def setUp(self) -> None:
+        # Keep the test transaction open, like Django's test client does
+        signals.request_started.disconnect(close_old_connections)
+        signals.request_finished.disconnect(close_old_connections)
+        self.addCleanup(signals.request_started.connect, close_old_connections)
+        self.addCleanup(signals.request_finished.connect, close_old_connections)
+        self.test_token = create_access_token()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.test_token.token}")
+
+    @patch(f"{AUTH_SERVICE}.get_access_token")
+    def test_should_make_recursive_call_through_asgi_application(
+        self, mock_get_token
+    ) -> None:
+        # Given
+        mock_get_token.return_value = self.test_token.token
+
+        # When
+        response = self.client.post(str(path.GREETING_URI) + "hello&fanout=2")
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["greeting"], "hello")
+        self.assertEqual(
+            [hop["status_code"] for hop in response.json()["recursion"]["hops"]],
+            [201, 201],
+        )
+
+    @patch(f"{AUTH_SERVICE}.aget_access_token")
+    async def test_should_make_async_recursive_call_through_asgi_application(
+        self, mock_get_token
+    ) -> None:
+        # Given
+        mock_get_token.side_effect = AsyncMock(return_value=self.test_token.token)
+
+        # When
+        response = await self.async_client.post(
+            str(path.ASYNC_GREETING_URI) + "hello",
+            headers={"Authorization": f"Bearer {self.test_token.token}"},
+        )
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["greeting"], "hello")
+
+
+@override_settings(ALLOWED_HOSTS=["*"])
+class HTTPTransportTargetTestCase(SimpleTestCase):
+    """
+    Test case to test the target of the http transport never comes from
+    the request.
+    """
+
+    def setUp(self) -> None:
+        self.request = RequestFactory().post(
+            str(path.GREETING_URI) + "hello",
+            HTTP_HOST="attacker.example",
+            HTTP_AUTHORIZATION="Bearer minted_token",
+        )
+
+    def test_should_post_to_loopback_despite_hostile_host_header(self) -> None:
+        # Given
+        transport = HTTPTransport()
+
+        # When
+        with patch.object(transport._session, "post") as mock_post:
+            mock_post.return_value.status_code = status.HTTP_201_CREATED
+            mock_post.return_value.content = b"{}"
+            transport.send(self.request)
+
+        # Then
+        url = mock_post.call_args.args[0]
+        self.assertTrue(url.startswith("http://127.0.0.1:8000/"))
+        self.assertNotIn("attacker.example", url)
+
+    @override_settings(GREETINGS={"RECURSION_HTTP_BASE_URL": None})
+    def test_should_raise_exception_without_base_url(self) -> None:
+        # Then
+        with self.assertRaises(ImproperlyConfigured):
+            HTTPTransport()  # When
+
+
+@override_settings(GREETINGS={"RECURSION_TRANSPORT": TRANSPORT_HTTP})
+class HTTPTransportTestCase(LiveServerTestCase):
+    """
+    Test case to test recursive calls over pooled HTTP to a live server.
+    """
+
+    def setUp(self) -> None:
+        self.test_token = create_access_token()
+        self.transport = HTTPTransport(base_url=self.live_server_url)
+
+    @patch(f"{AUTH_SERVICE}.get_access_token")
+    def test_should_make_recursive_call_over_http(self, mock_get_token) -> None:
+        # Given
+        mock_get_token.return_value = self.test_token.token
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.test_token.token}")
+
+        # When
+        with patch("greetings.utils.services.get_transport") as mock_transport:
+            mock_transport.return_value = self.transport
+            response = client.post(str(path.GREETING_URI) + "hello&depth=2")
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.json()["recursion"]["hops"]), 2)
+        self.assertEqual(self.transport._session.get_pool_stats()["opened"], 1)
+        self.assertTrue(Greeting.objects.filter(greeting_text="hello").exists())
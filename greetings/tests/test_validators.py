@@ -1,11 +1,17 @@
 from unittest import TestCase
 
+from django.test import TestCase as DjangoTestCase
 from django.urls import reverse
 from rest_framework.exceptions import ValidationError
 from rest_framework.request import Request
 from rest_framework.test import APIRequestFactory
 
-from greetings.utils.validators import AlphaCharsValidator, GreetingParamValidator
+from greetings.models import Greeting
+from greetings.utils.validators import (
+    AlphaCharsValidator,
+    GreetingBatchValidator,
+    GreetingParamValidator,
+)
 
 
 class CustomValidatorTestCase(TestCase):
@@ -52,6 +58,85 @@ class CustomValidatorTestCase(TestCase):
         with self.assertRaises(expected):
             validator(value=greeting)
 
+    def test_should_raise_exception_for_string_with_trailing_newline(self) -> None:
+        # Given
+        validator = AlphaCharsValidator()
+
+        # Then
+        with self.assertRaises(ValidationError):
+            validator(value="greeting\n")  # When
+
+
+class GreetingBatchValidatorTestCase(DjangoTestCase):
+    """
+    Test case to test the batch validation of candidate greetings.
+
+    Behavior:
+      GIVEN a batch of candidate greetings
+      WHEN validating them with `GreetingBatchValidator`
+      THEN return structured errors per item, with one query per chunk.
+    """
+
+    def setUp(self) -> None:
+        Greeting.objects.create(greeting_text="hello")
+        self.validator = GreetingBatchValidator(chunk_size=2)
+
+    def test_should_return_error_code_per_invalid_greeting(self) -> None:
+        # Given
+        greetings = ["jambo", "hola37", "hola\n", "", "a" * 51, None, "jambo", "hello"]
+        expected = [
+            [],
+            ["invalid_greeting_text"],
+            ["invalid_greeting_text"],
+            ["blank"],
+            ["max_length"],
+            ["invalid_type"],
+            ["duplicate_in_batch"],
+            ["unique"],
+        ]
+
+        # When
+        candidates = self.validator.validate(greetings)
+
+        # Then
+        self.assertEqual(
+            [[error.code for error in c.errors] for c in candidates], expected
+        )
+        self.assertEqual(candidates[6].errors[0].message, "Duplicate of item 0.")
+        self.assertTrue(candidates[7].is_duplicate)
+        self.assertFalse(candidates[1].is_duplicate)
+
+    def test_should_check_uniqueness_with_one_query_per_chunk(self) -> None:
+        # Given
+        greetings = ["alpha", "bravo", "charlie", "delta", "echo"]
+
+        # Then
+        with self.assertNumQueries(3):
+            candidates = self.validator.validate(greetings)  # When
+        self.assertTrue(all(candidate.is_valid for candidate in candidates))
+
+    def test_should_skip_uniqueness_check_when_disabled(self) -> None:
+        # Then
+        with self.assertNumQueries(0):
+            candidates = self.validator.validate(["hello"], check_unique=False)
+        self.assertTrue(candidates[0].is_valid)
+
+    def test_should_apply_same_rule_as_alpha_chars_validator(self) -> None:
+        # Given
+        greetings = ["hello", "$_greeting37", "hello world", "Jambo", "hola\n"]
+        validator = AlphaCharsValidator()
+
+        # When
+        candidates = self.validator.validate(greetings, check_unique=False)
+
+        # Then
+        for candidate in candidates:
+            if candidate.is_valid:
+                validator(candidate.greeting)
+            else:
+                with self.assertRaises(ValidationError):
+                    validator(candidate.greeting)
+
 
 # -------------------------------------------------------------------------------
 # Test utility functions
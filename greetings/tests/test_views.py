@@ -1,15 +1,29 @@
 import inspect
-
-from django.test import TestCase
+from contextlib import contextmanager
+from typing import Iterator
+from unittest.mock import AsyncMock, patch
+
+from asgiref.sync import sync_to_async
+from django.contrib.admin.sites import AdminSite
+from django.core.cache import CacheHandler, cache, caches
+from django.test import TestCase, override_settings
 from django.utils import timezone
 from oauth2_provider.models import AccessToken
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.test import APIClient, APISimpleTestCase
 
+from greetings.admin import GreetingAdmin
+from greetings.models import Greeting
+from greetings.serializers import GreetingSerializer
+from greetings.tests.utils import create_access_token
+from greetings.utils.cache import ResponseCacheService
 from greetings.utils.constants import CUSTOM_GOODBYE
 from greetings.utils.constants import GreetingsPathConstants as path
 from greetings.utils.responses import *
+from greetings.utils.services import CollectionVersionService, GreetingService
+from greetings.utils.settings import get_setting
 
 BASE_MODULE = "greetings.views"
 
@@ -95,6 +109,521 @@ class RequestTestCase(TestCase):
         self.assertEqual(response.data["goodbye"], CUSTOM_GOODBYE)
 
 
+class AsyncRequestTestCase(TestCase):
+    """
+    Test case for the async API views served under ASGI.
+    """
+
+    def setUp(self) -> None:
+        cache.clear()
+        caches["greetings"].clear()
+        # Create custom access token for testing purposes only
+        self.test_token = create_access_token()
+        self.headers = {"Authorization": "Bearer {0}".format(self.test_token.token)}
+
+    async def test_should_list_greetings_with_same_payload_as_sync_view(self) -> None:
+        # Given
+        await Greeting.objects.acreate(greeting_text="hello")
+        await Greeting.objects.acreate(greeting_text="jambo")
+        expected = await self.async_client.get(
+            path=str(path.GREETINGS_ENDPOINT),
+            headers=self.headers,
+        )
+
+        # When
+        response = await self.async_client.get(
+            path=str(path.ASYNC_GREETINGS_ENDPOINT), headers=self.headers
+        )
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, expected.content)
+
+    async def test_should_use_response_cache_without_blocking_event_loop(
+        self,
+    ) -> None:
+        # Given
+        await Greeting.objects.acreate(greeting_text="hello")
+        url = str(path.ASYNC_GREETINGS_ENDPOINT)
+        stats = ResponseCacheService().get_stats()
+
+        # When
+        with (
+            patch.object(ResponseCacheService, "get", side_effect=AssertionError),
+            patch.object(ResponseCacheService, "set", side_effect=AssertionError),
+        ):
+            first = await self.async_client.get(path=url, headers=self.headers)
+            second = await self.async_client.get(path=url, headers=self.headers)
+
+        # Then
+        self.assertEqual(second.content, first.content)
+        actual = ResponseCacheService().get_stats()
+        self.assertEqual(actual["stores"] - stats["stores"], 1)
+        self.assertEqual(actual["hits"] - stats["hits"], 1)
+
+    async def test_should_bump_collection_version_without_blocking_event_loop(
+        self,
+    ) -> None:
+        # Given
+        version = await sync_to_async(CollectionVersionService.get)()
+
+        # When
+        with patch.object(CollectionVersionService, "bump", side_effect=AssertionError):
+            await GreetingService.acreate_and_save("hello")
+
+        # Then
+        actual = await sync_to_async(CollectionVersionService.get)()
+        self.assertNotEqual(actual.token, version.token)
+
+    async def test_should_return_403_FORBIDDEN_for_request_without_access_token(
+        self,
+    ) -> None:
+        # When
+        response = await self.async_client.get(path=str(path.ASYNC_GREETINGS_ENDPOINT))
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    async def test_should_return_405_METHOD_NOT_ALLOWED_for_wrong_http_method(
+        self,
+    ) -> None:
+        # When
+        response = await self.async_client.put(
+            path=str(path.ASYNC_GREETING_URI), headers=self.headers
+        )
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    @patch("greetings.auth.services.OAuth2CredentialsService.aget_access_token")
+    async def test_should_return_201_CREATED_after_async_recursive_call(
+        self, mock_get_token
+    ) -> None:
+        # Given
+        value = "valid"
+        mock_get_token.side_effect = AsyncMock(return_value=self.test_token.token)
+
+        # When
+        response = await self.async_client.post(
+            path=str(path.ASYNC_GREETING_URI) + value, headers=self.headers
+        )
+
+        # Then
+        self.assertContains(
+            response,
+            status_code=status.HTTP_201_CREATED,
+            text="Saved custom greeting submitted by user.",
+        )
+        self.assertEqual(response.json()["greeting"], value)
+        self.assertEqual(response.json()["goodbye"], CUSTOM_GOODBYE)
+        self.assertTrue(await Greeting.objects.filter(greeting_text=value).aexists())
+
+
+class RecursionRequestTestCase(TestCase):
+    """
+    Test case for recursive calls shaped by the `depth` and `fanout` params.
+    """
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.test_token = create_access_token()
+        self.headers = {"Authorization": "Bearer {0}".format(self.test_token.token)}
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=self.headers["Authorization"])
+
+    @patch("greetings.auth.services.OAuth2CredentialsService.get_access_token")
+    def test_should_return_timing_per_hop_of_recursive_call(
+        self, mock_get_token
+    ) -> None:
+        # Given
+        mock_get_token.return_value = self.test_token.token
+        url = str(path.GREETING_URI) + "hello&depth=2&fanout=3"
+
+        # When
+        response = self.client.post(path=url)
+        recursion = response.json()["recursion"]
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["goodbye"], CUSTOM_GOODBYE)
+        self.assertEqual(len(recursion["hops"]), 3 + 3 * 3)
+        self.assertEqual([hop["level"] for hop in recursion["hops"]], [1] * 3 + [2] * 9)
+        self.assertFalse(recursion["truncated"])
+
+    @patch("greetings.auth.services.OAuth2CredentialsService.aget_access_token")
+    async def test_should_return_timing_per_hop_of_async_recursive_call(
+        self, mock_get_token
+    ) -> None:
+        # Given
+        mock_get_token.side_effect = AsyncMock(return_value=self.test_token.token)
+        url = str(path.ASYNC_GREETING_URI) + "hello&depth=3&fanout=2"
+
+        # When
+        response = await self.async_client.post(path=url, headers=self.headers)
+        recursion = response.json()["recursion"]
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(recursion["hops"]), 2 + 4 + 8)
+        self.assertEqual(recursion["hops"][-1]["parent"], 5)
+
+    @override_settings(GREETINGS={"RECURSION_MAX_HOPS": 10})
+    def test_should_return_400_BAD_REQUEST_for_recursion_over_budget(self) -> None:
+        # Then
+        for params in ["depth=2&fanout=4", "depth=6", "fanout=0", "depth=x"]:
+            url = str(path.GREETING_URI) + "hello&" + params
+            response = self.client.post(path=url)  # When
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Greeting.objects.exists())
+
+
+class StreamingResponseTestCase(TestCase):
+    """
+    Test case for the streaming JSON mode of the list greetings views.
+    """
+
+    def setUp(self) -> None:
+        cache.clear()
+        caches["greetings"].clear()
+        test_token = create_access_token()
+        self.headers = {"Authorization": "Bearer {0}".format(test_token.token)}
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=self.headers["Authorization"])
+        for text in ["hello", "jambo", "hola", "bonjour", "ciao"]:
+            Greeting.objects.create(greeting_text=text)
+        greetings = Greeting.objects.order_by("greeting_created_at", "greeting_id")
+        self.expected = JSONRenderer().render(
+            GreetingSerializer(greetings, many=True).data
+        )
+
+    @override_settings(GREETINGS={"STREAM_CHUNK_SIZE": 2})
+    def test_should_stream_all_greetings_as_json_array(self) -> None:
+        # When
+        response = self.client.get(str(path.GREETINGS_ENDPOINT), {"stream": "true"})
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(b"".join(response.streaming_content), self.expected)
+
+    @override_settings(GREETINGS={"STREAM_CHUNK_SIZE": 2})
+    async def test_should_stream_all_greetings_from_async_view(self) -> None:
+        # When
+        response = await self.async_client.get(
+            path=str(path.ASYNC_GREETINGS_ENDPOINT),
+            data={"stream": "true"},
+            headers=self.headers,
+        )
+        content = b"".join([chunk async for chunk in response.streaming_content])
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(content, self.expected)
+
+
+class ConditionalRequestTestCase(TestCase):
+    """
+    Test case for conditional GET (ETag / Last-Modified) on the greetings list.
+    """
+
+    def setUp(self) -> None:
+        cache.clear()
+        test_token = create_access_token()
+        self.headers = {"Authorization": "Bearer {0}".format(test_token.token)}
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=self.headers["Authorization"])
+        GreetingService.create_and_save("hello")
+        self.url = str(path.GREETINGS_ENDPOINT)
+
+    def test_should_return_etag_and_last_modified_headers(self) -> None:
+        # When
+        response = self.client.get(self.url)
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.headers["ETag"])
+        self.assertTrue(response.headers["Last-Modified"])
+
+    def test_should_resolve_collection_version_once_per_request(self) -> None:
+        # When
+        with patch.object(
+            CollectionVersionService, "get", wraps=CollectionVersionService.get
+        ) as mock_get:
+            response = self.client.get(self.url)
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(mock_get.call_count, 1)
+
+    def test_should_return_304_NOT_MODIFIED_for_unchanged_collection(self) -> None:
+        # Given
+        etag = self.client.get(self.url).headers["ETag"]
+
+        # When
+        with patch(f"{BASE_MODULE}.GreetingRowSerializer") as mock_serializer:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertFalse(response.content)
+        mock_serializer.assert_not_called()
+
+    def test_should_return_200_OK_after_greeting_is_saved(self) -> None:
+        # Given
+        etag = self.client.get(self.url).headers["ETag"]
+
+        # When
+        GreetingService.create_and_save("jambo")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_should_return_200_OK_after_greeting_is_saved_within_same_second(
+        self,
+    ) -> None:
+        # Given
+        last_modified = self.client.get(self.url).headers["Last-Modified"]
+
+        # When
+        GreetingService.create_and_save("jambo")
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers["Last-Modified"], last_modified)
+
+    def test_should_return_distinct_etag_per_query_shape(self) -> None:
+        # When
+        first = self.client.get(self.url)
+        second = self.client.get(self.url, {"page_size": 1})
+
+        # Then
+        self.assertNotEqual(first.headers["ETag"], second.headers["ETag"])
+
+    async def test_should_return_304_NOT_MODIFIED_from_async_view(self) -> None:
+        # Given
+        url = str(path.ASYNC_GREETINGS_ENDPOINT)
+        first = await self.async_client.get(path=url, headers=self.headers)
+
+        # When
+        response = await self.async_client.get(
+            path=url, headers={**self.headers, "If-None-Match": first.headers["ETag"]}
+        )
+
+        # Then
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class ResponseCacheTestCase(TestCase):
+    """
+    Test case for the versioned server-side cache of list payloads.
+    """
+
+    def setUp(self) -> None:
+        cache.clear()
+        caches["greetings"].clear()
+        test_token = create_access_token()
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer {0}".format(test_token.token)
+        )
+        GreetingService.create_and_save("hello")
+        self.url = str(path.GREETINGS_ENDPOINT)
+        self.response_cache = ResponseCacheService()
+
+    def test_should_serve_repeated_list_request_from_cache(self) -> None:
+        # Given
+        expected = self.client.get(self.url).content
+        hits = self.response_cache.get_stats()["hits"]
+
+        # When
+        with patch(f"{BASE_MODULE}.GreetingRowSerializer") as mock_serializer:
+            response = self.client.get(self.url)
+
+        # Then
+        mock_serializer.assert_not_called()
+        self.assertEqual(response.content, expected)
+        self.assertEqual(self.response_cache.get_stats()["hits"], hits + 1)
+
+    def test_should_invalidate_cached_payload_when_greeting_is_saved(self) -> None:
+        # Given
+        self.client.get(self.url)
+
+        # When
+        GreetingService.create_and_save("jambo")
+        response = self.client.get(self.url)
+
+        # Then
+        self.assertContains(response, "jambo")
+
+    def test_should_invalidate_cached_payload_when_greeting_is_saved_in_admin(
+        self,
+    ) -> None:
+        # Given
+        self.client.get(self.url)
+        greeting = Greeting.objects.get(greeting_text="hello")
+        greeting.greeting_text = "hola"
+        model_admin = GreetingAdmin(Greeting, AdminSite())
+
+        # When
+        model_admin.save_model(request=None, obj=greeting, form=None, change=True)
+        response = self.client.get(self.url)
+
+        # Then
+        self.assertContains(response, "hola")
+
+    def test_should_invalidate_cached_payload_when_another_process_saves(
+        self,
+    ) -> None:
+        # Given
+        first, second = get_process_caches("first"), get_process_caches("second")
+        with process_caches(first):
+            self.client.get(self.url)
+
+        # When
+        with process_caches(second):
+            GreetingService.create_and_save("jambo")
+        with process_caches(first):
+            response = self.client.get(self.url)
+
+        # Then
+        self.assertContains(response, "jambo")
+
+    @override_settings(
+        GREETINGS={"LIST_PAGE_SIZE": 1}, ALLOWED_HOSTS=["a.example", "b.example"]
+    )
+    def test_should_not_serve_links_cached_for_another_host(self) -> None:
+        # Given
+        GreetingService.create_and_save("jambo")
+        self.client.get(self.url, HTTP_HOST="a.example")
+
+        # When
+        response = self.client.get(self.url, HTTP_HOST="b.example")
+
+        # Then
+        self.assertTrue(response.json()["next"].startswith("http://b.example/"))
+
+    def test_should_report_hit_ratio_and_payload_sizes(self) -> None:
+        # When
+        self.client.get(self.url)
+        actual = self.response_cache.get_stats()
+
+        # Then
+        self.assertGreater(actual["bytes_stored"], 0)
+        self.assertGreater(actual["average_payload_size"], 0)
+        self.assertGreaterEqual(actual["hit_ratio"], 0)
+
+
+class BulkRequestTestCase(TestCase):
+    """
+    Test case for the bulk greetings endpoint.
+    """
+
+    def setUp(self) -> None:
+        cache.clear()
+        test_token = create_access_token()
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer {0}".format(test_token.token)
+        )
+        self.url = str(path.BULK_GREETINGS_ENDPOINT)
+
+    def test_should_return_201_CREATED_with_result_per_greeting(self) -> None:
+        # Given
+        GreetingService.create_and_save("hello")
+        data = ["jambo", {"greeting": "hola"}, "hello", "jambo", "ciao37", 42]
+
+        # When
+        response = self.client.post(self.url, data, format="json")
+        body = response.json()
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [result["status"] for result in body["results"]],
+            ["created", "created", "duplicate", "duplicate", "invalid", "invalid"],
+        )
+        self.assertEqual(
+            (body["created"], body["duplicates"], body["invalid"]), (2, 2, 2)
+        )
+        self.assertEqual(
+            [error["code"] for error in body["results"][4]["errors"]],
+            ["invalid_greeting_text"],
+        )
+        self.assertEqual(Greeting.objects.count(), 3)
+
+    @override_settings(GREETINGS={"BULK_BATCH_SIZE": 100})
+    def test_should_insert_greetings_in_batches(self) -> None:
+        # Given
+        data = [f"hello{suffix}" for suffix in get_alpha_suffixes(250)]
+
+        # When: 2 token lookups, then IN + INSERT (in a savepoint) per batch
+        with self.assertNumQueries(2 + 3 * 4):
+            response = self.client.post(self.url, data, format="json")
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Greeting.objects.count(), 250)
+
+    def test_should_return_200_OK_when_no_greeting_is_created(self) -> None:
+        # Given
+        GreetingService.create_and_save("hello")
+
+        # When
+        response = self.client.post(self.url, ["hello"], format="json")
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["duplicates"], 1)
+
+    def test_should_return_400_BAD_REQUEST_for_invalid_request_body(self) -> None:
+        # Then
+        for data in [{"greeting": "hello"}, []]:
+            response = self.client.post(self.url, data, format="json")  # When
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(GREETINGS={"BULK_MAX_ITEMS": 2})
+    def test_should_return_400_BAD_REQUEST_for_too_many_greetings(self) -> None:
+        # When
+        response = self.client.post(self.url, ["a", "b", "c"], format="json")
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Greeting.objects.exists())
+
+    def test_should_accept_configured_maximum_of_longest_greetings(self) -> None:
+        # Given
+        max_items = get_setting("BULK_MAX_ITEMS")
+        max_length = Greeting._meta.get_field("greeting_text").max_length
+        prefix = "a" * (max_length - 4)
+        data = [
+            {"greeting": prefix + suffix}
+            for suffix in get_alpha_suffixes(max_items, length=4)
+        ]
+
+        # When
+        response = self.client.post(self.url, data, format="json")
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["created"], max_items)
+
+    @override_settings(GREETINGS={"BULK_MAX_BODY_SIZE": 16})
+    def test_should_return_413_REQUEST_ENTITY_TOO_LARGE_for_too_large_body(
+        self,
+    ) -> None:
+        # When
+        response = self.client.post(self.url, ["hello", "jambo"], format="json")
+
+        # Then
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        self.assertEqual(response.json()["message"], "Error")
+        self.assertFalse(Greeting.objects.exists())
+
+
 class CustomResponseTestCase(APISimpleTestCase):
     """
     Test case to test custom wrapper response instances from DRF view.
@@ -209,3 +738,37 @@ def count_required_params(cls: GreetingBaseResponse) -> int:
         for param in signature.parameters.values()
         if param.default == inspect.Parameter.empty and param.name != "self"
     )
+
+
+def get_process_caches(process: str) -> CacheHandler:
+    """
+    Return the caches of a worker process: its own `default` locmem
+    cache, and a `greetings` cache shared with every other process.
+    """
+
+    backend = "django.core.cache.backends.locmem.LocMemCache"
+    return CacheHandler(
+        {
+            "default": {"BACKEND": backend, "LOCATION": process},
+            "greetings": {"BACKEND": backend, "LOCATION": "shared"},
+        }
+    )
+
+
+@contextmanager
+def process_caches(handler: CacheHandler) -> Iterator[None]:
+    with (
+        patch("greetings.utils.services.caches", handler),
+        patch("greetings.utils.cache.caches", handler),
+    ):
+        yield
+
+
+def get_alpha_suffixes(count: int, length: int = 2) -> list[str]:
+    """Return `count` unique, alphabetic suffixes for greeting texts."""
+
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return [
+        "".join(letters[index // 26**power % 26] for power in reversed(range(length)))
+        for index in range(count)
+    ]
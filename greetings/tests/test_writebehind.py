@@ -0,0 +1,279 @@
+from unittest.mock import patch
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, OperationalError
+from django.test import TestCase, override_settings
+from rest_framework.exceptions import ValidationError
+
+from greetings.models import Greeting
+from greetings.tests.utils import FakeClock, wait_until
+from greetings.utils.services import GreetingService
+from greetings.utils.writebehind import (
+    WriteBehindQueue,
+    WriteBehindQueueFull,
+    close_write_behind_queue,
+    get_write_behind_queue,
+    reset_write_behind_queue,
+)
+
+WRITE_BEHIND = "greetings.utils.writebehind"
+
+
+class WriteBehindQueueTestCase(TestCase):
+    """
+    Test case for the write-behind queue of greeting writes.
+
+    Behavior:
+      GIVEN greetings submitted to the queue
+      WHEN a batch is full, the flush interval or max lag has passed,
+      or the queue is closed
+      THEN write the queued greetings in batches, in submit order.
+    """
+
+    def setUp(self) -> None:
+        self.batches = []
+
+    def test_should_validate_greeting_on_submit(self) -> None:
+        # Given
+        queue = self.create_queue()
+        Greeting.objects.create(greeting_text="hello")
+
+        # Then
+        for text in ["hello", "hello123", ""]:
+            with self.assertRaises((DjangoValidationError, ValidationError)):
+                queue.submit(text)  # When
+        self.assertEqual(queue.get_stats()["depth"], 0)
+
+    def test_should_reject_greeting_already_queued(self) -> None:
+        # Given
+        queue = self.create_queue()
+        queue.submit("hello")
+
+        # Then
+        with self.assertRaises(DjangoValidationError):
+            queue.submit("hello")  # When
+        self.assertEqual(queue.get_stats()["depth"], 1)
+
+    def test_should_flush_full_batch_in_background(self) -> None:
+        # Given
+        queue = self.create_queue(batch_size=2)
+
+        # When
+        queue.submit("hello")
+        queue.submit("jambo")
+
+        # Then
+        wait_until(lambda: queue.get_stats()["flushes"])
+        self.assertEqual(self.get_texts(), [["hello", "jambo"]])
+        self.assertEqual(queue.get_stats()["depth"], 0)
+
+    def test_should_flush_queue_in_batches(self) -> None:
+        # Given
+        queue = self.create_queue(batch_size=2, flush_interval=60)
+        with patch.object(queue, "_start"):
+            for text in ["hello", "jambo", "hola"]:
+                queue.submit(text)
+
+        # When
+        written = queue.flush()
+
+        # Then
+        self.assertEqual(written, 3)
+        self.assertEqual(self.get_texts(), [["hello", "jambo"], ["hola"]])
+        self.assertEqual(queue.get_stats()["max_depth"], 3)
+
+    def test_should_flush_after_interval_in_background(self) -> None:
+        # Given
+        queue = self.create_queue(flush_interval=0.01)
+
+        # When
+        queue.submit("hello")
+
+        # Then
+        wait_until(lambda: queue.get_stats()["flushes"])
+        stats = queue.get_stats()
+        self.assertEqual((stats["written"], stats["flushes"]), (1, 1))
+        self.assertGreater(stats["max_lag_ms"], 0)
+
+    def test_should_flush_on_submit_past_max_lag(self) -> None:
+        # Given
+        clock = FakeClock()
+        queue = self.create_queue(max_lag=1, clock=clock)
+        queue.submit("hello")
+        clock.now += 2
+
+        # When
+        queue.submit("jambo")
+
+        # Then
+        self.assertEqual(self.get_texts(), [["hello", "jambo"]])
+        self.assertEqual(queue.get_stats()["forced_flushes"], 1)
+
+    def test_should_flush_remaining_greetings_on_close(self) -> None:
+        # Given
+        queue = self.create_queue()
+        queue.submit("hello")
+
+        # When
+        queue.close()
+
+        # Then
+        self.assertEqual(self.get_texts(), [["hello"]])
+        with self.assertRaises(RuntimeError):
+            queue.submit("jambo")
+
+    def test_should_retry_failed_batch(self) -> None:
+        # Given
+        failures = [RuntimeError("database is down")]
+
+        def writer(greetings) -> None:
+            if failures:
+                raise failures.pop()
+            self.batches.append(greetings)
+
+        queue = self.create_queue(writer=writer)
+        queue.submit("hello")
+
+        # When
+        with self.assertLogs("greetings.utils.writebehind", level="ERROR"):
+            first = queue.flush()
+        second = queue.flush()
+
+        # Then
+        self.assertEqual((first, second), (0, 1))
+        self.assertEqual(queue.get_stats()["failed_flushes"], 1)
+        self.assertEqual(self.get_texts(), [["hello"]])
+
+    def test_should_dead_letter_greeting_rejected_by_database(self) -> None:
+        # Given
+        def writer(greetings) -> None:
+            if any(g.greeting_text == "poison" for g in greetings):
+                raise IntegrityError("CHECK constraint failed")
+            self.batches.append(greetings)
+
+        queue = self.create_queue(writer=writer, max_attempts=2)
+        for text in ["hello", "poison", "jambo"]:
+            queue.submit(text)
+
+        # When
+        with self.assertLogs("greetings.utils.writebehind", level="ERROR"):
+            first = queue.flush()
+            second = queue.flush()
+
+        # Then
+        self.assertEqual((first, second), (0, 2))
+        self.assertEqual(self.get_texts(), [["hello"], ["jambo"]])
+        self.assertEqual([g.greeting_text for g in queue.dead_letters], ["poison"])
+        stats = queue.get_stats()
+        self.assertEqual((stats["dead_lettered"], stats["depth"]), (1, 0))
+
+    def test_should_keep_greetings_queued_while_database_is_down(self) -> None:
+        # Given
+        queue = self.create_queue(
+            writer=self.fail_to_write, max_attempts=1, flush_on_shutdown=False
+        )
+        queue.submit("hello")
+
+        # When
+        with self.assertLogs("greetings.utils.writebehind", level="ERROR"):
+            written = queue.flush()
+
+        # Then
+        self.assertEqual(written, 0)
+        self.assertEqual(len(queue.dead_letters), 0)
+        self.assertEqual(queue.get_stats()["depth"], 1)
+
+    def test_should_reject_submit_while_queue_is_full(self) -> None:
+        # Given
+        queue = self.create_queue(
+            writer=self.fail_to_write, max_size=2, flush_on_shutdown=False
+        )
+        queue.submit("hello")
+        with self.assertLogs("greetings.utils.writebehind", level="ERROR"):
+            queue.submit("jambo")
+
+        # Then
+        with self.assertRaises(WriteBehindQueueFull):
+            queue.submit("hola")  # When
+        stats = queue.get_stats()
+        self.assertEqual((stats["depth"], stats["rejected"]), (2, 1))
+
+    def test_should_write_greetings_with_one_insert(self) -> None:
+        # Given
+        queue = self.create_queue(writer=None)
+        queue.submit("hello")
+        queue.submit("jambo")
+
+        # When
+        with self.assertNumQueries(1):
+            written = queue.flush()
+
+        # Then
+        self.assertEqual(written, 2)
+        self.assertEqual(Greeting.objects.count(), 2)
+
+    @override_settings(GREETINGS={"WRITE_BEHIND": True})
+    def test_should_queue_greeting_in_write_behind_mode(self) -> None:
+        # Given
+        queue = self.create_queue(writer=None)
+
+        # When
+        with patch("greetings.utils.services.get_write_behind_queue") as mock_queue:
+            mock_queue.return_value = queue
+            GreetingService.create_and_save("hello")
+
+        # Then
+        self.assertFalse(Greeting.objects.exists())
+        queue.flush()
+        self.assertTrue(Greeting.objects.filter(greeting_text="hello").exists())
+
+    def test_should_start_own_queue_after_fork(self) -> None:
+        # Given
+        inherited = self.create_queue()
+        inherited.submit("hello")
+        with patch(f"{WRITE_BEHIND}.WriteBehindQueue", return_value=inherited):
+            get_write_behind_queue()
+        self.addCleanup(reset_write_behind_queue)
+
+        # When
+        reset_write_behind_queue()
+
+        # Then
+        with patch(f"{WRITE_BEHIND}.WriteBehindQueue") as mock_queue:
+            self.assertIs(get_write_behind_queue(), mock_queue.return_value)
+        self.assertEqual(inherited.get_stats()["written"], 0)
+
+    def test_should_write_remaining_greetings_when_worker_exits(self) -> None:
+        # Given
+        queue = self.create_queue()
+        queue.submit("hello")
+        with patch(f"{WRITE_BEHIND}.WriteBehindQueue", return_value=queue):
+            get_write_behind_queue()
+        self.addCleanup(reset_write_behind_queue)
+
+        # When
+        close_write_behind_queue()
+
+        # Then
+        self.assertEqual(self.get_texts(), [["hello"]])
+
+    def create_queue(self, writer=False, **kwargs) -> WriteBehindQueue:
+        # Flush only on demand, unless a test lowers the thresholds
+        options = {
+            "batch_size": 100,
+            "flush_interval": 60,
+            "max_lag": 60,
+            "flush_on_shutdown": True,
+        }
+        queue = WriteBehindQueue(
+            writer=self.batches.append if writer is False else writer,
+            **{**options, **kwargs},
+        )
+        self.addCleanup(queue.close)
+        return queue
+
+    def fail_to_write(self, greetings) -> None:
+        raise OperationalError("database is down")
+
+    def get_texts(self) -> list[list[str]]:
+        return [[g.greeting_text for g in batch] for batch in self.batches]
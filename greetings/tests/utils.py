@@ -0,0 +1,68 @@
+"""
+Provides shared utility functions for the `greeting.tests` module.
+"""
+
+import time
+
+from django.utils import timezone
+from oauth2_provider.models import AccessToken, Application
+from rest_framework.test import APIClient
+
+from greetings.tests.constants import TEST_ACCESS_TOKEN
+
+
+def create_access_token(
+    scope: str = "read write",
+    token: str = TEST_ACCESS_TOKEN,
+    application: Application = None,
+) -> AccessToken:
+    """Create an access token without a user, valid for 60 seconds."""
+
+    return AccessToken.objects.create(
+        token=token,
+        user=None,
+        application=application,
+        expires=timezone.now() + timezone.timedelta(seconds=60),
+        scope=scope,
+    )
+
+
+def create_application(name: str = "test") -> Application:
+    """Create a confidential client credentials application."""
+
+    return Application.objects.create(
+        name=name,
+        client_type=Application.CLIENT_CONFIDENTIAL,
+        authorization_grant_type=Application.GRANT_CLIENT_CREDENTIALS,
+    )
+
+
+def follow_links(client: APIClient, url: str, link: str) -> list[list[dict]]:
+    """Return the results of every page, following `link` from `url`."""
+
+    pages = []
+    while url:
+        response = client.get(url)
+        pages.append(response.data["results"])
+        url = response.data[link]
+    return pages
+
+
+def wait_until(predicate, timeout: float = 5) -> None:
+    """Wait until `predicate()` is true, or fail after `timeout` seconds."""
+
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("Timed out waiting for condition.")
+        time.sleep(0.01)
+
+
+class FakeClock:
+    """Clock that only moves when a test sets `now`, in seconds."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
@@ -8,9 +8,29 @@ api_version: str = API_VERSION.GREETINGS
 
 urlpatterns = [
     path(f"{api_version}greetings/", views.list_greetings, name="list_greetings"),
+    path(
+        f"{api_version}greetings/bulk/",
+        views.bulk_save_greetings,
+        name="bulk_save_greetings",
+    ),
+    path(
+        f"{api_version}greetings/search/",
+        views.search_greetings,
+        name="search_greetings",
+    ),
     path(
         f"{api_version}greeting/",
         views.save_custom_greeting,
         name="save_custom_greeting",
     ),
+    path(
+        f"{api_version}async/greetings/",
+        views.alist_greetings,
+        name="alist_greetings",
+    ),
+    path(
+        f"{api_version}async/greeting/",
+        views.asave_custom_greeting,
+        name="asave_custom_greeting",
+    ),
 ]
@@ -0,0 +1,129 @@
+"""
+Module for the server-side response cache of the greetings list.
+"""
+
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+
+from django.core.cache import caches
+from django.http import HttpRequest
+
+from greetings.utils.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ResponseCacheStats:
+    """
+    Counters to report the hit ratio and payload sizes of the response cache.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    bytes_served: int = 0
+    bytes_stored: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def average_payload_size(self) -> float:
+        return self.bytes_stored / self.stores if self.stores else 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "bytes_served": self.bytes_served,
+            "bytes_stored": self.bytes_stored,
+            "hit_ratio": self.hit_ratio,
+            "average_payload_size": self.average_payload_size,
+        }
+
+
+class ResponseCacheService:
+    """
+    Singleton service to cache rendered list payloads per collection version.
+
+    Behavior::
+      - Stores rendered payloads in the `RESPONSE_CACHE_ALIAS` cache,
+        so the backend (locmem, file, redis, ...) is pluggable via CACHES.
+      - Keys payloads by collection version, media type and absolute URL
+        (scheme, host and query shape), so a version bump invalidates every
+        entry at once and clients never get links to another host.
+        Both must be shared by the workers, see `greetings.checks`.
+      - `aget` and `aset` are the async counterparts, so async views do
+        not block the event loop on a network cache.
+      - Counts hits, misses and payload sizes in process.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ResponseCacheService, cls).__new__(cls)
+            cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        self._lock = threading.Lock()
+        self.stats = ResponseCacheStats()
+
+    def get(self, request: HttpRequest, version: str, media_type: str) -> bytes:
+        payload = self._get_cache().get(self._get_key(request, version, media_type))
+        self._count_lookup(payload)
+        return payload
+
+    async def aget(self, request: HttpRequest, version: str, media_type: str) -> bytes:
+        key = self._get_key(request, version, media_type)
+        payload = await self._get_cache().aget(key)
+        self._count_lookup(payload)
+        return payload
+
+    def set(
+        self, request: HttpRequest, version: str, media_type: str, payload: bytes
+    ) -> None:
+        key = self._get_key(request, version, media_type)
+        self._get_cache().set(key, payload, get_setting("RESPONSE_CACHE_TIMEOUT"))
+        self._count_store(request, payload)
+
+    async def aset(
+        self, request: HttpRequest, version: str, media_type: str, payload: bytes
+    ) -> None:
+        key = self._get_key(request, version, media_type)
+        timeout = get_setting("RESPONSE_CACHE_TIMEOUT")
+        await self._get_cache().aset(key, payload, timeout)
+        self._count_store(request, payload)
+
+    def get_stats(self) -> dict[str, float]:
+        with self._lock:
+            return self.stats.as_dict()
+
+    def _count_lookup(self, payload: bytes | None) -> None:
+        with self._lock:
+            if payload is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+                self.stats.bytes_served += len(payload)
+
+    def _count_store(self, request: HttpRequest, payload: bytes) -> None:
+        with self._lock:
+            self.stats.stores += 1
+            self.stats.bytes_stored += len(payload)
+        logger.debug(f"Cached {len(payload)} bytes for {request.get_full_path()}.")
+
+    def _get_cache(self):
+        return caches[get_setting("RESPONSE_CACHE_ALIAS")]
+
+    def _get_key(self, request: HttpRequest, version: str, media_type: str) -> str:
+        # Pages link to the next one with absolute URLs of the request host
+        shape = hashlib.md5(f"{media_type}:{request.build_absolute_uri()}".encode())
+        return f"greetings:list:{version}:{shape.hexdigest()}"
@@ -0,0 +1,70 @@
+"""
+Module for deriving lightweight requests from an incoming request.
+"""
+
+import io
+from typing import Any
+
+from django.core.handlers.wsgi import WSGIRequest
+from django.http import HttpRequest
+
+from greetings.renderers import get_json_renderer
+
+# Keys of the initial request that still hold for a derived request
+FORWARDED_META_KEYS: tuple[str, ...] = ("SERVER_NAME", "REMOTE_ADDR", "SCRIPT_NAME")
+
+
+class RequestCloner:
+    """
+    Derives new requests from an initial request, without the overhead
+    of a test `RequestFactory`.
+
+    Behavior::
+      Encodes the JSON body and builds the WSGI environ once, from the
+      host, scheme and server keys of the initial request, with the new
+      method, path, query string and content headers.
+      Drops every other header, so credentials and cookies of the
+      caller are never forwarded. The host is kept for URL building
+      only, transports never send a request to it.
+      `clone` returns a new `WSGIRequest` from a shallow copy of that
+      environ and a fresh body stream, so clones share no state.
+    """
+
+    def __init__(
+        self,
+        request: HttpRequest,
+        data: Any = None,
+        query_string: str = "",
+        method: str = "POST",
+        path: str = None,
+    ) -> None:
+        renderer = get_json_renderer()
+        self._body = renderer.render(data) if data is not None else b""
+        meta = request.META
+        self._environ = {key: meta[key] for key in FORWARDED_META_KEYS if key in meta}
+        self._environ.update(
+            {
+                "REQUEST_METHOD": method,
+                "PATH_INFO": _to_wsgi_str(path or request.path_info),
+                "QUERY_STRING": query_string,
+                "CONTENT_TYPE": renderer.media_type if self._body else "",
+                "CONTENT_LENGTH": str(len(self._body)),
+                "HTTP_HOST": request.get_host(),
+                "SERVER_PORT": str(request.get_port()),
+                "wsgi.url_scheme": request.scheme,
+            }
+        )
+
+    @property
+    def body(self) -> bytes:
+        return self._body
+
+    def clone(self) -> WSGIRequest:
+        environ = self._environ.copy()
+        environ["wsgi.input"] = io.BytesIO(self._body)
+        return WSGIRequest(environ)
+
+
+def _to_wsgi_str(path: str) -> str:
+    # WSGI environ strings carry the UTF-8 bytes as latin-1 characters
+    return path.encode("utf-8").decode("latin-1")
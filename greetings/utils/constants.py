@@ -14,8 +14,17 @@ class GreetingsPathConstants(Enum):
     """
 
     GREETING_ENDPOINT: str = f"/greetings/{api_version}greeting/"
+    GREETINGS_ENDPOINT: str = f"/greetings/{api_version}greetings/"
+    BULK_GREETINGS_ENDPOINT: str = f"/greetings/{api_version}greetings/bulk/"
+    SEARCH_GREETINGS_ENDPOINT: str = f"/greetings/{api_version}greetings/search/"
     GREETING_PARAM_KEY: str = "?greeting="
+    STREAM_PARAM_KEY: str = "stream"
+    PREFIX_PARAM_KEY: str = "prefix"
+    DEPTH_PARAM_KEY: str = "depth"
+    FANOUT_PARAM_KEY: str = "fanout"
     GREETING_URI: str = f"/greetings/{api_version}greeting/?greeting="
+    ASYNC_GREETINGS_ENDPOINT: str = f"/greetings/{api_version}async/greetings/"
+    ASYNC_GREETING_URI: str = f"/greetings/{api_version}async/greeting/?greeting="
 
     def __str__(self) -> str:
         return self.value
@@ -23,3 +32,17 @@ class GreetingsPathConstants(Enum):
 
 # String literals for the 'greetings' app
 CUSTOM_GOODBYE: str = "kwaheri"
+
+# Per-item statuses of a bulk greetings request
+BULK_CREATED: str = "created"
+BULK_DUPLICATE: str = "duplicate"
+BULK_INVALID: str = "invalid"
+
+# Transports for recursive view calls, see greetings/utils/transports.py
+TRANSPORT_DIRECT: str = "direct"
+TRANSPORT_HTTP: str = "http"
+TRANSPORT_ASGI: str = "asgi"
+
+# Headers of idempotent write requests, see greetings/utils/idempotency.py
+IDEMPOTENCY_KEY_HEADER: str = "Idempotency-Key"
+IDEMPOTENCY_REPLAY_HEADER: str = "Idempotent-Replayed"
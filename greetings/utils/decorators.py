@@ -0,0 +1,133 @@
+"""
+Module that defines view decorators for the greetings app.
+"""
+
+import io
+from functools import wraps
+
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from greetings.renderers import get_json_renderer
+from greetings.utils.idempotency import IdempotencyService, get_idempotency_key
+from greetings.utils.responses import GreetingErrorResponse
+from greetings.utils.settings import get_setting
+
+
+def async_api_view(http_method_names: list[str]):
+    """
+    Minimal async counterpart of DRF's `api_view` decorator.
+
+    Behavior::
+      Returns a 405 response for HTTP methods not in `http_method_names`.
+      Converts DRF `APIException`s raised by the view into responses.
+      Renders DRF `Response` instances returned by the view as JSON.
+      Marks the view as CSRF exempt, like all DRF API views.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        async def _view(request, *args, **kwargs):
+            if request.method not in http_method_names:
+                response = Response(
+                    data={"detail": f'Method "{request.method}" not allowed.'},
+                    status=status.HTTP_405_METHOD_NOT_ALLOWED,
+                )
+            else:
+                try:
+                    response = await view_func(request, *args, **kwargs)
+                except APIException as exc:
+                    response = Response(
+                        data={"detail": exc.detail}, status=exc.status_code
+                    )
+
+            if isinstance(response, Response) and not response.is_rendered:
+                render_response(response)
+            return response
+
+        # Set directly, since `csrf_exempt` wraps views in a sync function
+        _view.csrf_exempt = True
+        return _view
+
+    return decorator
+
+
+def idempotent(view_func):
+    """
+    Run a DRF view at most once per `Idempotency-Key` header.
+
+    Behavior::
+      Runs the view as usual for requests without the header.
+      Returns a 400 response for keys that are too long.
+      Otherwise defers to `IdempotencyService`, which replays stored
+      responses and coalesces duplicates that are still in flight.
+      Place it below the auth decorator, so only authorized requests
+      are replayed.
+    """
+
+    @wraps(view_func)
+    def _view(request, *args, **kwargs):
+        try:
+            key = get_idempotency_key(request)
+        except ValueError as exc:
+            return GreetingErrorResponse(data={"detail": str(exc)})
+
+        if key is None:
+            return view_func(request, *args, **kwargs)
+        return IdempotencyService().run(
+            request, key, lambda: view_func(request, *args, **kwargs)
+        )
+
+    return _view
+
+
+def max_body_size(setting_name: str):
+    """
+    Limit the request body of a view to the `setting_name` setting,
+    instead of Django's `DATA_UPLOAD_MAX_MEMORY_SIZE`.
+
+    Behavior::
+      Returns a JSON 413 response for a `Content-Length` over the limit,
+      before reading the body, instead of Django's HTML 400 response
+      for `RequestDataTooBig`.
+      Otherwise reads the body up front, so later reads (OAuth checks,
+      parsers) are not held to the global limit.
+      Place it above `api_view`, so it runs before anything reads the body.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def _view(request, *args, **kwargs):
+            limit = get_setting(setting_name)
+            try:
+                length = int(request.META.get("CONTENT_LENGTH") or 0)
+            except ValueError:
+                length = 0
+
+            if length > limit:
+                return render_response(
+                    GreetingErrorResponse(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        description="Request body is too large.",
+                        data={"detail": f"Request body exceeds {limit} bytes."},
+                    )
+                )
+            if not request._read_started:
+                # Like `HttpRequest.body`, without its global size check
+                request._body = request.read()
+                request._stream = io.BytesIO(request._body)
+            return view_func(request, *args, **kwargs)
+
+        return _view
+
+    return decorator
+
+
+def render_response(response: Response) -> Response:
+    """Render a DRF `Response` as JSON outside of the DRF view machinery."""
+
+    response.accepted_renderer = get_json_renderer()
+    response.accepted_media_type = response.accepted_renderer.media_type
+    response.renderer_context = {}
+    return response.render()
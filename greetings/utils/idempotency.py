@@ -0,0 +1,217 @@
+"""
+Module for the `Idempotency-Key` support of write views.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+from django.core.cache import caches
+from django.http import HttpRequest
+from oauth2_provider.oauth2_validators import OAuth2Validator
+from rest_framework import status
+from rest_framework.response import Response
+
+from greetings.utils.constants import IDEMPOTENCY_KEY_HEADER, IDEMPOTENCY_REPLAY_HEADER
+from greetings.utils.responses import GreetingErrorResponse
+from greetings.utils.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+# Seconds between polls for a response of another process
+POLL_INTERVAL: float = 0.05
+
+
+@dataclass(frozen=True)
+class IdempotencyRecord:
+    """
+    Final response of a request, stored under its idempotency key.
+    """
+
+    fingerprint: str
+    status_code: int
+    data: Any
+
+
+@dataclass
+class IdempotencyStats:
+    """
+    Counters to report how often requests were replayed or coalesced.
+    """
+
+    stores: int = 0
+    replays: int = 0
+    coalesced: int = 0
+    conflicts: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class IdempotencyService:
+    """
+    Singleton service to run a view at most once per idempotency key.
+
+    Behavior::
+      - Scopes keys by the owner of the access token: its user, or its
+        application for client credentials tokens. Clients never see
+        each other's responses, and a retry with a refreshed token
+        still finds the stored response.
+      - Stores successful (2xx) responses in the `IDEMPOTENCY_CACHE_ALIAS`
+        cache for `IDEMPOTENCY_TTL` seconds and replays them for repeats,
+        without running the view. Failed responses are not stored, so
+        the client can retry them.
+      - Coalesces duplicates that arrive while the first request is
+        still in flight: waits on it in this process, or polls for its
+        response behind a cache lock across processes, for up to
+        `IDEMPOTENCY_LOCK_TIMEOUT` seconds (409 Conflict after that).
+      - Answers 422 when a key is reused for a different request.
+
+    `IDEMPOTENCY_CACHE_ALIAS` must name a shared cache, see `greetings.checks`.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(IdempotencyService, cls).__new__(cls)
+            cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, threading.Event] = {}
+        self.stats = IdempotencyStats()
+
+    def run(
+        self, request: HttpRequest, key: str, view: Callable[[], Response]
+    ) -> Response:
+        cache_key = self._get_cache_key(request, key)
+        fingerprint = self._get_fingerprint(request)
+        if record := self._get_cache().get(cache_key):
+            return self._replay(record, fingerprint)
+
+        with self._lock:
+            event = self._in_flight.get(cache_key)
+            is_leader = event is None
+            if is_leader:
+                event = self._in_flight[cache_key] = threading.Event()
+        if not is_leader:
+            self._count("coalesced")
+            event.wait(get_setting("IDEMPOTENCY_LOCK_TIMEOUT"))
+            return self._replay(self._get_cache().get(cache_key), fingerprint)
+
+        try:
+            return self._run_once(cache_key, fingerprint, view)
+        finally:
+            with self._lock:
+                del self._in_flight[cache_key]
+            event.set()
+
+    def get_stats(self) -> dict[str, int]:
+        with self._lock:
+            return self.stats.as_dict()
+
+    def _run_once(
+        self, cache_key: str, fingerprint: str, view: Callable[[], Response]
+    ) -> Response:
+        cache = self._get_cache()
+        lock_key = f"{cache_key}:lock"
+        lock_timeout = get_setting("IDEMPOTENCY_LOCK_TIMEOUT")
+        if not cache.add(lock_key, fingerprint, lock_timeout):
+            self._count("coalesced")
+            return self._replay(self._wait_for_record(cache_key, lock_key), fingerprint)
+
+        try:
+            # Another process may have stored it before we took the lock
+            if record := cache.get(cache_key):
+                return self._replay(record, fingerprint)
+            response = view()
+            if status.is_success(response.status_code):
+                record = IdempotencyRecord(
+                    fingerprint, response.status_code, response.data
+                )
+                cache.set(cache_key, record, get_setting("IDEMPOTENCY_TTL"))
+                self._count("stores")
+            return response
+        finally:
+            cache.delete(lock_key)
+
+    def _wait_for_record(self, cache_key: str, lock_key: str) -> IdempotencyRecord:
+        cache = self._get_cache()
+        deadline = time.monotonic() + get_setting("IDEMPOTENCY_LOCK_TIMEOUT")
+        while time.monotonic() < deadline:
+            # The record is stored before the lock is released
+            record = cache.get(cache_key)
+            if record is not None or cache.get(lock_key) is None:
+                return record
+            time.sleep(POLL_INTERVAL)
+        return cache.get(cache_key)
+
+    def _replay(self, record: IdempotencyRecord | None, fingerprint: str) -> Response:
+        if record is None:
+            self._count("conflicts")
+            return GreetingErrorResponse(
+                status_code=status.HTTP_409_CONFLICT,
+                description="A request with this idempotency key did not "
+                "complete, retry it.",
+            )
+        if record.fingerprint != fingerprint:
+            self._count("conflicts")
+            return GreetingErrorResponse(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                description="The idempotency key was used for a different request.",
+            )
+
+        self._count("replays")
+        logger.debug(f"Replaying response {record.fingerprint[:12]}.")
+        return Response(
+            data=record.data,
+            status=record.status_code,
+            headers={IDEMPOTENCY_REPLAY_HEADER: "true"},
+        )
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
+
+    def _get_cache(self):
+        return caches[get_setting("IDEMPOTENCY_CACHE_ALIAS")]
+
+    def _get_cache_key(self, request: HttpRequest, key: str) -> str:
+        owner = self._get_owner(request)
+        digest = hashlib.sha256(f"{owner}\n{key}".encode())
+        return f"greetings:idempotency:{digest.hexdigest()}"
+
+    def _get_owner(self, request: HttpRequest) -> str:
+        user = getattr(request, "resource_owner", None)
+        if user is not None and user.is_authenticated:
+            return f"user:{user.pk}"
+        _, _, token = request.META.get("HTTP_AUTHORIZATION", "").partition(" ")
+        access_token = OAuth2Validator()._load_access_token(token) if token else None
+        if access_token is not None and access_token.application_id is not None:
+            return f"application:{access_token.application_id}"
+        # Tokens without a user or an application are their own owner
+        return f"token:{token}"
+
+    def _get_fingerprint(self, request: HttpRequest) -> str:
+        digest = hashlib.sha256(
+            f"{request.method} {request.get_full_path()}\n".encode()
+        )
+        digest.update(request.body)
+        return digest.hexdigest()
+
+
+def get_idempotency_key(request: HttpRequest) -> str | None:
+    """
+    Return the `Idempotency-Key` header of `request`, if any.
+    Raise ValueError for keys longer than `IDEMPOTENCY_KEY_MAX_LENGTH`.
+    """
+
+    key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+    if key and len(key) > get_setting("IDEMPOTENCY_KEY_MAX_LENGTH"):
+        raise ValueError(f"{IDEMPOTENCY_KEY_HEADER} is too long.")
+    return key or None
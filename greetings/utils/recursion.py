@@ -0,0 +1,161 @@
+"""
+Module for the iterative engine behind recursive greeting calls.
+"""
+
+import logging
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable
+
+from rest_framework import status
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Hop:
+    """
+    A single recursive call, `level` hops away from the initial request.
+    """
+
+    index: int
+    level: int
+    parent: int | None = None
+
+
+@dataclass(frozen=True)
+class HopTiming:
+    """
+    Outcome and wall time of a single recursive call.
+    """
+
+    hop: int
+    level: int
+    parent: int | None
+    status_code: int | None
+    elapsed_ms: float
+
+
+@dataclass
+class RecursionResult:
+    """
+    Timings of all hops of a recursion, and the response to return.
+    `response` is the first failed response, or else the last one.
+    """
+
+    depth: int
+    fanout: int
+    hops: list[HopTiming] = field(default_factory=list)
+    truncated: bool = False
+    elapsed_ms: float = 0.0
+    response: Any = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "depth": self.depth,
+            "fanout": self.fanout,
+            "truncated": self.truncated,
+            "elapsed_ms": self.elapsed_ms,
+            "hops": [asdict(hop) for hop in self.hops],
+        }
+
+
+class RecursionEngine:
+    """
+    Runs recursive calls breadth-first from a work queue.
+
+    Behavior::
+      Expands every successful hop into `fanout` hops on the next level,
+      up to `depth` levels, without nesting calls on the Python stack.
+      Stops expanding a hop that fails, and stops the whole run once
+      `max_hops` calls were made or `timeout` seconds have passed
+      (a hard budget, reported as `truncated`).
+      Records the status code and wall time of every hop.
+      `arun` does the same for async hop callables.
+    """
+
+    def __init__(
+        self,
+        depth: int = 1,
+        fanout: int = 1,
+        max_hops: int = 100,
+        timeout: float = 10,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.depth = depth
+        self.fanout = fanout
+        self.max_hops = max_hops
+        self.timeout = timeout
+        self._clock = clock
+
+    def run(self, call: Callable[[Hop], Any]) -> RecursionResult:
+        result, queue, started = self._start()
+        while queue:
+            if self._is_over_budget(result, started):
+                result.truncated = True
+                break
+            hop = queue.popleft()
+            hop_started = self._clock()
+            response = call(hop)
+            self._land(result, queue, hop, response, hop_started)
+        return self._finish(result, started)
+
+    async def arun(self, call: Callable[[Hop], Awaitable[Any]]) -> RecursionResult:
+        result, queue, started = self._start()
+        while queue:
+            if self._is_over_budget(result, started):
+                result.truncated = True
+                break
+            hop = queue.popleft()
+            hop_started = self._clock()
+            response = await call(hop)
+            self._land(result, queue, hop, response, hop_started)
+        return self._finish(result, started)
+
+    def _start(self) -> tuple[RecursionResult, deque[Hop], float]:
+        result = RecursionResult(depth=self.depth, fanout=self.fanout)
+        queue = deque(Hop(index, level=1) for index in range(self.fanout))
+        return result, queue, self._clock()
+
+    def _is_over_budget(self, result: RecursionResult, started: float) -> bool:
+        return (
+            len(result.hops) >= self.max_hops or self._clock() - started >= self.timeout
+        )
+
+    def _land(
+        self,
+        result: RecursionResult,
+        queue: deque[Hop],
+        hop: Hop,
+        response: Any,
+        started: float,
+    ) -> None:
+        elapsed_ms = round((self._clock() - started) * 1000, 3)
+        status_code = getattr(response, "status_code", None)
+        result.hops.append(
+            HopTiming(hop.index, hop.level, hop.parent, status_code, elapsed_ms)
+        )
+
+        # Keep the first failed response, or else the last one
+        if result.response is None or _is_success(result.response):
+            result.response = response
+        if _is_success(response) and hop.level < self.depth:
+            first = len(result.hops) + len(queue)
+            queue.extend(
+                Hop(first + offset, hop.level + 1, parent=hop.index)
+                for offset in range(self.fanout)
+            )
+
+    def _finish(self, result: RecursionResult, started: float) -> RecursionResult:
+        result.elapsed_ms = round((self._clock() - started) * 1000, 3)
+        logger.debug(
+            f"Made {len(result.hops)} recursive calls in {result.elapsed_ms} ms "
+            f"(depth={self.depth}, fanout={self.fanout})."
+        )
+        return result
+
+
+def _is_success(response: Any) -> bool:
+    status_code = getattr(response, "status_code", None)
+    return isinstance(status_code, int) and status.is_success(status_code)
@@ -1,11 +1,17 @@
 """
 Module that defines custom response DTO classes to
-send customizable JSON responses to client. 
+send customizable JSON responses to client.
 """
 
+from typing import AsyncIterator, Iterator
+
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
 from rest_framework import status
 from rest_framework.response import Response
 
+from greetings.renderers import get_json_renderer
+
 
 class GreetingBaseResponse(Response):
     """
@@ -62,3 +68,59 @@ class GreetingSuccessResponse(GreetingBaseResponse):
         data: dict = None,
     ) -> None:
         super().__init__(status_code, message, description, data)
+
+
+class GreetingStreamingResponse(StreamingHttpResponse):
+    """
+    Streaming response that writes a queryset as a JSON array.
+
+    Behavior::
+      Reads rows with `QuerySet.iterator(chunk_size)` (or `aiterator`
+      when `asynchronous=True`) and encodes one chunk at a time, so
+      memory stays constant and the first bytes are sent right away.
+      Encodes rows with the default JSON renderer (see `get_json_renderer`).
+      `serializer` is anything with a `to_representation(row)` method.
+    """
+
+    def __init__(
+        self,
+        queryset: QuerySet,
+        serializer,
+        chunk_size: int = 2000,
+        asynchronous: bool = False,
+    ) -> None:
+        self.renderer = get_json_renderer()
+        stream = self._astream if asynchronous else self._stream
+        super().__init__(
+            streaming_content=stream(queryset, serializer, chunk_size),
+            content_type="application/json",
+        )
+
+    def _stream(
+        self, queryset: QuerySet, serializer, chunk_size: int
+    ) -> Iterator[bytes]:
+        yield b"["
+        chunk = []
+        for index, instance in enumerate(queryset.iterator(chunk_size=chunk_size)):
+            chunk.append(self._encode(serializer.to_representation(instance), index))
+            if len(chunk) >= chunk_size:
+                yield b"".join(chunk)
+                chunk = []
+        yield b"".join(chunk) + b"]"
+
+    async def _astream(
+        self, queryset: QuerySet, serializer, chunk_size: int
+    ) -> AsyncIterator[bytes]:
+        yield b"["
+        chunk, index = [], 0
+        async for instance in queryset.aiterator(chunk_size=chunk_size):
+            chunk.append(self._encode(serializer.to_representation(instance), index))
+            index += 1
+            if len(chunk) >= chunk_size:
+                yield b"".join(chunk)
+                chunk = []
+        yield b"".join(chunk) + b"]"
+
+    def _encode(self, data: dict, index: int) -> bytes:
+        encoded = self.renderer.render(data)
+        return encoded if index == 0 else b"," + encoded
@@ -7,20 +7,84 @@ throughout an application.
 @see  /add/reference
 """
 
+import hashlib
 import logging
+import uuid
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timezone as dt_timezone
 from typing import Any, Self
 
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.core.handlers.wsgi import WSGIRequest
+from django.db import DataError, IntegrityError, connections, router, transaction
+from django.db.models import CheckConstraint, Count, Max, QuerySet
+from django.db.models.functions import Lower
+from django.http import HttpRequest
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
 from rest_framework.request import Request
 from rest_framework.response import Response
-from rest_framework.test import APIRequestFactory
 
 from greetings.auth.services import OAuth2CredentialsService
 from greetings.models import Greeting
-from greetings.utils.constants import CUSTOM_GOODBYE
+from greetings.utils.cloning import RequestCloner
+from greetings.utils.constants import (
+    BULK_CREATED,
+    BULK_DUPLICATE,
+    BULK_INVALID,
+    CUSTOM_GOODBYE,
+)
+from greetings.utils.recursion import RecursionEngine, RecursionResult
+from greetings.utils.settings import get_setting
+from greetings.utils.transports import get_transport
+from greetings.utils.validators import (
+    ALPHA_CHARS_MESSAGE,
+    INVALID_GREETING_TEXT,
+    UNIQUE,
+    GreetingBatchValidator,
+    GreetingCandidate,
+    GreetingItemError,
+    RecursionParamValidator,
+)
+from greetings.utils.writebehind import get_write_behind_queue
 
 logger = logging.getLogger(__name__)
 
+# SQLSTATE of a CHECK constraint violation
+CHECK_VIOLATION: str = "23514"
+
+
+@dataclass
+class BulkGreetingResult:
+    """
+    Outcome of a single item of a bulk greetings request.
+    """
+
+    index: int
+    greeting: Any
+    status: str
+    errors: list[GreetingItemError]
+
+    @classmethod
+    def from_candidate(cls, candidate: GreetingCandidate) -> Self:
+        if candidate.is_valid:
+            status = BULK_CREATED
+        elif candidate.is_duplicate:
+            status = BULK_DUPLICATE
+        else:
+            status = BULK_INVALID
+        return cls(candidate.index, candidate.greeting, status, candidate.errors)
+
+    def as_dict(self) -> dict[str, Any]:
+        data = {"index": self.index, "greeting": self.greeting, "status": self.status}
+        if self.errors:
+            data["errors"] = [error.as_dict() for error in self.errors]
+        return data
+
 
 class GreetingService:
     """
@@ -35,10 +99,272 @@ class GreetingService:
         return cls.instance
 
     def create_and_save(custom_greeting: str) -> None:
-        greeting = Greeting(greeting_text=custom_greeting)
-        greeting.save()
+        if get_setting("WRITE_BEHIND"):
+            greeting = get_write_behind_queue().submit(custom_greeting)
+            logger.info(f'Queue custom greeting "{greeting.greeting_text}" from user.')
+            return
+        greeting = GreetingService.insert(custom_greeting)
+        CollectionVersionService.bump()
+        logger.info(f'Save custom greeting "{greeting.greeting_text}" from user.')
+
+    async def acreate_and_save(custom_greeting: str) -> None:
+        if get_setting("WRITE_BEHIND"):
+            await sync_to_async(GreetingService.create_and_save)(custom_greeting)
+            return
+        greeting = await GreetingService.ainsert(custom_greeting)
+        await CollectionVersionService.abump()
         logger.info(f'Save custom greeting "{greeting.greeting_text}" from user.')
 
+    def insert(custom_greeting: str) -> Greeting:
+        """
+        Save a greeting with a single INSERT statement.
+
+        Behavior::
+          Relies on the unique index and CHECK constraint on `greeting_text`
+          instead of `full_clean()`, so there is no SELECT before the write
+          and no race between that check and the INSERT.
+          Raises the same validation errors as `Greeting.save()`.
+        """
+
+        greeting = Greeting(greeting_text=custom_greeting)
+        using = router.db_for_write(Greeting)
+        try:
+            with GreetingService._savepoint(using):
+                # Skip `full_clean()` in `Greeting.save`, but keep the signals
+                greeting.save_base(using=using, force_insert=True)
+        except (IntegrityError, DataError) as exc:
+            raise GreetingService._get_validation_error(greeting, exc) from exc
+        return greeting
+
+    def search(prefix: str) -> QuerySet:
+        """
+        Return the greetings whose text starts with `prefix`, ignoring case.
+
+        Behavior::
+          Filters on the range `[prefix, end of prefix)` of
+          `lower(greeting_text)` instead of `ILIKE`, so PostgreSQL (with
+          any collation) and SQLite both answer with a range scan of the
+          `greeting_text_lower_idx` index.
+          Annotates `greeting_text_lower`, for `GreetingSearchPagination`.
+          Expects a lowercase alphabetical prefix, see `PrefixParamValidator`.
+        """
+
+        queryset = Greeting.objects.annotate(
+            greeting_text_lower=Lower("greeting_text")
+        ).filter(greeting_text_lower__gte=prefix)
+        if (end := GreetingService._get_prefix_end(prefix)) is not None:
+            queryset = queryset.filter(greeting_text_lower__lt=end)
+        return queryset
+
+    async def ainsert(custom_greeting: str) -> Greeting:
+        return await sync_to_async(GreetingService.insert)(custom_greeting)
+
+    def bulk_create_and_save(
+        custom_greetings: list, batch_size: int = None
+    ) -> list[BulkGreetingResult]:
+        """
+        Validate and save many greetings with one INSERT per batch.
+
+        Behavior::
+          Validates greetings with `GreetingBatchValidator`, which costs
+          one `IN` query per batch instead of one query per greeting.
+          Skips (and reports) invalid and duplicate greetings.
+          Inserts a batch the database rejects one greeting at a time, so
+          a greeting that only fails a CHECK constraint is reported as
+          invalid instead of failing the request.
+          Returns one result per greeting, in request order.
+        """
+
+        batch_size = batch_size or get_setting("BULK_BATCH_SIZE")
+        validator = GreetingBatchValidator(chunk_size=batch_size)
+        candidates = validator.validate(custom_greetings, check_unique=False)
+        pending = [candidate for candidate in candidates if candidate.is_valid]
+
+        created = 0
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start : start + batch_size]
+            created += GreetingService._insert_batch(batch, validator)
+
+        if created:
+            CollectionVersionService.bump()
+        logger.info(f"Save {created} of {len(candidates)} custom greetings from user.")
+        return [BulkGreetingResult.from_candidate(c) for c in candidates]
+
+    def _insert_batch(
+        batch: list[GreetingCandidate], validator: GreetingBatchValidator
+    ) -> int:
+        # Retry once, in case a concurrent write inserted one of the greetings
+        for attempt in range(2):
+            validator.check_unique(batch)
+            batch = [candidate for candidate in batch if candidate.is_valid]
+            greetings = [Greeting(greeting_text=c.greeting) for c in batch]
+            try:
+                with transaction.atomic():
+                    Greeting.objects.bulk_create(greetings)
+            except IntegrityError as exc:
+                if attempt or GreetingService._is_check_violation(exc):
+                    return GreetingService._insert_one_by_one(batch)
+                continue
+            return len(greetings)
+
+    def _insert_one_by_one(batch: list[GreetingCandidate]) -> int:
+        # Isolate the greetings the database rejects, and report them
+        created = 0
+        for candidate in batch:
+            try:
+                with transaction.atomic():
+                    Greeting.objects.bulk_create(
+                        [Greeting(greeting_text=candidate.greeting)]
+                    )
+            except IntegrityError as exc:
+                candidate.errors.append(GreetingService._get_item_error(exc))
+                continue
+            created += 1
+        return created
+
+    def _get_prefix_end(prefix: str) -> str | None:
+        # Smallest text past every text with the prefix, e.g. "abz" -> "ac",
+        # or None when there is none, e.g. for "zz"
+        stem = prefix.rstrip("z")
+        if not stem:
+            return None
+        return stem[:-1] + chr(ord(stem[-1]) + 1)
+
+    def _savepoint(using: str):
+        # Keep a failed write from breaking the caller's transaction, if any
+        if connections[using].in_atomic_block:
+            return transaction.atomic(using=using)
+        return nullcontext()
+
+    def _get_validation_error(greeting: Greeting, exc: Exception) -> Exception:
+        # Rebuild the error `full_clean()` would have raised before the write
+        exclude = ["greeting_id", "greeting_created_at"]
+        try:
+            greeting.clean_fields(exclude=exclude)
+        except (DjangoValidationError, ValidationError) as error:
+            return error
+        if isinstance(exc, IntegrityError):
+            if GreetingService._is_check_violation(exc):
+                error = DjangoValidationError(
+                    ALPHA_CHARS_MESSAGE, code=INVALID_GREETING_TEXT
+                )
+            else:
+                error = greeting.unique_error_message(Greeting, ("greeting_text",))
+            return DjangoValidationError({"greeting_text": [error]})
+        return exc
+
+    def _get_item_error(exc: IntegrityError) -> GreetingItemError:
+        if GreetingService._is_check_violation(exc):
+            return GreetingItemError(INVALID_GREETING_TEXT, ALPHA_CHARS_MESSAGE)
+        error = Greeting().unique_error_message(Greeting, ("greeting_text",))
+        return GreetingItemError(UNIQUE, error.messages[0])
+
+    def _is_check_violation(exc: IntegrityError) -> bool:
+        # SQLSTATE 23514 (psycopg 3 / psycopg2), or the constraint name in
+        # the message for drivers without SQLSTATE, like sqlite3
+        cause = exc.__cause__
+        sqlstate = getattr(cause, "sqlstate", None) or getattr(cause, "pgcode", None)
+        if sqlstate is not None:
+            return sqlstate == CHECK_VIOLATION
+        return any(
+            constraint.name in str(exc)
+            for constraint in Greeting._meta.constraints
+            if isinstance(constraint, CheckConstraint)
+        )
+
+
+@dataclass(frozen=True)
+class CollectionVersion:
+    """
+    Version of the greetings collection used for conditional requests.
+    """
+
+    token: str
+    last_modified: datetime
+
+    def get_etag(self, full_path: str) -> str:
+        # One ETag per query shape, e.g. page cursor or stream mode
+        digest = hashlib.md5(f"{self.token}:{full_path}".encode()).hexdigest()
+        return f'"{digest}"'
+
+
+class CollectionVersionService:
+    """
+    Service to track a cheap version of the greetings collection.
+
+    Behavior::
+      Stores the version in the `COLLECTION_VERSION_CACHE_ALIAS` cache,
+      `greetings` by default, which must be shared (see `greetings.checks`).
+      Bumps the version to a new token on every greeting write, with a
+      `Last-Modified` at least one second after the previous one, since
+      HTTP dates have one-second resolution. `abump` does the same with
+      the async cache API, for async views.
+      Resolves the version once per request for conditional views, see
+      `get_for_request`.
+      Seeds a missing version from the latest `greeting_created_at`
+      and the row count, so a cold cache never serves a stale version.
+      Expires cached versions after `COLLECTION_VERSION_TIMEOUT` seconds,
+      which bounds staleness for writes made outside these services.
+    """
+
+    cache_key: str = "greetings:collection:version"
+
+    def get() -> CollectionVersion:
+        cache = CollectionVersionService._get_cache()
+        version = cache.get(CollectionVersionService.cache_key)
+        if version is None:
+            version = CollectionVersionService._load_from_db()
+            timeout = get_setting("COLLECTION_VERSION_TIMEOUT")
+            cache.add(CollectionVersionService.cache_key, version, timeout)
+        return version
+
+    def get_for_request(request: HttpRequest) -> CollectionVersion:
+        # Resolved once per request, for its ETag, Last-Modified and body
+        version = getattr(request, "_collection_version", None)
+        if version is None:
+            version = request._collection_version = CollectionVersionService.get()
+        return version
+
+    def get_etag(request: HttpRequest) -> str:
+        version = CollectionVersionService.get_for_request(request)
+        return version.get_etag(request.get_full_path())
+
+    def get_last_modified(request: HttpRequest) -> datetime:
+        return CollectionVersionService.get_for_request(request).last_modified
+
+    def bump() -> CollectionVersion:
+        cache = CollectionVersionService._get_cache()
+        previous = cache.get(CollectionVersionService.cache_key)
+        version = CollectionVersionService._get_next(previous)
+        timeout = get_setting("COLLECTION_VERSION_TIMEOUT")
+        cache.set(CollectionVersionService.cache_key, version, timeout)
+        return version
+
+    async def abump() -> CollectionVersion:
+        cache = CollectionVersionService._get_cache()
+        previous = await cache.aget(CollectionVersionService.cache_key)
+        version = CollectionVersionService._get_next(previous)
+        timeout = get_setting("COLLECTION_VERSION_TIMEOUT")
+        await cache.aset(CollectionVersionService.cache_key, version, timeout)
+        return version
+
+    def _get_next(previous: CollectionVersion | None) -> CollectionVersion:
+        last_modified = timezone.now().replace(microsecond=0)
+        if previous is not None and last_modified <= previous.last_modified:
+            last_modified = previous.last_modified + timezone.timedelta(seconds=1)
+        return CollectionVersion(uuid.uuid4().hex, last_modified)
+
+    def _get_cache():
+        return caches[get_setting("COLLECTION_VERSION_CACHE_ALIAS")]
+
+    def _load_from_db() -> CollectionVersion:
+        stats = Greeting.objects.aggregate(
+            latest=Max("greeting_created_at"), count=Count("pk")
+        )
+        latest = stats["latest"] or datetime.fromtimestamp(0, tz=dt_timezone.utc)
+        token = hashlib.md5(f"{stats['count']}:{latest.isoformat()}".encode())
+        return CollectionVersion(token.hexdigest(), latest)
+
 
 class RecursiveViewService:
     """
@@ -46,39 +372,81 @@ class RecursiveViewService:
 
     Behavior::
       Receives an rest_framework `Request` instance argument.
-      Prepares a `HttpRequest` instance to be passed to given view.
+      Derives a lightweight `WSGIRequest` to be passed to given view.
       Updates the query_param to a constant custom_goodbye `string`.
       Authorizes the request to authenticate with OAuth2 layer.
-      Returns a view with a prepared `WSGIRequest` instance argument.
+      Calls the view once per hop of a `RecursionEngine`, shaped by the
+      `depth` and `fanout` query params (one hop by default), over the
+      transport selected by the `RECURSION_TRANSPORT` setting.
+      Returns the view response, with the per-hop timings added.
+      Provides `amake_recursive_call` to recurse into the async view.
     """
 
     @staticmethod
-    def make_recursive_call(initial_request: Request) -> None:
-        request = RecursiveViewService._prepare_request(initial_request)
+    def make_recursive_call(initial_request: Request) -> Response:
+        engine = RecursiveViewService._get_engine(initial_request)
+        cloner = RecursiveViewService._get_request_cloner(initial_request)
+        result = engine.run(lambda hop: RecursiveViewService._make_hop(cloner))
+        return RecursiveViewService._get_response(result)
+
+    @staticmethod
+    async def amake_recursive_call(initial_request: HttpRequest) -> Response:
+        engine = RecursiveViewService._get_engine(initial_request)
+        cloner = RecursiveViewService._get_request_cloner(initial_request)
+        result = await engine.arun(lambda hop: RecursiveViewService._amake_hop(cloner))
+        return RecursiveViewService._get_response(result)
+
+    def _make_hop(cloner: RequestCloner) -> Response:
+        request = cloner.clone()
         request = RecursiveViewService._authenticate_and_authorize(request)
         return RecursiveViewService._call_view(request)
 
-    def _prepare_request(request: Request) -> WSGIRequest:
-        request = RecursiveViewService._get_request_data(request)
-        factory = APIRequestFactory(format="json")
-        return factory.post(
-            path=request["path"], data=request["data"], QUERY_STRING=request["param"]
+    async def _amake_hop(cloner: RequestCloner) -> Response:
+        request = cloner.clone()
+        request = await RecursiveViewService._aauthenticate_and_authorize(request)
+        return await RecursiveViewService._acall_view(request)
+
+    def _get_engine(request: Request) -> RecursionEngine:
+        depth, fanout = RecursionParamValidator(request)
+        return RecursionEngine(
+            depth=depth,
+            fanout=fanout,
+            max_hops=get_setting("RECURSION_MAX_HOPS"),
+            timeout=get_setting("RECURSION_TIMEOUT"),
+        )
+
+    def _get_response(result: RecursionResult) -> Response:
+        response = result.response
+        if not isinstance(response, Response) or not isinstance(response.data, dict):
+            return response
+        return Response(
+            data={**response.data, "recursion": result.as_dict()},
+            status=response.status_code,
         )
 
-    def _get_request_data(request: Request) -> dict[str, Any]:
-        initial_greeting = request.query_params["greeting"]
+    def _get_request_cloner(request: Request) -> RequestCloner:
+        # Every hop posts the same request, so it is only encoded once
+        initial_greeting = request.GET["greeting"]
         data = {"greeting": initial_greeting}
         goodbye = "greeting={0}".format(CUSTOM_GOODBYE)
-        return {"path": request.path, "data": data, "param": goodbye}
+        return RequestCloner(request, data=data, query_string=goodbye)
 
     def _authenticate_and_authorize(request: WSGIRequest) -> WSGIRequest:
         oauth_service = OAuth2CredentialsService()
         request = oauth_service.authorize_request(request)
         return request
 
+    async def _aauthenticate_and_authorize(request: WSGIRequest) -> WSGIRequest:
+        oauth_service = OAuth2CredentialsService()
+        request = await oauth_service.aauthorize_request(request)
+        return request
+
     def _call_view(request: WSGIRequest) -> Response:
-        # Method-import to prevent circular dependency error
-        from greetings.views import save_custom_greeting
+        transport = get_transport()
+        logger.debug(f"recursive call to api_view over {transport.name} transport.")
+        return transport.send(request)
 
-        logger.debug("recursive call to api_view: views.save_custom_greeting.")
-        return save_custom_greeting(request)
+    async def _acall_view(request: WSGIRequest) -> Response:
+        transport = get_transport()
+        logger.debug(f"recursive call to async view over {transport.name} transport.")
+        return await transport.asend(request)
@@ -0,0 +1,79 @@
+"""
+Module to resolve app specific settings for the greetings app.
+
+Settings are read from the `GREETINGS` dict in the Django settings
+module and fall back to the defaults defined below. Lookups go through
+`django.conf.settings` so they honour `override_settings` in tests.
+"""
+
+from typing import Any
+
+from django.conf import settings
+
+DEFAULTS: dict[str, Any] = {
+    # OAuth2 access token client: "http" or "local"
+    "TOKEN_CLIENT_MODE": "http",
+    # OAuth2 access token cache
+    "TOKEN_SCOPE": None,
+    "TOKEN_CACHE_LEEWAY": 30,
+    "TOKEN_CACHE_GRACE": 0,
+    "TOKEN_REFRESH_FRACTION": 0.8,
+    # Pooled HTTP session for the token endpoint
+    "TOKEN_HTTP_POOL_MAXSIZE": 10,
+    "TOKEN_HTTP_CONNECT_TIMEOUT": 3.05,
+    "TOKEN_HTTP_READ_TIMEOUT": 10,
+    "TOKEN_HTTP_MAX_RETRIES": 3,
+    "TOKEN_HTTP_BACKOFF_FACTOR": 0.2,
+    # Keyset pagination for the greetings list
+    "LIST_PAGE_SIZE": 100,
+    "LIST_MAX_PAGE_SIZE": 1000,
+    # Rows fetched per database round-trip in streaming mode
+    "STREAM_CHUNK_SIZE": 2000,
+    # Collection version (ETag): shared cache, see `greetings.checks`,
+    # and seconds it is trusted before being re-read from the database
+    "COLLECTION_VERSION_CACHE_ALIAS": "greetings",
+    "COLLECTION_VERSION_TIMEOUT": 30,
+    # Server-side cache for rendered list payloads
+    "RESPONSE_CACHE_ALIAS": "greetings",
+    "RESPONSE_CACHE_TIMEOUT": 300,
+    # Bulk ingest: rows per INSERT, greetings per request, and body bytes,
+    # enough for `BULK_MAX_ITEMS` greetings of 50 chars as JSON objects
+    "BULK_BATCH_SIZE": 1000,
+    "BULK_MAX_ITEMS": 100_000,
+    "BULK_MAX_BODY_SIZE": 8 * 1024 * 1024,
+    # Recursive calls: default shape, and hard limits per request
+    "RECURSION_DEFAULT_DEPTH": 1,
+    "RECURSION_DEFAULT_FANOUT": 1,
+    "RECURSION_MAX_DEPTH": 5,
+    "RECURSION_MAX_FANOUT": 5,
+    "RECURSION_MAX_HOPS": 100,
+    "RECURSION_TIMEOUT": 10,
+    # Transport for recursive calls: "direct", "http" or "asgi"
+    "RECURSION_TRANSPORT": "direct",
+    # Fixed target of the http transport, never derived from a request
+    "RECURSION_HTTP_BASE_URL": "http://127.0.0.1:8000",
+    "RECURSION_HTTP_POOL_MAXSIZE": 10,
+    # Idempotency-Key: stored responses, and in-flight duplicate wait
+    "IDEMPOTENCY_CACHE_ALIAS": "default",
+    "IDEMPOTENCY_TTL": 24 * 60 * 60,
+    "IDEMPOTENCY_LOCK_TIMEOUT": 30,
+    "IDEMPOTENCY_KEY_MAX_LENGTH": 255,
+    # Write-behind queue for single greeting writes, off by default
+    "WRITE_BEHIND": False,
+    "WRITE_BEHIND_BATCH_SIZE": 500,
+    "WRITE_BEHIND_FLUSH_INTERVAL": 0.05,
+    "WRITE_BEHIND_MAX_LAG": 1.0,
+    "WRITE_BEHIND_MAX_SIZE": 10_000,
+    # Failed writes in a row before a batch is written one greeting at a time
+    "WRITE_BEHIND_MAX_ATTEMPTS": 3,
+    "WRITE_BEHIND_FLUSH_ON_SHUTDOWN": True,
+}
+
+
+def get_setting(name: str) -> Any:
+    """Return the configured value for `name` or its default."""
+
+    user_settings = getattr(settings, "GREETINGS", {})
+    if name in user_settings:
+        return user_settings[name]
+    return DEFAULTS[name]
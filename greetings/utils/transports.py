@@ -0,0 +1,226 @@
+"""
+Module for the transports that carry recursive view calls.
+
+Transport modes (`RECURSION_TRANSPORT` setting):
+  - direct: call the view functions in-process (default).
+  - http:   send the request over pooled HTTP to `RECURSION_HTTP_BASE_URL`
+            (loopback by default, or a remote node).
+  - asgi:   run the request through the in-process ASGI application,
+            with URL routing and the full middleware stack.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.asgi import get_asgi_application
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpRequest
+from rest_framework.response import Response
+
+from greetings.auth.sessions import AsyncPooledHTTPSession, PooledHTTPSession
+from greetings.utils.constants import TRANSPORT_ASGI, TRANSPORT_DIRECT, TRANSPORT_HTTP
+from greetings.utils.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+
+class RecursiveCallTransport:
+    """
+    Base class for transports. `send` and `asend` take a prepared
+    (and authorized) request and return the hop's DRF `Response`.
+    """
+
+    name: str = None
+
+    def send(self, request: HttpRequest) -> Response:
+        raise NotImplementedError
+
+    async def asend(self, request: HttpRequest) -> Response:
+        return await sync_to_async(self.send)(request)
+
+
+class DirectTransport(RecursiveCallTransport):
+    """
+    Calls the greeting views as plain functions, skipping URL routing
+    and middleware. Cheapest, but only reaches this process.
+    """
+
+    name = TRANSPORT_DIRECT
+
+    def send(self, request: HttpRequest) -> Response:
+        # Method-import to prevent circular dependency error
+        from greetings.views import save_custom_greeting
+
+        return save_custom_greeting(request)
+
+    async def asend(self, request: HttpRequest) -> Response:
+        # Method-import to prevent circular dependency error
+        from greetings.views import asave_custom_greeting
+
+        return await asave_custom_greeting(request)
+
+
+class HTTPTransport(RecursiveCallTransport):
+    """
+    Sends requests over keep-alive HTTP connections.
+
+    Behavior::
+      Posts to `RECURSION_HTTP_BASE_URL`, this server over loopback
+      (`http://127.0.0.1:8000`) by default. The target never comes from
+      the request: its `Host` header is set by the client, and the hop
+      carries a freshly minted bearer token.
+      Reuses pooled sessions, so hops do not pay for a TCP handshake.
+      Needs a server with spare workers, since the calling request
+      holds one while the hop is served.
+    """
+
+    name = TRANSPORT_HTTP
+
+    def __init__(self, base_url: str = None, pool_maxsize: int = None) -> None:
+        self.base_url = base_url or get_setting("RECURSION_HTTP_BASE_URL")
+        if not self.base_url:
+            raise ImproperlyConfigured(
+                "The http recursion transport needs RECURSION_HTTP_BASE_URL."
+            )
+        pool_maxsize = pool_maxsize or get_setting("RECURSION_HTTP_POOL_MAXSIZE")
+        self._session = PooledHTTPSession(pool_maxsize=pool_maxsize)
+        self._async_session = AsyncPooledHTTPSession(pool_maxsize=pool_maxsize)
+
+    def send(self, request: HttpRequest) -> Response:
+        response = self._session.post(
+            self._get_url(request),
+            data=request.body,
+            headers=self._get_headers(request),
+        )
+        return to_response(response.status_code, response.content)
+
+    async def asend(self, request: HttpRequest) -> Response:
+        response = await self._async_session.post(
+            self._get_url(request),
+            content=request.body,
+            headers=self._get_headers(request),
+        )
+        return to_response(response.status_code, response.content)
+
+    def close(self) -> None:
+        self._session.close()
+
+    def _get_url(self, request: HttpRequest) -> str:
+        return self.base_url.rstrip("/") + request.get_full_path()
+
+    def _get_headers(self, request: HttpRequest) -> dict[str, str]:
+        return {
+            "Authorization": request.META.get("HTTP_AUTHORIZATION", ""),
+            "Content-Type": request.META.get("CONTENT_TYPE", ""),
+        }
+
+
+class ASGITransport(RecursiveCallTransport):
+    """
+    Runs requests through the ASGI application of this process.
+
+    Behavior::
+      Builds an ASGI `http` scope from the prepared request, so the hop
+      goes through URL routing and the full middleware stack without
+      a network round-trip.
+      Fires the request signals like any request, so old database
+      connections are closed at the end of the hop.
+    """
+
+    name = TRANSPORT_ASGI
+
+    def __init__(self, application=None) -> None:
+        self._application = application
+
+    def send(self, request: HttpRequest) -> Response:
+        return async_to_sync(self.asend)(request)
+
+    async def asend(self, request: HttpRequest) -> Response:
+        body = request.body
+        messages = []
+
+        async def receive() -> dict:
+            nonlocal body
+            if body is None:
+                # Never disconnect, the handler stops listening when done
+                await asyncio.Future()
+            chunk, body = body, None
+            return {"type": "http.request", "body": chunk, "more_body": False}
+
+        async def send(message: dict) -> None:
+            messages.append(message)
+
+        await self._get_application()(self._get_scope(request), receive, send)
+        start = next(m for m in messages if m["type"] == "http.response.start")
+        content = b"".join(
+            m.get("body", b"") for m in messages if m["type"] == "http.response.body"
+        )
+        return to_response(start["status"], content)
+
+    def _get_application(self):
+        if self._application is None:
+            self._application = get_asgi_application()
+        return self._application
+
+    def _get_scope(self, request: HttpRequest) -> dict:
+        headers = [
+            (b"host", request.get_host().encode("latin-1")),
+            (b"content-type", request.META.get("CONTENT_TYPE", "").encode("latin-1")),
+            (b"content-length", str(len(request.body)).encode("latin-1")),
+        ]
+        if "HTTP_AUTHORIZATION" in request.META:
+            auth = request.META["HTTP_AUTHORIZATION"].encode("latin-1")
+            headers.append((b"authorization", auth))
+        return {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": request.method,
+            "scheme": request.scheme,
+            "path": request.path,
+            "raw_path": request.path.encode(),
+            "query_string": request.META.get("QUERY_STRING", "").encode("latin-1"),
+            "root_path": "",
+            "headers": headers,
+            "client": ("127.0.0.1", 0),
+            "server": (request.get_host().split(":")[0], int(request.get_port())),
+        }
+
+
+TRANSPORTS: dict[str, type[RecursiveCallTransport]] = {
+    TRANSPORT_DIRECT: DirectTransport,
+    TRANSPORT_HTTP: HTTPTransport,
+    TRANSPORT_ASGI: ASGITransport,
+}
+
+_transports: dict[str, RecursiveCallTransport] = {}
+_lock = threading.Lock()
+
+
+def get_transport(mode: str = None) -> RecursiveCallTransport:
+    """
+    Return the shared transport for `mode`, or for the
+    `RECURSION_TRANSPORT` setting, so pooled sessions are reused.
+    """
+
+    mode = mode or get_setting("RECURSION_TRANSPORT")
+    if mode not in TRANSPORTS:
+        raise ImproperlyConfigured(f"Unknown recursion transport: {mode!r}.")
+    with _lock:
+        if mode not in _transports:
+            logger.debug(f"Creating {mode} transport for recursive calls.")
+            _transports[mode] = TRANSPORTS[mode]()
+        return _transports[mode]
+
+
+def to_response(status_code: int, content: bytes) -> Response:
+    """Wrap a JSON response body from a remote hop in a DRF `Response`."""
+
+    try:
+        data = json.loads(content) if content else None
+    except ValueError:
+        data = {"detail": content.decode("utf-8", errors="replace")}
+    return Response(data=data, status=status_code)
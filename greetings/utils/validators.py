@@ -1,9 +1,29 @@
 import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, Iterable
 
+from django.http import HttpRequest
 from rest_framework.exceptions import ValidationError
 from rest_framework.request import Request
 
 from greetings.utils.constants import GreetingsPathConstants as path
+from greetings.utils.settings import get_setting
+
+# Use with `fullmatch`: `$` with `match` also accepts a trailing newline
+ALPHA_CHARS_PATTERN: re.Pattern = re.compile(r"[a-zA-Z]+")
+ALPHA_CHARS_MESSAGE: str = "This field can only contain alphabet chars."
+
+# Longest search prefix, the `max_length` of `Greeting.greeting_text`
+PREFIX_MAX_LENGTH: int = 50
+
+# Error codes of `GreetingBatchValidator`
+INVALID_TYPE: str = "invalid_type"
+BLANK: str = "blank"
+MAX_LENGTH: str = "max_length"
+INVALID_GREETING_TEXT: str = "invalid_greeting_text"
+DUPLICATE_IN_BATCH: str = "duplicate_in_batch"
+UNIQUE: str = "unique"
+DUPLICATE_CODES: frozenset[str] = frozenset({DUPLICATE_IN_BATCH, UNIQUE})
 
 
 class GreetingParamValidator:
@@ -17,11 +37,106 @@ class GreetingParamValidator:
       Return the `greeting` query param value if key is found in URL.
     """
 
-    def __new__(self, request: Request) -> str:
+    def __new__(self, request: Request | HttpRequest) -> str:
         url = request.build_absolute_uri()
         if str(path.GREETING_PARAM_KEY) not in url:
             raise ValueError("Required query param key `greeting` is missing in URL.")
-        return request.query_params["greeting"]
+        return request.GET["greeting"]
+
+
+class GreetingListValidator:
+    """
+    Custom validator class to validate that given request body
+    is a JSON array of custom greetings.
+
+    Behavior::
+      Raise `exception` if the body is not a non-empty JSON array.
+      Raise `exception` if the array has more than `BULK_MAX_ITEMS` items.
+      Return the greetings; items may be strings or `{"greeting": ...}`.
+      Items are not validated, so they can be reported one by one.
+    """
+
+    def __new__(self, request: Request) -> list:
+        data = request.data
+        if not isinstance(data, list) or not data:
+            raise ValueError("Request body must be a non-empty JSON array.")
+
+        max_items = get_setting("BULK_MAX_ITEMS")
+        if len(data) > max_items:
+            raise ValueError(f"Request body exceeds the limit of {max_items} items.")
+        return [
+            item.get("greeting") if isinstance(item, dict) else item for item in data
+        ]
+
+
+class PrefixParamValidator:
+    """
+    Custom validator class to validate the `?prefix=` query param of a
+    greetings search.
+
+    Behavior::
+      Raise `exception` if the `prefix` query param is missing or blank.
+      Raise `exception` if the prefix has non-alphabetical chars, or is
+      longer than a greeting.
+      Return the prefix in lowercase, as the search is case-insensitive.
+    """
+
+    def __new__(self, request: Request | HttpRequest) -> str:
+        key = str(path.PREFIX_PARAM_KEY)
+        prefix = request.GET.get(key, "")
+        if not prefix:
+            raise ValueError(f"Required query param `{key}` is missing or blank.")
+        if not ALPHA_CHARS_PATTERN.fullmatch(prefix):
+            raise ValueError(f"Query param `{key}` can only contain alphabet chars.")
+        if len(prefix) > PREFIX_MAX_LENGTH:
+            raise ValueError(
+                f"Query param `{key}` must be at most {PREFIX_MAX_LENGTH} chars."
+            )
+        return prefix.lower()
+
+
+class RecursionParamValidator:
+    """
+    Custom validator class to validate the shape of a recursive call,
+    given by the `depth` and `fanout` query params of the request URL.
+
+    Behavior::
+      Return `(depth, fanout)`, or their defaults for absent params.
+      Raise `exception` if a param is not a positive integer.
+      Raise `exception` if a param exceeds its `RECURSION_MAX_*` limit.
+      Raise `exception` if the planned calls exceed `RECURSION_MAX_HOPS`.
+    """
+
+    def __new__(self, request: Request | HttpRequest) -> tuple[int, int]:
+        depth = self._get_param(
+            request, str(path.DEPTH_PARAM_KEY), "RECURSION_DEFAULT_DEPTH"
+        )
+        fanout = self._get_param(
+            request, str(path.FANOUT_PARAM_KEY), "RECURSION_DEFAULT_FANOUT"
+        )
+        for name, value in [("depth", depth), ("fanout", fanout)]:
+            limit = get_setting(f"RECURSION_MAX_{name.upper()}")
+            if value > limit:
+                raise ValueError(f"Query param `{name}` must be at most {limit}.")
+
+        hops = sum(fanout**level for level in range(1, depth + 1))
+        max_hops = get_setting("RECURSION_MAX_HOPS")
+        if hops > max_hops:
+            raise ValueError(
+                f"Recursion of {hops} calls exceeds the limit of {max_hops} calls."
+            )
+        return depth, fanout
+
+    def _get_param(request: Request | HttpRequest, key: str, default: str) -> int:
+        if key not in request.GET:
+            return get_setting(default)
+        try:
+            value = int(request.GET[key])
+        except ValueError:
+            value = 0
+        if value < 1:
+            raise ValueError(f"Query param `{key}` must be a positive integer.")
+        return value
 
 
 class AlphaCharsValidator:
@@ -31,9 +146,123 @@ class AlphaCharsValidator:
     """
 
     def __call__(self, value: str) -> None:
-        pattern = r"^[a-zA-Z]+$"
-        if not re.match(pattern, value):
+        if not ALPHA_CHARS_PATTERN.fullmatch(value):
             raise ValidationError(
-                detail={"greeting_text": "This field can only contain alphabet chars."},
-                code="invalid_greeting_text",
+                detail={"greeting_text": ALPHA_CHARS_MESSAGE},
+                code=INVALID_GREETING_TEXT,
             )
+
+
+@dataclass(frozen=True)
+class GreetingItemError:
+    """
+    Structured validation error for one greeting of a batch.
+    """
+
+    code: str
+    message: str
+    field: str = "greeting_text"
+
+    def as_dict(self) -> dict[str, str]:
+        return asdict(self)
+
+
+@dataclass
+class GreetingCandidate:
+    """
+    A greeting of a batch, with its position and validation errors.
+    """
+
+    index: int
+    greeting: Any
+    errors: list[GreetingItemError] = field(default_factory=list)
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.errors
+
+    @property
+    def is_duplicate(self) -> bool:
+        return bool(self.errors) and all(
+            error.code in DUPLICATE_CODES for error in self.errors
+        )
+
+
+class GreetingBatchValidator:
+    """
+    Validate many candidate greetings at once, for bulk paths and imports.
+
+    Behavior::
+      Applies the field rules of `Greeting.greeting_text` (type, blank,
+      max length, alphabet chars) with a precompiled pattern.
+      Flags greetings that repeat an earlier item of the batch.
+      Flags greetings that already exist with one `IN` query per chunk.
+      Returns one `GreetingCandidate` per greeting, in input order.
+    """
+
+    def __init__(self, chunk_size: int = None) -> None:
+        self.chunk_size = chunk_size or get_setting("BULK_BATCH_SIZE")
+
+    def validate(
+        self, greetings: Iterable, check_unique: bool = True
+    ) -> list[GreetingCandidate]:
+        max_length = self._get_model()._meta.get_field("greeting_text").max_length
+        candidates, seen = [], {}
+        for index, greeting in enumerate(greetings):
+            candidate = GreetingCandidate(index, greeting)
+            error = self._check_value(greeting, max_length)
+            if error is None and greeting in seen:
+                error = GreetingItemError(
+                    DUPLICATE_IN_BATCH, f"Duplicate of item {seen[greeting]}."
+                )
+            elif error is None:
+                seen[greeting] = index
+            if error is not None:
+                candidate.errors.append(error)
+            candidates.append(candidate)
+
+        if check_unique:
+            valid = [candidate for candidate in candidates if candidate.is_valid]
+            for start in range(0, len(valid), self.chunk_size):
+                self.check_unique(valid[start : start + self.chunk_size])
+        return candidates
+
+    def check_unique(self, candidates: list[GreetingCandidate]) -> None:
+        """Flag candidates that already exist, with a single `IN` query."""
+
+        Greeting = self._get_model()
+        texts = [candidate.greeting for candidate in candidates]
+        existing = set(
+            Greeting.objects.filter(greeting_text__in=texts).values_list(
+                "greeting_text", flat=True
+            )
+        )
+        if not existing:
+            return
+
+        error = Greeting().unique_error_message(Greeting, ("greeting_text",))
+        message = error.messages[0]
+        for candidate in candidates:
+            if candidate.greeting in existing:
+                candidate.errors.append(GreetingItemError(UNIQUE, message))
+
+    def _check_value(self, greeting: Any, max_length: int) -> GreetingItemError:
+        if not isinstance(greeting, str):
+            return GreetingItemError(INVALID_TYPE, "This field must be a string.")
+        if not greeting:
+            return GreetingItemError(BLANK, "This field cannot be blank.")
+        if len(greeting) > max_length:
+            return GreetingItemError(
+                MAX_LENGTH,
+                f"Ensure this value has at most {max_length} characters "
+                f"(it has {len(greeting)}).",
+            )
+        if not ALPHA_CHARS_PATTERN.fullmatch(greeting):
+            return GreetingItemError(INVALID_GREETING_TEXT, ALPHA_CHARS_MESSAGE)
+        return None
+
+    def _get_model(self):
+        # Method-import to prevent circular dependency error
+        from greetings.models import Greeting
+
+        return Greeting
@@ -0,0 +1,357 @@
+"""
+Module for the write-behind queue of single greeting writes.
+
+With the `WRITE_BEHIND` setting on, `GreetingService.create_and_save`
+validates a greeting synchronously, then queues it. A background
+flusher thread writes queued greetings with one `bulk_create` per
+batch, once `WRITE_BEHIND_BATCH_SIZE` greetings are queued or the
+oldest one has waited `WRITE_BEHIND_FLUSH_INTERVAL` seconds.
+
+The queue lives in the memory of one process: every worker process has
+its own queue and flusher thread.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import (
+    DataError,
+    IntegrityError,
+    close_old_connections,
+    connections,
+    router,
+)
+
+from greetings.models import Greeting
+from greetings.utils.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindQueueFull(RuntimeError):
+    """Raised on submit while `max_size` greetings wait to be written."""
+
+
+@dataclass
+class WriteBehindStats:
+    """
+    Counters to report the queue depth, lag and flush latency of the queue.
+    """
+
+    enqueued: int = 0
+    written: int = 0
+    depth: int = 0
+    max_depth: int = 0
+    flushes: int = 0
+    failed_flushes: int = 0
+    forced_flushes: int = 0
+    rejected: int = 0
+    dead_lettered: int = 0
+    last_flush_ms: float = 0.0
+    max_flush_ms: float = 0.0
+    total_flush_ms: float = 0.0
+    max_lag_ms: float = 0.0
+
+    @property
+    def average_flush_ms(self) -> float:
+        return self.total_flush_ms / self.flushes if self.flushes else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        data = {**asdict(self), "average_flush_ms": self.average_flush_ms}
+        return {
+            name: round(value, 3) if isinstance(value, float) else value
+            for name, value in data.items()
+        }
+
+
+class WriteBehindQueue:
+    """
+    In-process queue that batches greeting writes behind the request.
+
+    Behavior::
+      `submit` validates a greeting like `Greeting.save` (including the
+      unique check), rejects texts that are already queued, and queues it.
+      A daemon thread, started on the first submit, flushes the queue in
+      batches of `batch_size`, at the latest `flush_interval` seconds
+      after a greeting was queued.
+      Bounds the durability risk: a submit that fills the queue to
+      `max_size` greetings, or finds the oldest one older than `max_lag`
+      seconds, flushes the queue itself before returning. While the queue
+      stays full (the database is down), submit raises `WriteBehindQueueFull`.
+      Puts a failed batch back at the head of the queue, so it is retried.
+      After `max_attempts` failures in a row, writes the batch one greeting
+      at a time and moves the greetings the database rejects (integrity
+      or data errors) to `dead_letters`, so they stop blocking the rest.
+      `close` stops the thread and, with `flush_on_shutdown`, writes what
+      is left. It runs at interpreter exit.
+      Counts queue depth, lag and flush latency in `stats`.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = None,
+        flush_interval: float = None,
+        max_lag: float = None,
+        max_size: int = None,
+        max_attempts: int = None,
+        flush_on_shutdown: bool = None,
+        writer: Callable[[list[Greeting]], None] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.batch_size = batch_size or get_setting("WRITE_BEHIND_BATCH_SIZE")
+        self.flush_interval = flush_interval or get_setting(
+            "WRITE_BEHIND_FLUSH_INTERVAL"
+        )
+        self.max_lag = max_lag or get_setting("WRITE_BEHIND_MAX_LAG")
+        self.max_size = max_size or get_setting("WRITE_BEHIND_MAX_SIZE")
+        self.max_attempts = max_attempts or get_setting("WRITE_BEHIND_MAX_ATTEMPTS")
+        if flush_on_shutdown is None:
+            flush_on_shutdown = get_setting("WRITE_BEHIND_FLUSH_ON_SHUTDOWN")
+        self.flush_on_shutdown = flush_on_shutdown
+        self._writer = writer or write_greetings
+        self._clock = clock
+        self._items: deque[tuple[float, Greeting]] = deque()
+        # Texts queued or being written, to reject duplicates on submit
+        self._pending: set[str] = set()
+        # Failed writes in a row of the batch at the head of the queue
+        self._failed_attempts = 0
+        self.dead_letters: deque[Greeting] = deque(maxlen=self.max_size)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._flush_lock = threading.Lock()
+        self._thread: threading.Thread = None
+        self._closed = False
+        self.stats = WriteBehindStats()
+
+    def submit(self, custom_greeting: str) -> Greeting:
+        greeting = Greeting(greeting_text=custom_greeting)
+        greeting.full_clean(validate_constraints=False)
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The write-behind queue is closed.")
+            if len(self._items) >= self.max_size:
+                self.stats.rejected += 1
+                raise WriteBehindQueueFull(
+                    "Too many greetings are waiting to be saved, retry later."
+                )
+            if custom_greeting in self._pending:
+                error = greeting.unique_error_message(Greeting, ("greeting_text",))
+                raise DjangoValidationError({"greeting_text": [error]})
+            self._pending.add(custom_greeting)
+            self._items.append((self._clock(), greeting))
+            self.stats.enqueued += 1
+            self._update_depth()
+            must_flush = (
+                len(self._items) >= self.max_size or self._get_lag() >= self.max_lag
+            )
+            if must_flush:
+                self.stats.forced_flushes += 1
+            self._wakeup.notify()
+
+        self._start()
+        if must_flush:
+            self.flush()
+        return greeting
+
+    def flush(self) -> int:
+        """Write all queued greetings now and return how many were written."""
+
+        with self._flush_lock:
+            written = self.stats.written
+            while batch := self._take_batch():
+                if not self._write(batch):
+                    break
+            return self.stats.written - written
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._wakeup.notify()
+        if self._thread is not None:
+            self._thread.join(self.max_lag + self.flush_interval)
+
+        if self.flush_on_shutdown:
+            self.flush()
+        elif self._items:
+            logger.warning(f"Dropped {len(self._items)} queued greetings on close.")
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            return self.stats.as_dict()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="greetings-write-behind", daemon=True
+            )
+            self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._closed and not self._is_due():
+                    self._wakeup.wait(self._get_wait_timeout())
+                if self._closed:
+                    break
+            failed_flushes = self.stats.failed_flushes
+            self.flush()
+            # Long-lived thread: drop connections past `CONN_MAX_AGE`
+            close_old_connections()
+            if self.stats.failed_flushes > failed_flushes:
+                # Back off before retrying the failed batch
+                time.sleep(self.flush_interval)
+        connections.close_all()
+
+    def _is_due(self) -> bool:
+        return bool(self._items) and (
+            len(self._items) >= self.batch_size
+            or self._get_lag() >= self.flush_interval
+        )
+
+    def _get_wait_timeout(self) -> float | None:
+        # Sleep until notified while empty, else until the oldest is due
+        if not self._items:
+            return None
+        return max(self.flush_interval - self._get_lag(), 0)
+
+    def _get_lag(self) -> float:
+        return self._clock() - self._items[0][0] if self._items else 0.0
+
+    def _take_batch(self) -> list[tuple[float, Greeting]]:
+        with self._lock:
+            count = min(self.batch_size, len(self._items))
+            batch = [self._items.popleft() for _ in range(count)]
+            self._update_depth()
+            return batch
+
+    def _write(self, batch: list[tuple[float, Greeting]]) -> bool:
+        started = self._clock()
+        try:
+            self._writer([greeting for _, greeting in batch])
+        except Exception:
+            logger.exception(f"Failed to write {len(batch)} queued greetings.")
+            with self._lock:
+                self.stats.failed_flushes += 1
+                self._failed_attempts += 1
+                if self._failed_attempts < self.max_attempts:
+                    self._requeue(batch)
+                    return False
+                self._failed_attempts = 0
+            return self._write_one_by_one(batch)
+
+        with self._lock:
+            self._failed_attempts = 0
+        self._record_write(batch, started)
+        return True
+
+    def _write_one_by_one(self, batch: list[tuple[float, Greeting]]) -> bool:
+        for index, (queued_at, greeting) in enumerate(batch):
+            started = self._clock()
+            try:
+                self._writer([greeting])
+            except (IntegrityError, DataError):
+                logger.exception(
+                    f'Dead-lettered queued greeting "{greeting.greeting_text}".'
+                )
+                with self._lock:
+                    self._pending.discard(greeting.greeting_text)
+                    self.dead_letters.append(greeting)
+                    self.stats.dead_lettered += 1
+            except Exception:
+                # Not the row's fault, e.g. the database is down: retry later
+                logger.exception(f"Failed to write queued greeting {index}.")
+                with self._lock:
+                    self._requeue(batch[index:])
+                    self.stats.failed_flushes += 1
+                return False
+            else:
+                self._record_write([(queued_at, greeting)], started)
+        return True
+
+    def _requeue(self, batch: list[tuple[float, Greeting]]) -> None:
+        self._items.extendleft(reversed(batch))
+        self._update_depth()
+
+    def _record_write(
+        self, batch: list[tuple[float, Greeting]], started: float
+    ) -> None:
+        elapsed_ms = (self._clock() - started) * 1000
+        with self._lock:
+            self._pending.difference_update(g.greeting_text for _, g in batch)
+            self.stats.written += len(batch)
+            self.stats.flushes += 1
+            self.stats.last_flush_ms = elapsed_ms
+            self.stats.max_flush_ms = max(self.stats.max_flush_ms, elapsed_ms)
+            self.stats.total_flush_ms += elapsed_ms
+            lag_ms = (started - batch[0][0]) * 1000
+            self.stats.max_lag_ms = max(self.stats.max_lag_ms, lag_ms)
+        logger.debug(f"Wrote {len(batch)} queued greetings in {elapsed_ms:.3f} ms.")
+
+    def _update_depth(self) -> None:
+        self.stats.depth = len(self._items)
+        self.stats.max_depth = max(self.stats.max_depth, self.stats.depth)
+
+
+def write_greetings(greetings: list[Greeting]) -> None:
+    """
+    Write a batch of validated greetings with one INSERT.
+    Skips greetings another process inserted since they were validated.
+    """
+
+    # Method-import to prevent circular dependency error
+    from greetings.utils.services import CollectionVersionService
+
+    using = router.db_for_write(Greeting)
+    Greeting.objects.using(using).bulk_create(greetings, ignore_conflicts=True)
+    CollectionVersionService.bump()
+
+
+_queue: WriteBehindQueue = None
+_queue_lock = threading.Lock()
+
+
+def get_write_behind_queue() -> WriteBehindQueue:
+    """Return the write-behind queue shared by this process."""
+
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = WriteBehindQueue()
+        return _queue
+
+
+def close_write_behind_queue() -> None:
+    """Stop the flusher thread of this process and write what is left."""
+
+    with _queue_lock:
+        queue = _queue
+    if queue is not None:
+        queue.close()
+
+
+def reset_write_behind_queue() -> None:
+    """
+    Forget the queue of this process without writing it, e.g. the copy a
+    forked worker inherits from its parent: the flusher thread did not
+    survive the fork, and the parent still writes those greetings itself.
+    The next submit starts a queue and a flusher thread of this process.
+    """
+
+    global _queue, _queue_lock
+    if _queue is not None:
+        atexit.unregister(_queue.close)
+    _queue = None
+    # The parent may have held the lock while forking
+    _queue_lock = threading.Lock()
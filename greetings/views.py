@@ -1,31 +1,138 @@
+import json
+from calendar import timegm
+from collections import Counter
+
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views.decorators.http import condition
 from oauth2_provider.decorators import protected_resource
 from rest_framework import status
 from rest_framework.decorators import api_view
+from rest_framework.renderers import JSONRenderer
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from greetings.auth.decorators import aprotected_resource
 from greetings.models import Greeting
-from greetings.serializers import GreetingSerializer
-from greetings.utils.constants import CUSTOM_GOODBYE
-from greetings.utils.responses import GreetingErrorResponse, GreetingSuccessResponse
-from greetings.utils.services import GreetingService, RecursiveViewService
-from greetings.utils.validators import GreetingParamValidator
+from greetings.pagination import GreetingCursorPagination, GreetingSearchPagination
+from greetings.serializers import GreetingRowSerializer
+from greetings.utils.cache import ResponseCacheService
+from greetings.utils.constants import (
+    BULK_CREATED,
+    BULK_DUPLICATE,
+    BULK_INVALID,
+    CUSTOM_GOODBYE,
+)
+from greetings.utils.constants import GreetingsPathConstants as path
+from greetings.utils.decorators import (
+    async_api_view,
+    idempotent,
+    max_body_size,
+    render_response,
+)
+from greetings.utils.responses import (
+    GreetingErrorResponse,
+    GreetingStreamingResponse,
+    GreetingSuccessResponse,
+)
+from greetings.utils.services import (
+    CollectionVersionService,
+    GreetingService,
+    RecursiveViewService,
+)
+from greetings.utils.settings import get_setting
+from greetings.utils.validators import (
+    GreetingListValidator,
+    GreetingParamValidator,
+    PrefixParamValidator,
+    RecursionParamValidator,
+)
 
 
 @api_view(["GET"])
 @protected_resource(scopes=["read"])
+@condition(
+    etag_func=CollectionVersionService.get_etag,
+    last_modified_func=CollectionVersionService.get_last_modified,
+)
 def list_greetings(request: Request) -> Response:
-    """List all the greetings from the db."""
+    """
+    List the greetings from the db, one cursor page at a time.
+    Pass `?stream=true` to stream all greetings as one JSON array.
+    Answers `304 Not Modified` for an unchanged collection and serves
+    JSON pages from the response cache until the collection changes.
+    """
+
+    if is_stream_requested(request):
+        serializer = GreetingRowSerializer()
+        return GreetingStreamingResponse(
+            serializer.get_queryset(
+                Greeting.objects.order_by("greeting_created_at", "greeting_id")
+            ),
+            serializer=serializer,
+            chunk_size=get_setting("STREAM_CHUNK_SIZE"),
+        )
+
+    version = CollectionVersionService.get_for_request(request).token
+    response_cache = ResponseCacheService()
+    media_type = request.accepted_media_type
+    is_cacheable = request.accepted_renderer.format == "json"
+    if is_cacheable and (payload := response_cache.get(request, version, media_type)):
+        return HttpResponse(payload, content_type=media_type)
+
+    paginator = GreetingCursorPagination()
+    serializer = GreetingRowSerializer()
+    queryset = serializer.get_queryset(Greeting.objects.all())
+    greetings = paginator.paginate_queryset(queryset, request)
+    response = paginator.get_paginated_response(serializer.serialize(greetings))
+    if is_cacheable:
+        response.add_post_render_callback(
+            lambda rendered: response_cache.set(
+                request, version, media_type, rendered.content
+            )
+        )
+    return response
+
+
+@api_view(["GET"])
+@protected_resource(scopes=["read"])
+@condition(
+    etag_func=CollectionVersionService.get_etag,
+    last_modified_func=CollectionVersionService.get_last_modified,
+)
+def search_greetings(request: Request) -> Response:
+    """
+    Search the greetings whose text starts with `?prefix=`, ignoring case,
+    one cursor page at a time in alphabetical order.
+    Answers `304 Not Modified` for an unchanged collection.
+    """
+
+    try:
+        prefix = PrefixParamValidator(request)
+    except ValueError as exc:
+        return GreetingErrorResponse(
+            description="Failed to search greetings.", data={"detail": str(exc)}
+        )
 
-    greetings = Greeting.objects.all()
-    serializer = GreetingSerializer(greetings, many=True)
-    return Response(serializer.data)
+    paginator = GreetingSearchPagination()
+    serializer = GreetingRowSerializer()
+    queryset = serializer.get_queryset(GreetingService.search(prefix))
+    greetings = paginator.paginate_queryset(queryset, request)
+    return paginator.get_paginated_response(serializer.serialize(greetings))
 
 
 @api_view(["POST"])
 @protected_resource(scopes=["write"])
+@idempotent
 def save_custom_greeting(request: Request) -> Response:
-    """Save a custom greeting from a user."""
+    """
+    Save a custom greeting from a user, then call this view recursively.
+    Pass `?depth=` and `?fanout=` to shape the recursion.
+    Send an `Idempotency-Key` header to retry safely: repeats replay
+    the stored response instead of saving and recursing again.
+    """
 
     try:
         custom_greeting = GreetingParamValidator(request)
@@ -35,8 +142,113 @@ def save_custom_greeting(request: Request) -> Response:
                 data={"greeting": request.data["greeting"], "goodbye": custom_greeting},
             )
 
+        RecursionParamValidator(request)
         GreetingService.create_and_save(custom_greeting)
         return RecursiveViewService.make_recursive_call(request)
 
     except Exception as exc:
         return GreetingErrorResponse(data={"detail": str(exc)})
+
+
+@max_body_size("BULK_MAX_BODY_SIZE")
+@api_view(["POST"])
+@protected_resource(scopes=["write"])
+def bulk_save_greetings(request: Request) -> Response:
+    """
+    Save a JSON array of custom greetings from a user, in batches.
+    Returns one result per greeting: created, duplicate or invalid.
+    Bodies over `BULK_MAX_BODY_SIZE` bytes get a `413` error response.
+    """
+
+    try:
+        custom_greetings = GreetingListValidator(request)
+        results = GreetingService.bulk_create_and_save(custom_greetings)
+    except Exception as exc:
+        return GreetingErrorResponse(
+            description="Failed to save custom greetings submitted by user.",
+            data={"detail": str(exc)},
+        )
+
+    counts = Counter(result.status for result in results)
+    return GreetingSuccessResponse(
+        status_code=(
+            status.HTTP_201_CREATED if counts[BULK_CREATED] else status.HTTP_200_OK
+        ),
+        description="Saved custom greetings submitted by user.",
+        data={
+            "created": counts[BULK_CREATED],
+            "duplicates": counts[BULK_DUPLICATE],
+            "invalid": counts[BULK_INVALID],
+            "results": [result.as_dict() for result in results],
+        },
+    )
+
+
+@async_api_view(["GET"])
+@aprotected_resource(scopes=["read"])
+async def alist_greetings(request: HttpRequest) -> Response:
+    """Async counterpart of `list_greetings` for ASGI deployments."""
+
+    version = await sync_to_async(CollectionVersionService.get)()
+    etag = version.get_etag(request.get_full_path())
+    last_modified = version.last_modified
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=timegm(last_modified.utctimetuple())
+    )
+    if not_modified is not None:
+        return not_modified
+
+    response_cache = ResponseCacheService()
+    media_type = JSONRenderer.media_type
+    if is_stream_requested(request):
+        serializer = GreetingRowSerializer()
+        response = GreetingStreamingResponse(
+            serializer.get_queryset(
+                Greeting.objects.order_by("greeting_created_at", "greeting_id")
+            ),
+            serializer=serializer,
+            chunk_size=get_setting("STREAM_CHUNK_SIZE"),
+            asynchronous=True,
+        )
+    elif payload := await response_cache.aget(request, version.token, media_type):
+        response = HttpResponse(payload, content_type=media_type)
+    else:
+        paginator = GreetingCursorPagination()
+        serializer = GreetingRowSerializer()
+        queryset = serializer.get_queryset(Greeting.objects.all())
+        page = paginator.get_page_queryset(queryset, request)
+        greetings = paginator.paginate_rows([greeting async for greeting in page])
+        data = serializer.serialize(greetings)
+        response = render_response(paginator.get_paginated_response(data))
+        await response_cache.aset(request, version.token, media_type, response.content)
+
+    response.headers["ETag"] = etag
+    response.headers["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
+
+
+@async_api_view(["POST"])
+@aprotected_resource(scopes=["write"])
+async def asave_custom_greeting(request: HttpRequest) -> Response:
+    """Async counterpart of `save_custom_greeting` for ASGI deployments."""
+
+    try:
+        custom_greeting = GreetingParamValidator(request)
+        if custom_greeting == CUSTOM_GOODBYE:
+            data = request.POST or json.loads(request.body or b"{}")
+            return GreetingSuccessResponse(
+                status_code=status.HTTP_201_CREATED,
+                data={"greeting": data["greeting"], "goodbye": custom_greeting},
+            )
+
+        RecursionParamValidator(request)
+        await GreetingService.acreate_and_save(custom_greeting)
+        return await RecursiveViewService.amake_recursive_call(request)
+
+    except Exception as exc:
+        return GreetingErrorResponse(data={"detail": str(exc)})
+
+
+def is_stream_requested(request: HttpRequest) -> bool:
+    stream = request.GET.get(str(path.STREAM_PARAM_KEY), "")
+    return stream.lower() in ("1", "true", "yes")
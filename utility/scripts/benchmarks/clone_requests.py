@@ -0,0 +1,109 @@
+# pylint: disable=C0116
+
+"""
+Python script to benchmark how recursive greeting requests are derived.
+
+[Requirements]
+  - Django env variables (`SECRET_KEY`, `ALLOWED_HOSTS`, ...) set.
+
+Times and traces the memory of deriving one hop request from an
+incoming request with DRF's `APIRequestFactory` (the former approach)
+against `RequestCloner`, both with a new cloner per hop (worst case,
+`depth=1`) and with a cloner shared by all hops of a recursion.
+Checks that every approach hands the view the same data.
+
+[Example]
+
+  python utility/scripts/benchmarks/clone_requests.py 20000
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import django
+
+ROOT_DIR: Path = Path(__file__).resolve().parents[3]
+ITERATIONS: int = 20_000
+ROUNDS: int = 3
+
+
+def main() -> None:
+    sys.path.insert(0, str(ROOT_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.base")
+    django.setup()
+
+    from rest_framework.request import Request
+    from rest_framework.settings import api_settings
+    from rest_framework.test import APIRequestFactory
+
+    from greetings.utils.cloning import RequestCloner
+    from greetings.utils.constants import GreetingsPathConstants as path
+
+    iterations = int(sys.argv[1]) if sys.argv[1:] else ITERATIONS
+    initial_request = APIRequestFactory().post(
+        str(path.GREETING_URI) + "hello", HTTP_HOST="localhost"
+    )
+    data = {"greeting": initial_request.GET["greeting"]}
+    query_string = "greeting=goodbye"
+    shared_cloner = RequestCloner(initial_request, data, query_string)
+
+    def use_factory():
+        return APIRequestFactory(format="json").post(
+            path=initial_request.path,
+            data=data,
+            QUERY_STRING=query_string,
+            HTTP_HOST=initial_request.get_host(),
+        )
+
+    def use_cloner():
+        return RequestCloner(initial_request, data, query_string).clone()
+
+    def use_shared_cloner():
+        return shared_cloner.clone()
+
+    approaches = {
+        "APIRequestFactory": use_factory,
+        "RequestCloner": use_cloner,
+        "shared RequestCloner": use_shared_cloner,
+    }
+    parsers = [parser() for parser in api_settings.DEFAULT_PARSER_CLASSES]
+    for func in approaches.values():
+        if dict(Request(func(), parsers=parsers).data.items()) != data:
+            raise AssertionError("Derived requests carry different data.")
+
+    baseline = None
+    for name, func in approaches.items():
+        seconds = best_of(func, iterations) / iterations
+        baseline = baseline or seconds
+        print(
+            f"{name:>20}: {seconds * 1e6:6.2f} us/request | "
+            f"peak {peak_bytes(func):6d} B/request | "
+            f"speedup {baseline / seconds:4.1f}x"
+        )
+
+
+def best_of(func, iterations: int) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def peak_bytes(func) -> int:
+    func()  # Warm up caches, so only the request itself is traced
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# pylint: disable=C0116
+
+"""
+Python script to benchmark the transports of recursive greeting calls.
+
+[Requirements]
+  - Django env variables (`SECRET_KEY`, `DATABASE_URL`, ...) set.
+  - `CLIENT_ID` and `CLIENT_SECRET` env variables set.
+
+Creates a throwaway test database and a live server, then posts
+greetings to `save_custom_greeting` with each `RECURSION_TRANSPORT`
+(direct, asgi, http). Reports the latency percentiles and throughput
+of the whole request and the number of hops served per second.
+Tokens are minted in-process (`TOKEN_CLIENT_MODE=local`).
+
+[Example]
+
+  python utility/scripts/benchmarks/recursive_transports.py 200 2 2
+"""
+
+import logging
+import os
+import sys
+import time
+import unittest
+from pathlib import Path
+
+import django
+from serialize_greetings import get_text
+
+ROOT_DIR: Path = Path(__file__).resolve().parents[3]
+REQUESTS: int = 200
+DEPTH: int = 1
+FANOUT: int = 1
+WARMUP: int = 5
+TRANSPORTS: list[str] = ["direct", "asgi", "http"]
+
+
+def main() -> None:
+    sys.path.insert(0, str(ROOT_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.base")
+    django.setup()
+    # Per-hop debug logs would dominate the timings
+    logging.disable(logging.INFO)
+
+    from django.test.runner import DiscoverRunner
+
+    runner = DiscoverRunner(verbosity=0)
+    runner.setup_test_environment()
+    old_config = runner.setup_databases()
+    try:
+        suite = unittest.defaultTestLoader.loadTestsFromTestCase(build_benchmark())
+        unittest.TextTestRunner(verbosity=0).run(suite)
+    finally:
+        runner.teardown_databases(old_config)
+        runner.teardown_test_environment()
+
+
+def build_benchmark() -> type:
+    from django.test import LiveServerTestCase, override_settings
+    from oauth2_provider.models import Application
+    from rest_framework.test import APIClient
+
+    from greetings.utils.constants import GreetingsPathConstants as path
+    from greetings.utils.transports import get_transport
+
+    args = [int(arg) for arg in sys.argv[1:4]]
+    requests, depth, fanout = args + [REQUESTS, DEPTH, FANOUT][len(args) :]
+
+    class TransportBenchmark(LiveServerTestCase):
+        def setUp(self) -> None:
+            Application.objects.create(
+                name="benchmark",
+                client_id=os.environ["CLIENT_ID"],
+                client_secret=os.environ["CLIENT_SECRET"],
+                client_type=Application.CLIENT_CONFIDENTIAL,
+                authorization_grant_type=Application.GRANT_CLIENT_CREDENTIALS,
+            )
+            self.client = APIClient()
+            self.texts = (get_text(index) for index in range(10**9))
+
+        def tearDown(self) -> None:
+            # Drop keep-alive connections before the live server stops
+            get_transport("http").close()
+
+        def test_transports(self) -> None:
+            print(f"{requests} requests, depth={depth}, fanout={fanout}")
+            hops = sum(fanout**level for level in range(1, depth + 1))
+            for transport in TRANSPORTS:
+                with override_settings(
+                    GREETINGS={
+                        "TOKEN_CLIENT_MODE": "local",
+                        "RECURSION_TRANSPORT": transport,
+                        "RECURSION_HTTP_BASE_URL": self.live_server_url,
+                    }
+                ):
+                    self.post_greetings(WARMUP)
+                    timings = self.post_greetings(requests)
+                report(transport, timings, hops)
+
+        def post_greetings(self, count: int) -> list[float]:
+            token = self.get_access_token()
+            self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+            timings = []
+            for _ in range(count):
+                url = f"{path.GREETING_URI}{next(self.texts)}"
+                start = time.perf_counter()
+                response = self.client.post(f"{url}&depth={depth}&fanout={fanout}")
+                timings.append(time.perf_counter() - start)
+                if response.status_code != 201:
+                    raise AssertionError(response.content)
+            return timings
+
+        def get_access_token(self) -> str:
+            from greetings.auth.services import OAuth2CredentialsService
+
+            return OAuth2CredentialsService().get_access_token()
+
+    return TransportBenchmark
+
+
+def report(transport: str, timings: list[float], hops: int) -> None:
+    timings = sorted(timings)
+    total = sum(timings)
+    p50 = timings[len(timings) // 2] * 1000
+    p95 = timings[int(len(timings) * 0.95) - 1] * 1000
+    print(
+        f"{transport:>8}: p50 {p50:7.2f} ms | p95 {p95:7.2f} ms | "
+        f"{len(timings) / total:7.1f} req/s | {len(timings) * hops / total:7.1f} hops/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# pylint: disable=C0116
+
+"""
+Python script to benchmark the prefix search of the greetings app.
+
+[Requirements]
+  - Django env variables (`SECRET_KEY`, `DATABASE_URL`, ...) set.
+
+Creates a throwaway test database and, for growing table sizes, times
+the first page of `GreetingService.search` (a range scan of the
+`greeting_text_lower_idx` index) against the same page filtered with
+`istartswith` (`LIKE`, which scans the table). The index lookup should
+stay nearly flat as the table grows, while the scan grows linearly.
+Checks that both queries return the same greetings.
+
+[Example]
+
+  python utility/scripts/benchmarks/search_greetings.py 10000 100000 1000000
+"""
+
+import os
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+import django
+
+ROOT_DIR: Path = Path(__file__).resolve().parents[3]
+ROW_COUNTS: list[int] = [10_000, 100_000, 1_000_000]
+LOOKUPS: int = 200
+PAGE_SIZE: int = 100
+PREFIX_LENGTH: int = 3
+
+
+def main() -> None:
+    sys.path.insert(0, str(ROOT_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.base")
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    row_counts = [int(count) for count in sys.argv[1:]] or ROW_COUNTS
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        rng = random.Random(37)
+        created = 0
+        for count in sorted(row_counts):
+            create_greetings(rng, count - created)
+            created = count
+            run_benchmark(rng, count)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def run_benchmark(rng: random.Random, count: int) -> None:
+    from django.db.models.functions import Lower
+
+    from greetings.models import Greeting
+    from greetings.utils.services import GreetingService
+
+    ordering = ("greeting_text_lower", "greeting_text")
+    prefixes = [get_prefix(rng) for _ in range(LOOKUPS)]
+
+    def search_index(prefix: str) -> list[str]:
+        queryset = GreetingService.search(prefix).order_by(*ordering)
+        return list(queryset.values_list("greeting_text", flat=True)[:PAGE_SIZE])
+
+    def search_scan(prefix: str) -> list[str]:
+        queryset = (
+            Greeting.objects.annotate(greeting_text_lower=Lower("greeting_text"))
+            .filter(greeting_text__istartswith=prefix)
+            .order_by(*ordering)
+        )
+        return list(queryset.values_list("greeting_text", flat=True)[:PAGE_SIZE])
+
+    for prefix in prefixes[:10]:
+        if search_index(prefix) != search_scan(prefix):
+            raise AssertionError(f"Searches disagree for prefix {prefix!r}.")
+
+    index = time_lookups(search_index, prefixes)
+    scan = time_lookups(search_scan, prefixes[: max(LOOKUPS // 10, 1)])
+    print(
+        f"{count:>9} rows: index {index * 1000:7.3f} ms | "
+        f"scan {scan * 1000:8.3f} ms | speedup {scan / index:6.1f}x"
+    )
+
+
+def create_greetings(rng: random.Random, count: int) -> None:
+    from greetings.models import Greeting
+
+    Greeting.objects.bulk_create(
+        (Greeting(greeting_text=get_text(rng)) for _ in range(count)),
+        batch_size=5000,
+        ignore_conflicts=True,
+    )
+
+
+def get_text(rng: random.Random) -> str:
+    # Mixed case alphabetic texts, unique with overwhelming probability
+    return "".join(rng.choices(string.ascii_letters, k=12))
+
+
+def get_prefix(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=PREFIX_LENGTH))
+
+
+def time_lookups(func, prefixes: list[str]) -> float:
+    start = time.perf_counter()
+    for prefix in prefixes:
+        func(prefix)
+    return (time.perf_counter() - start) / len(prefixes)
+
+
+if __name__ == "__main__":
+    main()
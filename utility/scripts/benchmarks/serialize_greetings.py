@@ -0,0 +1,107 @@
+# pylint: disable=C0116
+
+"""
+Python script to benchmark the list serializers of the greetings app.
+
+[Requirements]
+  - Django env variables (`SECRET_KEY`, `DATABASE_URL`, ...) set.
+
+Creates a throwaway test database, fills it with greetings and times
+`GreetingSerializer` (model instances) against `GreetingRowSerializer`
+(`values_list` rows), from query to rendered JSON bytes. Checks that
+both paths render the same bytes.
+
+[Example]
+
+  python utility/scripts/benchmarks/serialize_greetings.py 10000 100000
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import django
+
+ROOT_DIR: Path = Path(__file__).resolve().parents[3]
+ROW_COUNTS: list[int] = [10_000, 100_000]
+ROUNDS: int = 3
+
+
+def main() -> None:
+    sys.path.insert(0, str(ROOT_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.base")
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    row_counts = [int(count) for count in sys.argv[1:]] or ROW_COUNTS
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        for count in row_counts:
+            run_benchmark(count)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def run_benchmark(count: int) -> None:
+    from rest_framework.renderers import JSONRenderer
+
+    from greetings.models import Greeting
+    from greetings.serializers import GreetingRowSerializer, GreetingSerializer
+
+    create_greetings(count)
+    queryset = Greeting.objects.order_by("greeting_created_at", "greeting_id")
+    renderer = JSONRenderer()
+
+    def render_instances() -> bytes:
+        return renderer.render(GreetingSerializer(queryset.all(), many=True).data)
+
+    def render_rows() -> bytes:
+        serializer = GreetingRowSerializer()
+        return renderer.render(serializer.serialize(serializer.get_queryset(queryset)))
+
+    if render_instances() != render_rows():
+        raise AssertionError("Serializers rendered different payloads.")
+
+    baseline = best_of(render_instances)
+    lean = best_of(render_rows)
+    print(
+        f"{count:>8} rows: model {baseline * 1000:8.1f} ms | "
+        f"rows {lean * 1000:8.1f} ms | speedup {baseline / lean:4.1f}x"
+    )
+
+
+def create_greetings(count: int) -> None:
+    from greetings.models import Greeting
+
+    Greeting.objects.all().delete()
+    Greeting.objects.bulk_create(
+        (Greeting(greeting_text=get_text(index)) for index in range(count)),
+        batch_size=2000,
+    )
+
+
+def get_text(index: int) -> str:
+    # Greeting texts are unique and alphabetic only
+    letters = []
+    while True:
+        index, remainder = divmod(index, 26)
+        letters.append(chr(ord("a") + remainder))
+        if not index:
+            return "hello" + "".join(letters)
+
+
+def best_of(func) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    main()